@@ -1,8 +1,20 @@
+import importlib
+
 import streamlit as st
 from utils.data_manager import COLEGIOS_MARISTAS
 from components import styles
-from views import dashboard, analytics, data_entry, settings, landing, changelog
-import pandas as pd
+
+# Vistas por opción del menú. Cada módulo (y sus dependencias pesadas, como
+# plotly o fpdf) se importa la primera vez que se elige su opción.
+VISTAS = {
+    "🏠 Inicio": "views.landing",
+    "📊 Dashboard Global": "views.dashboard",
+    "🔍 Comparativas Globales": "views.analytics",
+    "📝 Captura Manual": "views.data_entry",
+    "⚙️ Configuración": "views.settings",
+    "📋 Historial de Versiones": "views.changelog",
+}
+VISTA_INICIO = "🏠 Inicio"
 
 # 1. Configuración de Página
 st.set_page_config(
@@ -16,6 +28,12 @@ st.set_page_config(
 styles.inject_custom_css()
 
 
+def render_view(opcion: str) -> None:
+    """Importa (solo la primera vez) y renderiza la vista de `opcion`."""
+    modulo = importlib.import_module(VISTAS.get(opcion, VISTAS[VISTA_INICIO]))
+    modulo.render()
+
+
 def main():
     # --- SIDEBAR GLOBAL ---
     with st.sidebar:
@@ -39,14 +57,7 @@ def main():
         st.divider()
 
         # Menú adaptativo según filtro
-        menu_options = [
-            "🏠 Inicio",
-            "📊 Dashboard Global",
-            "🔍 Comparativas Globales",
-            "📝 Captura Manual",
-            "⚙️ Configuración",
-            "📋 Historial de Versiones",
-        ]
+        menu_options = list(VISTAS)
 
         idx_menu = 0
         if "page_selection" in st.session_state:
@@ -63,20 +74,7 @@ def main():
     filtro = st.session_state.get(
         "global_institution_filter", "Todas las Instituciones"
     )
-    if selected == "🏠 Inicio":
-        landing.render()
-    elif selected == "📊 Dashboard Global":
-        dashboard.render()
-    elif selected == "🔍 Comparativas Globales":
-        analytics.render()
-    elif selected == "📝 Captura Manual":
-        data_entry.render()
-    elif selected == "⚙️ Configuración":
-        settings.render()
-    elif selected == "📋 Historial de Versiones":
-        changelog.render()
-    else:
-        landing.render()
+    render_view(selected)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,100 @@
+"""
+Benchmark: latencia de una interacción en el Tablero Principal.
+
+Antes de los fragmentos, cambiar la selección de gráficas re-ejecutaba el
+script completo: carga de datos, fusión, filtros, KPIs, todas las gráficas y
+las tablas. Ahora solo se re-ejecuta el fragmento `chart_builder` con el
+conjunto enriquecido que recibió en el último rerun completo.
+
+Se ejecuta la vista con `AppTest` sobre datos sintéticos y se compara el
+tiempo de un rerun completo (lo que costaba cada interacción) con la duración
+que registra el fragmento `chart_builder` (lo que cuesta ahora).
+
+Uso:
+    python benchmarks/bench_dashboard_fragments.py          # 40 cuentas x 36 meses
+    python benchmarks/bench_dashboard_fragments.py 200 60
+"""
+
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+SELECCIONES = [
+    ["Torta de Seguidores", "Línea de Crecimiento"],
+    ["Barras de Interacciones", "Área de Engagement"],
+    ["Comparativa Histórica"],
+    ["Torta de Seguidores", "Línea de Crecimiento", "Área de Engagement"],
+]
+
+
+def _datos(n_cuentas: int, n_meses: int):
+    rng = np.random.default_rng(42)
+    ids = [f"c{i:04d}" for i in range(n_cuentas)]
+    cuentas = pd.DataFrame(
+        {
+            "id_cuenta": ids,
+            "entidad": [f"Colegio {i % 12}" for i in range(n_cuentas)],
+            "plataforma": ["Facebook", "Instagram", "TikTok"] * (n_cuentas // 3)
+            + ["Facebook"] * (n_cuentas % 3),
+            "usuario_red": [f"@{i}" for i in ids],
+        }
+    )
+    fechas = pd.date_range("2022-01-01", periods=n_meses, freq="MS")
+    n = n_cuentas * n_meses
+    metricas = pd.DataFrame(
+        {
+            "id_cuenta": np.repeat(ids, n_meses),
+            "fecha": np.tile(fechas, n_cuentas),
+            "seguidores": rng.integers(500, 50_000, n),
+            "alcance": rng.integers(1_000, 200_000, n),
+            "interacciones": rng.integers(10, 5_000, n),
+            "likes_promedio": rng.integers(1, 500, n),
+            "engagement_rate": rng.uniform(0.5, 15, n).round(2),
+        }
+    )
+    return cuentas, metricas
+
+
+def _app():
+    from views import dashboard
+
+    dashboard.render()
+
+
+def main(n_cuentas: int = 40, n_meses: int = 36) -> None:
+    from views import dashboard
+
+    datos = _datos(n_cuentas, n_meses)
+    dashboard.load_data = lambda: datos  # sin E/S: solo cómputo y renderizado
+
+    at = AppTest.from_function(_app, default_timeout=120)
+    completos, fragmento = [], []
+    for seleccion in SELECCIONES:
+        dashboard.load_dashboard_data.clear()  # rerun completo sin caché previa
+        if at.multiselect:
+            at.multiselect[0].set_value(seleccion)
+        inicio = time.perf_counter()
+        at.run()
+        completos.append((time.perf_counter() - inicio) * 1000)
+        fragmento.append(at.session_state["_fragment_latency"]["chart_builder"][-1])
+
+    print(f"Métricas: {n_cuentas * n_meses:,} filas ({n_cuentas} cuentas)")
+    print(
+        f"Rerun completo por interacción (antes): {statistics.median(completos):8.0f} ms"
+    )
+    print(
+        f"Fragmento chart_builder (ahora):        {statistics.median(fragmento):8.0f} ms"
+    )
+
+
+if __name__ == "__main__":
+    argumentos = [int(a) for a in sys.argv[1:3]]
+    main(*argumentos)
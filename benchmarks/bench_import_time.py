@@ -0,0 +1,88 @@
+"""
+Benchmark: costo de importación en frío de las vistas (`python -X importtime`).
+
+Streamlit ya está cargado cuando se ejecuta el script de la app, así que cada
+corrida importa primero `streamlit` en un intérprete nuevo y después, en
+orden, lo que necesita el arranque (datos, estilos y la vista de Inicio) y el
+resto de vistas. De la salida de `-X importtime` se toma el tiempo acumulado
+de cada import de primer nivel: es lo que cuesta abrir esa vista por primera
+vez con lo anterior ya cargado.
+
+Antes del enrutador perezoso de `app.py` se pagaba "Todas las vistas" en la
+primera ejecución; ahora solo "Arranque" y cada vista al elegirla.
+
+Uso:
+    python benchmarks/bench_import_time.py          # mínimo de 5 corridas
+    python benchmarks/bench_import_time.py 10
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Set, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+
+ARRANQUE = ["utils.data_manager", "components", "views.landing"]
+VISTAS = [
+    "views.dashboard",
+    "views.analytics",
+    "views.data_entry",
+    "views.settings",
+    "views.changelog",
+]
+HEAVY = {"plotly", "fpdf", "kaleido", "gspread", "google", "httpx", "PIL"}
+
+
+def _importtime() -> Dict[str, Tuple[float, Set[str]]]:
+    """{módulo: (ms acumulados, paquetes pesados que arrastra)} de una corrida."""
+    codigo = "\n".join(f"import {m}" for m in ["streamlit"] + ARRANQUE + VISTAS)
+    salida = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", codigo],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    ).stderr.splitlines()
+
+    resultado: Dict[str, Tuple[float, Set[str]]] = {}
+    pesados: Set[str] = set()
+    for linea in salida:
+        if not linea.startswith("import time:") or "|" not in linea:
+            continue
+        _, acumulado, nombre = linea[len("import time:") :].split("|")
+        if not acumulado.strip().isdigit():
+            continue  # encabezado
+        modulo = nombre[1:]  # un espacio tras el separador; el resto es anidación
+        if modulo.startswith(" "):
+            raiz = modulo.strip().split(".")[0]
+            if raiz in HEAVY:
+                pesados.add(raiz)
+            continue
+        # Import de primer nivel: cierra el grupo de sus dependencias
+        resultado[modulo] = (int(acumulado) / 1000, pesados)
+        pesados = set()
+    return resultado
+
+
+def main(repeticiones: int = 5) -> None:
+    corridas = [_importtime() for _ in range(repeticiones)]
+
+    def minimo(modulos: List[str]) -> float:
+        return min(sum(c.get(m, (0.0, set()))[0] for m in modulos) for c in corridas)
+
+    def pesados(modulos: List[str]) -> str:
+        nombres = set().union(*(corridas[0].get(m, (0, set()))[1] for m in modulos))
+        return ", ".join(sorted(nombres)) or "-"
+
+    filas = [("Arranque (Inicio)", ARRANQUE)]
+    filas += [(f"  + {vista}", [vista]) for vista in VISTAS]
+    filas.append(("Todas las vistas (antes)", ARRANQUE + VISTAS))
+
+    print(f"Mínimo de {repeticiones} corridas, sin contar streamlit\n")
+    print(f"{'Import':30} {'ms':>8}  Librerías pesadas")
+    for nombre, modulos in filas:
+        print(f"{nombre:30} {minimo(modulos):8.0f}  {pesados(modulos)}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
@@ -0,0 +1,90 @@
+"""
+Benchmark: construcción de DataFrames de métricas desde Google Sheets.
+
+Compara, sobre una matriz sintética como la que devuelve la API, el camino
+anterior (`get_all_records` → lista de dicts → `pd.DataFrame`) con el actual
+(`get_values` → `frame_from_values` con tipos explícitos por columna).
+
+Uso:
+    python benchmarks/bench_load_data.py            # 50,000 filas
+    python benchmarks/bench_load_data.py 200000     # tamaño personalizado
+"""
+
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pandas as pd  # noqa: E402
+from gspread.utils import numericise_all, to_records  # noqa: E402
+
+from utils.data_manager import (  # noqa: E402
+    COLS_METRICAS,
+    DTYPES_METRICAS,
+    frame_from_values,
+)
+
+
+def _sheet_values(n_rows: int):
+    """Matriz de strings con encabezado, como `worksheet.get_values()`."""
+    random.seed(42)
+    rows = [COLS_METRICAS]
+    for i in range(n_rows):
+        seguidores = random.randint(500, 50000)
+        interacciones = random.randint(10, 2000)
+        rows.append(
+            [
+                f"{i % 40:032x}",
+                f"2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}",
+                str(seguidores),
+                str(seguidores * 3),
+                str(interacciones),
+                str(interacciones * 0.7),
+                str(round(interacciones / seguidores * 100, 2)),
+            ]
+        )
+    return rows
+
+
+def via_records(values) -> pd.DataFrame:
+    """Camino anterior: lo que hace gspread en get_all_records + pd.DataFrame."""
+    records = to_records(values[0], [numericise_all(row) for row in values[1:]])
+    df = pd.DataFrame(records)
+    df.columns = df.columns.str.strip().str.lower()
+    df["fecha"] = pd.to_datetime(df["fecha"], errors="coerce")
+    return df
+
+
+def via_values(values) -> pd.DataFrame:
+    """Camino actual: columnas tipadas directamente desde la matriz."""
+    return frame_from_values(values, DTYPES_METRICAS)
+
+
+def _measure(fn, values, repeats: int = 3):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(values)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    df = fn(values)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak, df.memory_usage(deep=True).sum()
+
+
+def main(n_rows: int = 50_000) -> None:
+    values = _sheet_values(n_rows)
+    print(f"Filas: {n_rows:,}")
+    print(f"{'camino':<22}{'tiempo (s)':>12}{'pico (MB)':>12}{'df (MB)':>10}")
+    for nombre, fn in [("get_all_records", via_records), ("get_values", via_values)]:
+        seg, pico, tam = _measure(fn, values)
+        print(f"{nombre:<22}{seg:>12.3f}{pico / 1e6:>12.1f}{tam / 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
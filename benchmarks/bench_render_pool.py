@@ -0,0 +1,64 @@
+"""
+Benchmark: latencia de exportar gráficas de reportes a PNG.
+
+Compara la primera exportación con Kaleido en un proceso nuevo (arranque en
+frío de Chromium, lo que pagaba cada reporte) con peticiones al pool de
+procesos persistentes de `utils.render_pool`, ya precalentado.
+
+Uso:
+    python benchmarks/bench_render_pool.py          # 10 gráficas
+    python benchmarks/bench_render_pool.py 50
+"""
+
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import plotly.express as px  # noqa: E402
+
+from utils.render_pool import RenderPool  # noqa: E402
+
+COLD_SNIPPET = """
+import time, plotly.express as px, plotly.io as pio
+fig = px.line(x=list(range(30)), y=[i * i for i in range(30)])
+t = time.perf_counter()
+pio.to_image(fig, format="png", width=800, height=400)
+print(time.perf_counter() - t)
+"""
+
+
+def _figura(i: int):
+    return px.line(
+        x=list(range(30)), y=[(j + i) ** 2 for j in range(30)], title=f"Gráfica {i}"
+    )
+
+
+def main(n: int = 10) -> None:
+    frio = float(
+        subprocess.run(
+            [sys.executable, "-c", COLD_SNIPPET], capture_output=True, text=True
+        ).stdout.strip()
+    )
+    print(f"Kaleido en frío (1 gráfica):   {frio * 1000:8.0f} ms")
+
+    pool = RenderPool()
+    try:
+        pool.render(_figura(-1).to_json(), 800, 400)  # esperar el precalentamiento
+        tiempos = []
+        for i in range(n):
+            t = time.perf_counter()
+            pool.render(_figura(i).to_json(), 800, 400)
+            tiempos.append(time.perf_counter() - t)
+        tiempos.sort()
+        print(f"Pool caliente (mediana de {n}): {tiempos[n // 2] * 1000:8.0f} ms")
+        print(f"Pool caliente (peor):          {tiempos[-1] * 1000:8.0f} ms")
+    finally:
+        pool.shutdown()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
@@ -12,6 +12,8 @@ from .styles import (
     COLOR_CAPTION,
     COLOR_MAP,
 )
+from .fragments import fragment, fragment_latency
+from .tables import paginated_dataframe
 
 __all__ = [
     "inject_custom_css",
@@ -22,4 +24,7 @@ __all__ = [
     "COLOR_TEXT",
     "COLOR_CAPTION",
     "COLOR_MAP",
+    "fragment",
+    "fragment_latency",
+    "paginated_dataframe",
 ]
@@ -0,0 +1,85 @@
+"""
+Fragmentos de Streamlit con medición de latencia para CHAMPILYTICS.
+
+Un fragmento se vuelve a ejecutar solo cuando cambia un widget propio, sin
+re-ejecutar el script completo (carga de datos, fusión y el resto de
+gráficas). `fragment` usa `st.fragment` o, en versiones anteriores de
+Streamlit, `st.experimental_fragment`; si ninguno existe, la función se
+ejecuta como una parte normal del script.
+
+Cada ejecución registra su duración en `st.session_state` para poder comparar
+el costo de una interacción dentro del fragmento con un rerun completo.
+
+Uso:
+    from components.fragments import fragment, fragment_latency
+
+    @fragment
+    def constructor_de_graficas(data):
+        seleccion = st.multiselect(...)
+        ...
+
+    fragment_latency()  # {"constructor_de_graficas": {"n": 3, "ultimo_ms": ...}}
+"""
+
+import functools
+import statistics
+import time
+from collections import deque
+from typing import Callable, Dict, Optional
+
+import streamlit as st
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+LATENCY_KEY = "_fragment_latency"
+LATENCY_HISTORY = 50  # Ejecuciones recientes conservadas por fragmento
+
+
+def _fragment_decorator() -> Optional[Callable]:
+    """`st.fragment`, `st.experimental_fragment` o None si no hay soporte."""
+    return getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+
+
+def record_latency(nombre: str, ms: float) -> None:
+    """Agrega una medición (en ms) al historial de `nombre` de la sesión."""
+    historial = st.session_state.setdefault(LATENCY_KEY, {})
+    historial.setdefault(nombre, deque(maxlen=LATENCY_HISTORY)).append(ms)
+    logger.debug(f"Fragmento {nombre}: {ms:.1f} ms")
+
+
+def fragment_latency() -> Dict[str, Dict[str, float]]:
+    """Resumen por fragmento: ejecuciones, última y mediana (ms)."""
+    historial = st.session_state.get(LATENCY_KEY, {})
+    return {
+        nombre: {
+            "n": len(tiempos),
+            "ultimo_ms": tiempos[-1],
+            "mediana_ms": statistics.median(tiempos),
+        }
+        for nombre, tiempos in historial.items()
+        if tiempos
+    }
+
+
+def fragment(func: Callable) -> Callable:
+    """
+    Convierte `func` en un fragmento que mide cada una de sus ejecuciones.
+
+    Los argumentos se capturan en el rerun completo y se reutilizan en los
+    reruns del fragmento: los datos que recibe no se vuelven a calcular al
+    interactuar con sus widgets.
+    """
+    nombre = func.__name__
+
+    @functools.wraps(func)
+    def medido(*args, **kwargs):
+        inicio = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            record_latency(nombre, (time.perf_counter() - inicio) * 1000)
+
+    decorador = _fragment_decorator()
+    return decorador(medido) if decorador else medido
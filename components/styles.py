@@ -3,7 +3,18 @@ Módulo de estilos CSS para CHAMPILYTICS.
 Define constantes de colores y función de inyección de CSS personalizado.
 """
 
+import functools
+import hashlib
+import json
+from pathlib import Path
+from typing import List, Tuple
+
 import streamlit as st
+import streamlit.components.v1 as st_components
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 # ===========================
 # CONSTANTES DE COLOR
@@ -31,99 +42,123 @@ COLOR_MAP = {
 # FUNCIÓN DE INYECCIÓN CSS
 # ===========================
 
+CSS_PATH = Path(__file__).with_name("styles.css")
+CSS_ELEMENT_ID = "champilytics-css"
+
+# Fuentes servidas desde static/fonts/ (ver README.txt). Mientras falte alguno
+# de los archivos se carga Montserrat desde Google Fonts sin bloquear el
+# render: <link rel="preload"> que pasa a hoja de estilos al terminar, con
+# display=swap para mostrar el texto con la fuente del sistema mientras tanto.
+FONTS_DIR = Path(__file__).resolve().parent.parent / "static" / "fonts"
+FONT_FILES = [
+    "montserrat-latin-400-normal.woff2",
+    "montserrat-latin-600-normal.woff2",
+    "montserrat-latin-700-normal.woff2",
+]
+REMOTE_FONTS_URL = (
+    "https://fonts.googleapis.com/css2?family=Montserrat:wght@400;600;700"
+    "&display=swap"
+)
+FONTS_ELEMENT_ID = "champilytics-fonts"
+
+# Inyectar el CSS en el <head> del documento una sola vez por sesión. Con
+# False se envía un bloque <style> con st.markdown en cada rerun.
+INJECT_ONCE_PER_SESSION = True
+
+_HEAD_SCRIPT = """
+<script>
+const doc = window.parent.document;
+let style = doc.getElementById("{element_id}");
+if (!style) {{
+    style = doc.createElement("style");
+    style.id = "{element_id}";
+    doc.head.appendChild(style);
+}}
+if (style.dataset.version !== "{version}") {{
+    style.textContent = {css};
+    style.dataset.version = "{version}";
+}}
+const fontsUrl = {fonts_url};
+if (fontsUrl && !doc.getElementById("{fonts_id}")) {{
+    const link = doc.createElement("link");
+    link.id = "{fonts_id}";
+    link.rel = "preload";
+    link.as = "style";
+    link.href = fontsUrl;
+    link.onload = () => {{ link.rel = "stylesheet"; }};
+    doc.head.appendChild(link);
+}}
+</script>
+"""
+
+_INLINE_FONTS_LINK = (
+    '<link rel="preload" as="style" href="{url}" onload="this.rel=\'stylesheet\'">'
+    '<noscript><link rel="stylesheet" href="{url}"></noscript>'
+)
+
+
+@functools.lru_cache(maxsize=2)
+def _read_css(path: str, mtime_ns: int) -> Tuple[str, str]:
+    css = Path(path).read_text(encoding="utf-8")
+    return css, hashlib.sha256(css.encode("utf-8")).hexdigest()[:12]
+
+
+def load_css() -> Tuple[str, str]:
+    """CSS de la app y su versión (hash); se relee solo si cambia el archivo."""
+    return _read_css(str(CSS_PATH), CSS_PATH.stat().st_mtime_ns)
+
+
+def missing_font_files() -> List[str]:
+    """Archivos de `FONT_FILES` que aún no están en `FONTS_DIR`."""
+    return [n for n in FONT_FILES if not (FONTS_DIR / n).is_file()]
+
+
+@functools.lru_cache(maxsize=None)
+def _warn_missing_fonts(faltan: Tuple[str, ...]) -> None:
+    # Una vez por proceso: el pendiente queda visible en el log de la app
+    logger.warning(
+        f"Fuentes locales faltantes en {FONTS_DIR}: {', '.join(faltan)}; "
+        "Montserrat se carga desde Google Fonts (ver static/fonts/README.txt)"
+    )
+
+
+def remote_fonts_url() -> str:
+    """URL de Google Fonts si faltan fuentes locales; "" si están todas."""
+    faltan = missing_font_files()
+    if not faltan:
+        return ""
+    _warn_missing_fonts(tuple(faltan))
+    return REMOTE_FONTS_URL
+
 
 def inject_custom_css():
-    """Inyecta el CSS previo simple (pre-mejoras)."""
-    st.markdown(
-        """
-        <style>
-        @import url('https://fonts.googleapis.com/css2?family=Montserrat:wght@400;600;700&display=swap');
-        :root {
-            --primary-color: #003696;
-            --primary-hover: #002a75;
-            --bg-color: #F0F4FF;
-            --card-bg: #E6EEFF;
-            --sidebar-bg: #003696;
-            --sidebar-text: #ffffff;
-            --button-primary: #003696;
-            --button-secondary: #E6EEFF;
-        }
-        .stApp {
-            font-family: 'Montserrat', sans-serif !important;
-            background-color: var(--bg-color);
-        }
-        [data-testid="stSidebar"] {
-            background-color: var(--sidebar-bg) !important;
-        }
-        [data-testid="stSidebar"] * {
-            color: var(--sidebar-text) !important;
-        }
-        div[data-testid="stVerticalBlock"] > div[style*="background-color"] {
-            background-color: var(--card-bg) !important;
-            border-radius: 12px;
-            padding: 1.5rem;
-            box-shadow: 0 4px 20px rgba(0, 0, 0, 0.05);
-            border: 1px solid #B3C6FF;
-        }
-        .stButton button {
-            background-color: var(--button-primary) !important;
-            color: white !important;
-            border-radius: 8px !important;
-            border: none !important;
-            padding: 0.5rem 1.2rem !important;
-            font-weight: 600 !important;
-            text-transform: none !important;
-            box-shadow: 0 2px 5px rgba(0,54,150,0.2);
-            transition: all 0.3s ease !important;
-        }
-        .stButton button:hover {
-            background-color: var(--primary-hover) !important;
-            transform: translateY(-2px);
-            box-shadow: 0 4px 8px rgba(0,54,150,0.3);
-        }
-        button[kind="secondary"] {
-            background-color: var(--button-secondary) !important;
-            border: 1px solid var(--primary-color) !important;
-            color: var(--primary-color) !important;
-        }
-        [data-testid="stMetric"] {
-            background-color: var(--card-bg);
-            padding: 15px;
-            border-radius: 10px;
-            border: 1px solid #B3C6FF;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.02);
-            text-align: center; 
-        }
-        [data-testid="stMetricLabel"] {
-            font-size: 0.9rem !important;
-            color: #6c757d !important;
-            font-weight: 500;
-        }
-        [data-testid="stMetricValue"] {
-            font-size: 1.8rem !important;
-            color: var(--primary-color) !important;
-            font-weight: 700;
-        }
-        [data-baseweb="select"] {
-            color: black !important; /* Cambia el color del texto a negro */
-            background-color: white !important; /* Asegura el fondo blanco */
-        }
-        [data-baseweb="select"]:hover {
-            border-color: var(--primary-color) !important; /* Resalta el borde al pasar el cursor */
-        }
-        [data-baseweb="select"] .css-1uccc91-singleValue {
-            color: black !important; /* Asegura que la opción seleccionada sea negra */
-        }
-        [data-baseweb="select"] .css-1wa3eu0-placeholder {
-            color: black !important; /* Asegura que el texto seleccionado y el placeholder sean negros */
-        }
-        .st-bm {
-            color: black !important; /* Asegura que el texto dentro del div seleccionado sea negro */
-        }
-        .st-bm input {
-            color: black !important; /* Asegura que el texto del input sea negro */
-        }
-        </style>
-        """,
-        unsafe_allow_html=True,
+    """
+    Inyecta el CSS de components/styles.css.
+
+    La primera ejecución de cada sesión inserta (o actualiza) un <style> en el
+    <head> de la página mediante un componente HTML; como no forma parte del
+    árbol de elementos de Streamlit, persiste entre reruns y los siguientes no
+    vuelven a enviar ni a parsear la hoja de estilos. Si el archivo cambia, la
+    nueva versión se aplica en el siguiente rerun.
+
+    Si faltan las fuentes de static/fonts/, se agrega además el enlace no
+    bloqueante a Google Fonts (`remote_fonts_url`).
+    """
+    css, version = load_css()
+    fonts_url = remote_fonts_url()
+    if not INJECT_ONCE_PER_SESSION:
+        enlace = _INLINE_FONTS_LINK.format(url=fonts_url) if fonts_url else ""
+        st.markdown(f"{enlace}<style>{css}</style>", unsafe_allow_html=True)
+        return
+
+    if st.session_state.get("_css_version") == version:
+        return
+    script = _HEAD_SCRIPT.format(
+        element_id=CSS_ELEMENT_ID,
+        version=version,
+        css=json.dumps(css).replace("</", "<\\/"),
+        fonts_id=FONTS_ELEMENT_ID,
+        fonts_url=json.dumps(fonts_url),
     )
+    st_components.html(script, height=0)
+    st.session_state["_css_version"] = version
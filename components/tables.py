@@ -0,0 +1,132 @@
+"""
+Tabla paginada del lado del servidor para CHAMPILYTICS.
+
+`st.dataframe` serializa el DataFrame completo a Arrow y lo envía por el
+websocket en cada rerun. `paginated_dataframe` ordena y recorta en el
+servidor y solo envía la página visible: el costo de cada rerun depende del
+tamaño de la página, no del de la tabla.
+
+Si quien llama pasa la versión de los datos (p. ej. `DashboardData.version`),
+el orden de filas (argsort de la columna elegida) se guarda en la sesión con
+clave (versión, columna, dirección), así que cambiar de página no vuelve a
+ordenar la tabla. En la sesión solo se guarda el arreglo de posiciones.
+
+Uso:
+    from components.tables import paginated_dataframe
+
+    paginated_dataframe(
+        df, key="metricas", version=data.version, sort_by="fecha", ascending=False
+    )
+"""
+
+import math
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+PAGE_SIZES = [25, 50, 100, 250, 500]
+PAGE_SIZE = 50
+SIN_ORDEN = "(orden original)"
+
+
+def sort_order(df: pd.DataFrame, columna: Optional[str], ascending: bool) -> np.ndarray:
+    """Posiciones de las filas de `df` ordenadas por `columna` (nulos al final)."""
+    if not columna or columna not in df.columns:
+        return np.arange(len(df))
+    serie = df[columna].reset_index(drop=True)
+    return serie.sort_values(
+        ascending=ascending, kind="stable", na_position="last"
+    ).index.to_numpy()
+
+
+def page_slice(
+    df: pd.DataFrame, orden: np.ndarray, pagina: int, tamano: int
+) -> pd.DataFrame:
+    """Filas de la página `pagina` (desde 1) según `orden`."""
+    inicio = (pagina - 1) * tamano
+    return df.iloc[orden[inicio : inicio + tamano]]
+
+
+def _cached_order(
+    df: pd.DataFrame,
+    key: str,
+    version: Optional[str],
+    columna: Optional[str],
+    ascending: bool,
+) -> np.ndarray:
+    """
+    Orden de filas reutilizado entre reruns mientras no cambien la versión de
+    los datos, la columna ni la dirección. Sin versión se ordena cada vez.
+    """
+    if version is None:
+        return sort_order(df, columna, ascending)
+    estado_key = f"_tabla_orden_{key}"
+    clave = (version, columna, ascending)
+    guardado = st.session_state.get(estado_key)
+    if guardado is not None and guardado[0] == clave:
+        return guardado[1]
+    orden = sort_order(df, columna, ascending)
+    st.session_state[estado_key] = (clave, orden)
+    return orden
+
+
+def paginated_dataframe(
+    df: pd.DataFrame,
+    key: str,
+    version: Optional[str] = None,
+    page_size: int = PAGE_SIZE,
+    sort_by: Optional[str] = None,
+    ascending: bool = True,
+    **kwargs,
+) -> pd.DataFrame:
+    """
+    Muestra `df` por páginas con controles de orden y página.
+
+    Args:
+        df: Tabla completa (no se copia ni se serializa entera).
+        key: Prefijo único para los widgets de la tabla.
+        version: Huella de los datos de `df` (misma versión = mismas filas);
+            permite reutilizar el orden entre reruns.
+        page_size: Filas por página iniciales.
+        sort_by: Columna de orden inicial (None = orden original).
+        ascending: Dirección inicial.
+        **kwargs: Se pasan a `st.dataframe` (column_config, hide_index, ...).
+
+    Returns:
+        La página mostrada.
+    """
+    columnas = [SIN_ORDEN] + [str(c) for c in df.columns]
+    col_orden, col_dir, col_tamano, col_pagina = st.columns([3, 2, 2, 2])
+    columna = col_orden.selectbox(
+        "Ordenar por",
+        columnas,
+        index=columnas.index(sort_by) if sort_by in columnas else 0,
+        key=f"{key}_orden",
+    )
+    descendente = col_dir.toggle("Descendente", value=not ascending, key=f"{key}_desc")
+    tamano = col_tamano.selectbox(
+        "Filas por página",
+        PAGE_SIZES,
+        index=PAGE_SIZES.index(page_size) if page_size in PAGE_SIZES else 1,
+        key=f"{key}_tamano",
+    )
+    paginas = max(1, math.ceil(len(df) / tamano))
+    # Sin max_value: el widget conserva su identidad aunque cambie el total
+    pagina = col_pagina.number_input(
+        "Página", min_value=1, value=1, step=1, key=f"{key}_pagina"
+    )
+    pagina = min(int(pagina), paginas)
+
+    columna = None if columna == SIN_ORDEN else columna
+    orden = _cached_order(df, key, version, columna, not descendente)
+    visible = page_slice(df, orden, pagina, tamano)
+
+    st.dataframe(visible, use_container_width=True, **kwargs)
+    inicio = (pagina - 1) * tamano
+    st.caption(
+        f"Página {pagina:,} de {paginas:,} · filas "
+        f"{min(inicio + 1, len(df)):,}–{inicio + len(visible):,} de {len(df):,}"
+    )
+    return visible
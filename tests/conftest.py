@@ -1,5 +1,11 @@
 import os
-from utils.data_manager import COLS_CUENTAS, COLS_METRICAS, CUENTAS_CSV, METRICAS_CSV
+from utils.data_manager import (
+    COLS_CUENTAS,
+    COLS_METRICAS,
+    CUENTAS_CSV,
+    METRICAS_CSV,
+    SNAPSHOT_FILE,
+)
 
 import pytest
 import pandas as pd
@@ -43,6 +49,9 @@ def setup_local_data():
     os.makedirs(os.path.dirname(CUENTAS_CSV), exist_ok=True)
     df_cuentas.to_csv(CUENTAS_CSV, index=False)
     df_metricas.to_csv(METRICAS_CSV, index=False)
+    # El snapshot de seguidores se reconstruye desde los CSV de cada test
+    if os.path.exists(SNAPSHOT_FILE):
+        os.remove(SNAPSHOT_FILE)
 
     yield  # Ejecutar el test
 
@@ -210,28 +219,38 @@ def mock_gspread_client(sample_cuentas_df, sample_metricas_df):
         1. client = gspread.authorize(creds)
         2. spreadsheet = client.open("BaseDatosMatriz")
         3. sheet = spreadsheet.worksheet("cuentas")
-        4. data = sheet.get_all_records()
+        4. data = sheet.get_values()  (o sheet.get_all_records())
 
     Este mock intercepta CADA paso y devuelve objetos falsos:
         1. client → Mock object
         2. spreadsheet → Mock object
-        3. sheet → Mock object con método get_all_records()
-        4. data → Lista de diccionarios (convertida desde DataFrame)
+        3. sheet → Mock object con métodos get_values() y get_all_records()
+        4. data → Matriz de strings con encabezados (como la API real)
+           o lista de diccionarios (convertida desde DataFrame)
 
     Tu código NO SABE que está usando mocks. Cree que habló con Google.
     """
 
+    def as_sheet_values(df: pd.DataFrame):
+        """get_values() devuelve strings formateados, con el header en la fila 0."""
+        filas = df.copy()
+        for col in filas.select_dtypes(include="datetime").columns:
+            filas[col] = filas[col].dt.strftime("%Y-%m-%d")
+        return [list(df.columns)] + filas.astype(str).values.tolist()
+
     # Crear mock del worksheet (hoja individual)
     mock_sheet_cuentas = MagicMock()
     mock_sheet_cuentas.get_all_records.return_value = sample_cuentas_df.to_dict(
         "records"
     )
+    mock_sheet_cuentas.get_values.return_value = as_sheet_values(sample_cuentas_df)
     mock_sheet_cuentas.title = "cuentas"
 
     mock_sheet_metricas = MagicMock()
     mock_sheet_metricas.get_all_records.return_value = sample_metricas_df.to_dict(
         "records"
     )
+    mock_sheet_metricas.get_values.return_value = as_sheet_values(sample_metricas_df)
     mock_sheet_metricas.title = "metricas"
 
     # Crear mock del spreadsheet (archivo completo)
@@ -439,7 +458,7 @@ def capture_logs(caplog):
 
 
 @pytest.fixture(autouse=True)
-def reset_state():
+def reset_state(monkeypatch):
     """
     Limpia estado global antes/después de cada test
 
@@ -447,13 +466,24 @@ def reset_state():
     ---------
     Tests deben ser independientes. Si un test modifica
     una variable global, el siguiente test podría fallar.
+
+    - La caché de PNG de reportes es global al proceso: se vacía.
+    - La caché de figuras de las vistas también: se vacía.
+    - Los tests no levantan el pool de procesos de Kaleido; los que lo
+      prueban crean su propio RenderPool.
     """
+    from utils import chart_render, figure_cache
+
     # Setup: antes del test
+    monkeypatch.setattr(chart_render, "USE_RENDER_POOL", False)
+    chart_render.png_cache.clear()
+    figure_cache.clear_figure_cache()
+
     yield  # ← Aquí se ejecuta el test
 
     # Teardown: después del test
-    # Aquí podrías limpiar archivos temporales, cerrar conexiones, etc.
-    pass
+    chart_render.png_cache.clear()
+    figure_cache.clear_figure_cache()
 
 
 # ========================================
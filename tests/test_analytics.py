@@ -5,7 +5,11 @@ import numpy as np
 import pandas as pd
 import pytest
 
-from utils.analytics import calculate_growth_metrics
+from utils.analytics import (
+    calculate_box_stats,
+    calculate_growth_metrics,
+    latest_followers_by,
+)
 
 
 def make_df(rows):
@@ -144,3 +148,46 @@ def test_orden_cronologico_sobre_datos_desordenados():
 
     res = calculate_growth_metrics(df)
     assert list(res["Mes"]) == ["2024-01", "2024-02", "2024-03"]
+
+
+def test_box_stats_cuartiles_y_bigotes_como_plotly():
+    valores = [1, 2, 3, 4, 5, 6, 7, 8, 100]
+    df = pd.DataFrame({"Mes": ["2024-01"] * 9 + ["2024-02"] * 2, "y": valores + [5, 7]})
+
+    res = calculate_box_stats(df, "Mes", "y").set_index("Mes")
+    ene = res.loc["2024-01"]
+    assert (ene["q1"], ene["median"], ene["q3"]) == (3.0, 5.0, 7.0)
+    # 100 queda fuera de q3 + 1.5 * IQR = 13: el bigote llega al 8
+    assert (ene["lowerfence"], ene["upperfence"]) == (1, 8)
+    assert ene["n"] == 9
+    assert res.loc["2024-02", "median"] == 6.0
+
+
+def test_box_stats_tamano_constante_y_vacio():
+    rng = np.random.default_rng(0)
+    grande = pd.DataFrame(
+        {
+            "Mes": rng.choice(["2024-01", "2024-02", "2024-03"], 100_000),
+            "y": rng.random(100_000),
+        }
+    )
+
+    assert len(calculate_box_stats(grande, "Mes", "y")) == 3
+    vacio = calculate_box_stats(grande.iloc[0:0], "Mes", "y")
+    assert vacio.empty and "upperfence" in vacio.columns
+
+
+def test_seguidores_actuales_usan_el_ultimo_registro_de_cada_cuenta():
+    df = pd.DataFrame(
+        {
+            "id_cuenta": ["a", "a", "b", "c", "c"],
+            "fecha": ["2024-01-01", "2024-03-01", "2024-02-01", "2024-01-01", None],
+            "entidad": ["Norte", "Norte", "Norte", "Sur", "Sur"],
+            "seguidores": [100, 130, 50, 70, 999],
+        }
+    )
+
+    res = latest_followers_by(df, "entidad")
+    # Norte = 130 (a, marzo) + 50 (b); la fila sin fecha de c se descarta
+    assert res.to_dict("list") == {"entidad": ["Norte", "Sur"], "seguidores": [180, 70]}
+    assert latest_followers_by(df.iloc[0:0]).empty
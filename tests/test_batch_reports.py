@@ -0,0 +1,143 @@
+"""
+========================================
+TESTS - EXPORTACIÓN MASIVA DE REPORTES
+========================================
+
+Verifica utils/batch_reports.py: cruce de datos compartido, un PDF por
+institución dentro del ZIP, progreso por institución y errores aislados.
+"""
+
+import io
+import subprocess
+import sys
+import zipfile
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from utils.batch_reports import (
+    generate_all_reports,
+    merge_report_data,
+    report_entities,
+    report_file_name,
+)
+
+
+@pytest.fixture
+def df_completo():
+    cuentas = pd.DataFrame(
+        {
+            "id_cuenta": ["a1", "b1", "c1"],
+            "entidad": ["Colegio A", "Colegio B", "Colegio C"],
+            "plataforma": ["Facebook", "Instagram", "TikTok"],
+        }
+    )
+    filas = []
+    for cuenta in ["a1", "b1", "c1", "huerfana"]:
+        for mes in range(1, 4):
+            filas.append(
+                {
+                    "id_cuenta": cuenta,
+                    "fecha": f"2024-{mes:02d}-01",
+                    "seguidores": 100 * mes,
+                    "interacciones": 10 * mes,
+                    "engagement_rate": 10.0,
+                }
+            )
+    return merge_report_data(cuentas, pd.DataFrame(filas))
+
+
+@pytest.mark.unit
+def test_merge_report_data_asigna_entidad_oficial(df_completo):
+    """
+    TEST: Cada métrica recibe la entidad de 'cuentas'; las huérfanas, "Desconocido"
+    """
+    assert report_entities(df_completo) == ["Colegio A", "Colegio B", "Colegio C"]
+    huerfanas = df_completo[df_completo["id_cuenta"] == "huerfana"]
+    assert set(huerfanas["entidad"]) == {"Desconocido"}
+
+
+@pytest.mark.unit
+def test_generate_all_reports_zip_con_un_pdf_por_institucion(df_completo):
+    """
+    TEST: El ZIP contiene un PDF por institución y el progreso se reporta
+
+    OBJETIVO: Flujo completo en el proceso actual (max_workers=1)
+    """
+
+    # ARRANGE
+    avance = []
+
+    # ACT
+    zip_bytes, errores = generate_all_reports(
+        df_completo,
+        sections=["kpis", "analisis"],
+        max_workers=1,
+        progress_callback=lambda hechos, total, e: avance.append((hechos, total)),
+    )
+
+    # ASSERT
+    assert errores == {}
+    with zipfile.ZipFile(io.BytesIO(zip_bytes)) as zf:
+        assert sorted(zf.namelist()) == [
+            "Reporte_Colegio_A.pdf",
+            "Reporte_Colegio_B.pdf",
+            "Reporte_Colegio_C.pdf",
+        ]
+        assert zf.read("Reporte_Colegio_A.pdf").startswith(b"%PDF")
+    assert avance == [(1, 3), (2, 3), (3, 3)]
+
+
+@pytest.mark.integration
+def test_generate_all_reports_en_pool_de_procesos(df_completo):
+    """
+    TEST: Con varios procesos se generan los mismos reportes y los errores
+    de una institución no detienen a las demás
+    """
+    zip_bytes, errores = generate_all_reports(
+        df_completo,
+        entidades=["Colegio A", "Colegio B", "No Existe"],
+        sections=["kpis"],
+        max_workers=2,
+    )
+
+    assert list(errores) == ["No Existe"]
+    with zipfile.ZipFile(io.BytesIO(zip_bytes)) as zf:
+        assert zf.namelist() == ["Reporte_Colegio_A.pdf", "Reporte_Colegio_B.pdf"]
+
+
+@pytest.mark.unit
+def test_report_file_name_elimina_caracteres_invalidos():
+    assert report_file_name(" Colegio México (Roma)/Sur ") == (
+        "Reporte_Colegio_México_(Roma)Sur.pdf"
+    )
+
+
+@pytest.mark.integration
+def test_importar_la_vista_de_configuracion_no_carga_el_generador_pdf():
+    """
+    TEST: Abrir la vista de Configuración no importa fpdf, plotly.express ni
+    el generador de reportes; se cargan al generar el primer reporte.
+
+    OBJETIVO: Arranque en frío rápido de la app
+    """
+
+    # ARRANGE
+    codigo = (
+        "import sys, views.settings\n"
+        "pesados = ('fpdf', 'plotly.express', 'utils.report_generator')\n"
+        "print(sorted(m for m in pesados if m in sys.modules))"
+    )
+
+    # ACT
+    salida = subprocess.run(
+        [sys.executable, "-c", codigo],
+        cwd=Path(__file__).resolve().parent.parent,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+
+    # ASSERT
+    assert salida.strip().splitlines()[-1] == "[]"
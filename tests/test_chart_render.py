@@ -0,0 +1,121 @@
+"""
+========================================
+TESTS - CACHÉ DE RENDERIZADO DE GRÁFICAS
+========================================
+
+Verifica que utils/chart_render.py reutiliza los PNG de figuras idénticas,
+vuelve a renderizar cuando cambian los datos y respeta el límite de tamaño.
+"""
+
+from unittest.mock import MagicMock
+
+import plotly.express as px
+import pytest
+
+from utils import chart_render
+from utils.chart_render import SizedLRUCache, render_png
+
+
+@pytest.fixture
+def to_image(monkeypatch):
+    """Sustituye a Kaleido: cuenta las exportaciones reales."""
+    chart_render.png_cache.clear()
+    fake = MagicMock(side_effect=lambda fig, **kw: b"PNG" + fig.to_json().encode())
+    monkeypatch.setattr(chart_render.pio, "to_image", fake)
+    yield fake
+    chart_render.png_cache.clear()
+
+
+def _figura(seguidores):
+    return px.line(x=["2024-01", "2024-02", "2024-03"], y=seguidores, title="Evo")
+
+
+@pytest.mark.unit
+def test_render_png_reutiliza_figura_identica(to_image):
+    """
+    TEST: Regenerar la misma gráfica no vuelve a llamar a Kaleido
+
+    OBJETIVO: Dos figuras construidas por separado con los mismos datos
+    comparten el PNG cacheado
+    """
+
+    # ACT
+    primero = render_png(_figura([100, 120, 130]))
+    segundo = render_png(_figura([100, 120, 130]))
+
+    # ASSERT
+    assert primero == segundo
+    assert to_image.call_count == 1
+    stats = chart_render.png_cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+    assert stats["hit_rate"] == 0.5
+
+
+@pytest.mark.unit
+def test_render_png_invalida_si_cambian_datos_o_tamano(to_image):
+    """
+    TEST: Cambiar una serie o el tamaño de salida produce un nuevo render
+    """
+    render_png(_figura([100, 120, 130]))
+    render_png(_figura([100, 120, 131]))
+    render_png(_figura([100, 120, 130]), width=400)
+
+    assert to_image.call_count == 3
+
+
+@pytest.mark.unit
+def test_sized_lru_expulsa_menos_reciente_al_superar_limite():
+    """
+    TEST: Al superar el límite de bytes se expulsa la entrada menos usada
+    """
+
+    # ARRANGE
+    cache = SizedLRUCache("test", max_bytes=10, max_items=100)
+    cache.put("a", b"1234")
+    cache.put("b", b"1234")
+    cache.get("a")  # "a" pasa a ser la más reciente
+
+    # ACT
+    cache.put("c", b"1234")
+
+    # ASSERT
+    assert cache.get("b") is None
+    assert cache.get("a") == b"1234"
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["bytes"] == 8
+
+
+@pytest.mark.unit
+def test_sized_lru_ignora_elementos_mayores_que_el_limite():
+    """
+    TEST: Un valor más grande que toda la caché no la vacía
+    """
+    cache = SizedLRUCache("test", max_bytes=10, max_items=100)
+    cache.put("a", b"1234")
+
+    cache.put("enorme", b"x" * 11)
+
+    assert len(cache) == 1
+    assert cache.get("a") == b"1234"
+
+
+@pytest.mark.unit
+def test_render_png_usa_pool_y_cae_a_local_si_falla(to_image, monkeypatch):
+    """
+    TEST: Con el pool activo se exporta allí; si el pool falla, en el proceso
+    """
+
+    # ARRANGE
+    pool = MagicMock()
+    pool.render.side_effect = [b"desde-pool", TimeoutError("colgado")]
+    monkeypatch.setattr(chart_render, "USE_RENDER_POOL", True)
+    monkeypatch.setattr(chart_render.render_pool, "get_pool", lambda: pool)
+
+    # ACT
+    desde_pool = render_png(_figura([1, 2, 3]))
+    local = render_png(_figura([4, 5, 6]))
+
+    # ASSERT
+    assert desde_pool == b"desde-pool"
+    assert local.startswith(b"PNG")
+    assert to_image.call_count == 1
@@ -347,7 +347,7 @@ def test_get_id_cuando_df_cuentas_vacio_genera_nuevo_id(mock_conectar_sheets):
 @pytest.mark.integration
 def test_load_data_con_worksheet_que_lanza_excepcion(tmp_path):
     """
-    TEST: load_data() maneja excepción en worksheet.get_all_records()
+    TEST: load_data() maneja excepción en worksheet.get_values()
 
     OBJETIVO: Cubrir líneas 193-195, 232-234 (try-except en lectura de sheets)
     """
@@ -355,7 +355,7 @@ def test_load_data_con_worksheet_que_lanza_excepcion(tmp_path):
     # ARRANGE: Mock que lanza excepción en worksheet
     mock_spreadsheet = MagicMock()
     mock_worksheet = MagicMock()
-    mock_worksheet.get_all_records.side_effect = Exception("Worksheet read error")
+    mock_worksheet.get_values.side_effect = Exception("Worksheet read error")
     mock_spreadsheet.worksheet.return_value = mock_worksheet
 
     # Crear CSVs temporales para fallback
@@ -695,7 +695,7 @@ def test_load_data_worksheet_no_encontrado_maneja_error(tmp_path):
     """
     TEST: load_data() maneja error cuando worksheet no existe
 
-    OBJETIVO: Cubrir líneas 203-212, 231-240 (error en worksheet.get_all_records)
+    OBJETIVO: Cubrir líneas 203-212, 231-240 (error en worksheet.get_values)
     """
     # ARRANGE: Mock spreadsheet donde worksheet() lanza excepción
     mock_spreadsheet = MagicMock()
@@ -18,6 +18,12 @@ FIRMAS REALES:
 - reset_db() -> None
 """
 
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
 import pytest
 import pandas as pd
 from unittest.mock import MagicMock, patch
@@ -35,6 +41,14 @@ from utils.data_manager import (
     COLS_CUENTAS,
     COLS_METRICAS,
     reload_colegios_maristas,
+    delete_institution,
+    append_rows_chunked,
+    frame_from_values,
+    DTYPES_METRICAS,
+    latest_per_account,
+    update_snapshot,
+    get_latest_snapshot,
+    get_total_seguidores,
 )
 
 
@@ -142,6 +156,71 @@ def test_load_data_dataframes_tienen_tipos_correctos(mock_conectar_sheets):
         ), "Columna 'interacciones' debe ser numérica"
 
 
+@pytest.mark.unit
+def test_frame_from_values_aplica_tipos_explicitos():
+    """
+    TEST: frame_from_values() construye columnas tipadas desde get_values()
+
+    OBJETIVO: Celdas vacías -> NaN/NaT y encabezados normalizados, sin inferir
+    tipos desde dicts por fila
+    """
+
+    # ARRANGE: matriz cruda como la devuelve Sheets (todo strings)
+    values = [
+        [
+            " ID_Cuenta",
+            "Fecha",
+            "Seguidores",
+            "Alcance",
+            "Interacciones",
+            "Likes_Promedio",
+            "Engagement_Rate",
+        ],
+        ["abc", "2024-01-01", "1000", "5000", "150", "50.5", "15.0"],
+        ["def", "", "", "8000", "x", "", "1.5"],
+    ]
+
+    # ACT
+    df = frame_from_values(values, DTYPES_METRICAS)
+
+    # ASSERT
+    assert list(df.columns) == COLS_METRICAS
+    assert df["id_cuenta"].dtype == "object"
+    assert pd.api.types.is_datetime64_any_dtype(df["fecha"])
+    assert pd.api.types.is_numeric_dtype(df["seguidores"])
+    assert df["seguidores"].iloc[0] == 1000
+    assert df["likes_promedio"].iloc[0] == 50.5
+    assert pd.isna(df["fecha"].iloc[1])
+    assert pd.isna(df["interacciones"].iloc[1])
+
+
+@pytest.mark.unit
+def test_frame_from_values_lee_numeros_con_separador_de_miles():
+    """
+    TEST: Celdas con formato numérico de Sheets ("1,234", "12,345.5") se leen
+    como números, igual que con get_all_records.
+
+    OBJETIVO: Una métrica formateada a mano no se pierde como NaN
+    """
+
+    # ARRANGE
+    values = [
+        ["id_cuenta", "seguidores", "alcance", "engagement_rate"],
+        ["abc", "1,234", "1,000,000", "12,345.5"],
+        ["def", "987", "", "n/a"],
+    ]
+
+    # ACT
+    df = frame_from_values(values, DTYPES_METRICAS)
+
+    # ASSERT
+    assert df["seguidores"].tolist() == [1234, 987]
+    assert df["alcance"].iloc[0] == 1_000_000
+    assert df["engagement_rate"].iloc[0] == 12345.5
+    assert pd.isna(df["alcance"].iloc[1]) and pd.isna(df["engagement_rate"].iloc[1])
+    assert df["id_cuenta"].tolist() == ["abc", "def"]
+
+
 @pytest.mark.unit
 def test_load_data_filtra_metricas_por_cuentas_validas(mock_conectar_sheets):
     """
@@ -371,6 +450,126 @@ def test_guardar_datos_maneja_error_de_sheets(monkeypatch):
     assert resultado is False
 
 
+# ========================================
+# TESTS DE append_rows_chunked()
+# ========================================
+
+
+@pytest.mark.unit
+def test_append_rows_chunked_divide_en_bloques_y_reporta_progreso(tmp_path):
+    """
+    TEST: append_rows_chunked() envía bloques de chunk_size filas
+
+    OBJETIVO: Verificar el troceo y las llamadas al callback de progreso
+    """
+
+    # ARRANGE
+    ws = MagicMock()
+    ws.title = "metricas"
+    rows = [[str(i), "2024-01-01"] for i in range(7)]
+    avances = []
+
+    with patch(
+        "utils.data_manager.UPLOAD_CHECKPOINTS_FILE", tmp_path / "checkpoints.json"
+    ):
+        # ACT
+        enviadas = append_rows_chunked(
+            ws, rows, chunk_size=3, progress_callback=lambda e, t: avances.append(e)
+        )
+
+    # ASSERT
+    assert enviadas == 7
+    assert [len(c.args[0]) for c in ws.append_rows.call_args_list] == [3, 3, 1]
+    assert avances == [0, 3, 6, 7]
+
+
+@pytest.mark.unit
+def test_append_rows_chunked_reanuda_sin_duplicar_tras_fallo(tmp_path):
+    """
+    TEST: Una subida interrumpida se reanuda desde el último bloque confirmado
+
+    OBJETIVO: Reintentar la misma carga no debe duplicar filas en Sheets
+    """
+
+    # ARRANGE: la hoja falla en el tercer bloque del primer intento
+    recibidas = []
+    llamadas = {"n": 0}
+
+    def fake_append_rows(chunk):
+        llamadas["n"] += 1
+        if llamadas["n"] == 3:
+            raise Exception("APIError 503")
+        recibidas.extend(chunk)
+
+    ws = MagicMock()
+    ws.title = "metricas"
+    ws.append_rows.side_effect = fake_append_rows
+    rows = [[str(i)] for i in range(10)]
+    checkpoints = tmp_path / "checkpoints.json"
+
+    with patch("utils.data_manager.UPLOAD_CHECKPOINTS_FILE", checkpoints):
+        with pytest.raises(Exception, match="503"):
+            append_rows_chunked(ws, rows, chunk_size=2)
+
+        # ACT: reintento con las mismas filas
+        enviadas = append_rows_chunked(ws, rows, chunk_size=2)
+
+    # ASSERT
+    assert enviadas == 6
+    assert recibidas == rows
+    assert checkpoints.read_text() == "{}"
+
+
+@pytest.mark.unit
+def test_checkpoints_concurrentes_no_se_pisan_y_vencen(tmp_path):
+    """
+    TEST: Varias subidas registrando checkpoints a la vez conservan todas sus
+    entradas; las de más de UPLOAD_CHECKPOINT_TTL se descartan al escribir.
+
+    OBJETIVO: La reanudación funciona justo con subidas concurrentes y el
+    archivo no crece sin límite
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    from utils import data_manager
+
+    # ARRANGE
+    checkpoints = tmp_path / "checkpoints.json"
+    checkpoints.write_text(
+        json.dumps(
+            {
+                "vieja": {"enviadas": 5, "ts": 0},
+                "formato_previo": 3,
+                "vigente": {"enviadas": 2, "ts": time.time()},
+            }
+        )
+    )
+
+    def subir(i):
+        for enviadas in range(1, 6):
+            data_manager._write_checkpoint(f"subida{i}", enviadas)
+
+    escribir = data_manager.write_text_atomic
+
+    def escritura_lenta(*args, **kwargs):
+        time.sleep(0.005)  # agranda la ventana entre leer y escribir
+        escribir(*args, **kwargs)
+
+    with (
+        patch("utils.data_manager.UPLOAD_CHECKPOINTS_FILE", checkpoints),
+        patch("utils.data_manager.write_text_atomic", escritura_lenta),
+    ):
+        # ACT
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(subir, range(8)))
+        data_manager._write_checkpoint("subida0", None)
+        guardados = json.loads(checkpoints.read_text())
+
+    # ASSERT
+    assert set(guardados) == {"vigente"} | {f"subida{i}" for i in range(1, 8)}
+    assert all(guardados[f"subida{i}"]["enviadas"] == 5 for i in range(1, 8))
+
+
 # ========================================
 # TESTS DE save_batch()
 # ========================================
@@ -466,6 +665,295 @@ def test_save_batch_elimina_duplicados_por_cuenta_y_fecha(
     save_batch(datos)
 
 
+# ========================================
+# TESTS DEL SNAPSHOT DE SEGUIDORES
+# ========================================
+
+
+@pytest.mark.unit
+def test_latest_per_account_toma_el_ultimo_registro_de_cada_cuenta():
+    """
+    TEST: latest_per_account() devuelve la fecha y seguidores más recientes
+    de cada cuenta, aunque las cuentas no compartan la última fecha.
+
+    OBJETIVO: El total de la red no debe ignorar cuentas sin dato en la fecha máxima
+    """
+
+    # ARRANGE
+    metricas = pd.DataFrame(
+        {
+            "id_cuenta": ["A", "a", "b", "b"],
+            "fecha": pd.to_datetime(
+                ["2024-02-01", "2024-01-01", "2024-01-15", "2024-03-01"]
+            ),
+            "seguidores": [200, 100, 50, 70],
+        }
+    )
+
+    # ACT
+    ultimos = latest_per_account(metricas)
+
+    # ASSERT
+    assert ultimos == {
+        "a": {"fecha": "2024-02-01", "seguidores": 200},
+        "b": {"fecha": "2024-03-01", "seguidores": 70},
+    }
+
+
+@pytest.mark.unit
+def test_snapshot_se_reconstruye_y_se_actualiza_al_escribir(tmp_path):
+    """
+    TEST: get_latest_snapshot() reconstruye el snapshot desde el histórico
+    cuando no existe; update_snapshot() lo mantiene al día sin releer el histórico.
+
+    OBJETIVO: La landing obtiene el total en O(cuentas)
+    """
+
+    # ARRANGE
+    cuentas = pd.DataFrame(
+        [["id_a", "Colegio A", "Facebook", "@a"]], columns=COLS_CUENTAS
+    )
+    metricas = pd.DataFrame(
+        {
+            "id_cuenta": ["id_a", "id_a", "huerfana"],
+            "fecha": pd.to_datetime(["2024-01-01", "2024-02-01", "2024-02-01"]),
+            "seguidores": [100, 150, 999],
+        }
+    )
+    fake_load = MagicMock(return_value=(cuentas, metricas))
+
+    with (
+        patch("utils.data_manager.SNAPSHOT_FILE", tmp_path / "snapshot.json"),
+        patch("utils.data_manager.load_data", fake_load),
+    ):
+        # ACT
+        primero = get_total_seguidores()
+        update_snapshot(
+            pd.DataFrame(
+                {
+                    "id_cuenta": ["id_a", "id_b", "id_a"],
+                    "fecha": pd.to_datetime(["2024-03-01", "2024-03-01", "2023-12-01"]),
+                    "seguidores": [180, 40, 1],
+                }
+            )
+        )
+        snapshot = get_latest_snapshot()
+
+    # ASSERT: la cuenta sin registro en 'cuentas' no suma
+    assert primero == 150
+    assert snapshot == {
+        "id_a": {"fecha": "2024-03-01", "seguidores": 180},
+        "id_b": {"fecha": "2024-03-01", "seguidores": 40},
+    }
+    fake_load.assert_called_once()
+
+
+@pytest.mark.unit
+def test_snapshot_de_carga_vacia_o_fallida_no_se_guarda(tmp_path):
+    """
+    TEST: Si load_data() falla o no trae datos, rebuild_snapshot() devuelve
+    {} sin escribir el archivo; con un snapshot vencido se sigue usando ese.
+
+    OBJETIVO: Una caída de Sheets no fija el total de la landing en 0
+    """
+
+    # ARRANGE
+    archivo = tmp_path / "snapshot.json"
+    vacia = MagicMock(return_value=(pd.DataFrame(columns=COLS_CUENTAS), pd.DataFrame()))
+    caida = MagicMock(side_effect=RuntimeError("sin conexión"))
+    vencido = {
+        "generado": 0,
+        "cuentas": {"id_a": {"fecha": "2024-01-01", "seguidores": 5}},
+    }
+
+    with patch("utils.data_manager.SNAPSHOT_FILE", archivo):
+        # ACT
+        with patch("utils.data_manager.load_data", vacia):
+            sin_datos = get_total_seguidores()
+        with patch("utils.data_manager.load_data", caida):
+            sin_conexion = get_latest_snapshot()
+            existia = archivo.exists()
+            archivo.write_text(json.dumps(vencido), encoding="utf-8")
+            conservado = get_total_seguidores()
+
+    # ASSERT
+    assert sin_datos == 0 and sin_conexion == {}
+    assert not existia
+    assert conservado == 5
+    assert json.loads(archivo.read_text(encoding="utf-8")) == vencido
+
+
+@pytest.mark.unit
+def test_delete_institution_quita_sus_cuentas_del_snapshot(tmp_path):
+    """
+    TEST: delete_institution() elimina del snapshot las cuentas borradas.
+
+    OBJETIVO: El total de la landing no incluye instituciones eliminadas
+    """
+
+    # ARRANGE
+    csv_cuentas = tmp_path / "cuentas.csv"
+    pd.DataFrame(
+        [
+            ["id_a", "Colegio A", "Facebook", "@a"],
+            ["id_b", "Colegio B", "Facebook", "@b"],
+        ],
+        columns=COLS_CUENTAS,
+    ).to_csv(csv_cuentas, index=False)
+
+    with (
+        patch("utils.data_manager.conectar_sheets", return_value=None),
+        patch("utils.data_manager.CUENTAS_CSV", csv_cuentas),
+        patch("utils.data_manager.METRICAS_CSV", tmp_path / "metricas.csv"),
+        patch("utils.data_manager.SNAPSHOT_FILE", tmp_path / "snapshot.json"),
+    ):
+        update_snapshot(pd.DataFrame())  # sin snapshot previo no crea uno parcial
+        assert not (tmp_path / "snapshot.json").exists()
+        with patch(
+            "utils.data_manager.load_data",
+            return_value=(
+                pd.read_csv(csv_cuentas),
+                pd.DataFrame(
+                    {
+                        "id_cuenta": ["id_a", "id_b"],
+                        "fecha": pd.to_datetime(["2024-01-01", "2024-01-01"]),
+                        "seguidores": [10, 20],
+                    }
+                ),
+            ),
+        ):
+            get_latest_snapshot()
+
+        # ACT
+        delete_institution("Colegio A")
+        snapshot = get_latest_snapshot()
+
+    # ASSERT
+    assert list(snapshot) == ["id_b"]
+
+
+# ========================================
+# TESTS DE delete_institution()
+# ========================================
+
+
+def _fake_worksheet(sheet_id, grid):
+    """Worksheet falso que responde row_values/col_values desde una matriz."""
+    ws = MagicMock()
+    ws.id = sheet_id
+    ws.row_values.side_effect = lambda n: grid[n - 1]
+    ws.col_values.side_effect = lambda c: [fila[c - 1] for fila in grid]
+    return ws
+
+
+@pytest.mark.unit
+def test_delete_institution_usa_un_solo_batch_update_con_cascada(tmp_path):
+    """
+    TEST: delete_institution() borra cuentas, métricas, metas y comentarios
+    de la institución con un único batch_update de deleteDimension.
+
+    OBJETIVO: Evitar clear() + reescritura completa y no dejar métricas huérfanas
+    """
+
+    # ARRANGE
+    ws_cuentas = _fake_worksheet(
+        0,
+        [
+            COLS_CUENTAS,
+            ["id_a", "Colegio A", "Facebook", "@a"],
+            ["id_b", "Colegio B", "Facebook", "@b"],
+            ["ID_A2", "Colegio A", "Instagram", "@a"],
+        ],
+    )
+    ws_metricas = _fake_worksheet(
+        1,
+        [
+            COLS_METRICAS,
+            ["id_a", "2024-01-01", "1", "1", "1", "1", "1"],
+            ["id_a2", "2024-01-01", "1", "1", "1", "1", "1"],
+            ["id_b", "2024-01-01", "1", "1", "1", "1", "1"],
+            ["id_a", "2024-02-01", "1", "1", "1", "1", "1"],
+        ],
+    )
+    ws_config = _fake_worksheet(
+        2, [["entidad", "meta_seguidores", "meta_engagement"], ["Colegio A", "1", "1"]]
+    )
+    spreadsheet = MagicMock()
+    hojas = {"cuentas": ws_cuentas, "metricas": ws_metricas, "config": ws_config}
+
+    def fake_worksheet(nombre):
+        if nombre not in hojas:
+            import gspread
+
+            raise gspread.exceptions.WorksheetNotFound(nombre)
+        return hojas[nombre]
+
+    spreadsheet.worksheet.side_effect = fake_worksheet
+
+    with (
+        patch("utils.data_manager.conectar_sheets", return_value=spreadsheet),
+        patch("utils.data_manager.CUENTAS_CSV", tmp_path / "cuentas.csv"),
+        patch("utils.data_manager.METRICAS_CSV", tmp_path / "metricas.csv"),
+    ):
+        # ACT
+        resultado = delete_institution("Colegio A")
+
+    # ASSERT
+    assert resultado is True
+    spreadsheet.batch_update.assert_called_once()
+    requests = spreadsheet.batch_update.call_args[0][0]["requests"]
+    rangos = [
+        (
+            r["deleteDimension"]["range"]["sheetId"],
+            r["deleteDimension"]["range"]["startIndex"],
+            r["deleteDimension"]["range"]["endIndex"],
+        )
+        for r in requests
+    ]
+    # Filas contiguas agrupadas y en orden descendente por hoja
+    assert rangos == [(0, 3, 4), (0, 1, 2), (1, 4, 5), (1, 1, 3), (2, 1, 2)]
+    ws_cuentas.clear.assert_not_called()
+
+
+@pytest.mark.unit
+def test_delete_institution_actualiza_csv_local_sin_conexion(tmp_path):
+    """
+    TEST: delete_institution() elimina cuentas y métricas huérfanas del CSV local
+    aunque no haya conexión con Sheets.
+    """
+
+    # ARRANGE
+    csv_cuentas = tmp_path / "cuentas.csv"
+    csv_metricas = tmp_path / "metricas.csv"
+    pd.DataFrame(
+        [
+            ["id_a", "Colegio A", "Facebook", "@a"],
+            ["id_b", "Colegio B", "Facebook", "@b"],
+        ],
+        columns=COLS_CUENTAS,
+    ).to_csv(csv_cuentas, index=False)
+    pd.DataFrame(
+        [
+            ["id_a", "2024-01-01", 1, 1, 1, 1, 1.0],
+            ["id_b", "2024-01-01", 1, 1, 1, 1, 1.0],
+        ],
+        columns=COLS_METRICAS,
+    ).to_csv(csv_metricas, index=False)
+
+    with (
+        patch("utils.data_manager.conectar_sheets", return_value=None),
+        patch("utils.data_manager.CUENTAS_CSV", csv_cuentas),
+        patch("utils.data_manager.METRICAS_CSV", csv_metricas),
+    ):
+        # ACT
+        resultado = delete_institution("Colegio A")
+
+    # ASSERT
+    assert resultado is True
+    assert pd.read_csv(csv_cuentas)["id_cuenta"].tolist() == ["id_b"]
+    assert pd.read_csv(csv_metricas)["id_cuenta"].tolist() == ["id_b"]
+
+
 # ========================================
 # TESTS DE CONSTANTES
 # ========================================
@@ -529,6 +1017,36 @@ def test_cols_metricas_tiene_columnas_correctas():
 # ========================================
 
 
+@pytest.mark.integration
+def test_modo_local_no_importa_librerias_de_google():
+    """
+    TEST: Importar utils y cargar datos sin credenciales usa el CSV local sin
+    importar gspread ni google-auth.
+
+    OBJETIVO: El backend de Sheets se carga bajo demanda (get_backend)
+    """
+
+    # ARRANGE
+    codigo = (
+        "import sys, utils\n"
+        "utils.load_data()\n"
+        "google = ('gspread', 'google.oauth2', 'utils.sheets_backend')\n"
+        "print(sorted(m for m in google if m in sys.modules))"
+    )
+
+    # ACT
+    salida = subprocess.run(
+        [sys.executable, "-c", codigo],
+        cwd=Path(__file__).resolve().parent.parent,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+
+    # ASSERT
+    assert salida.strip().splitlines()[-1] == "[]"
+
+
 @pytest.mark.unit
 def test_conectar_sheets_devuelve_spreadsheet(mock_streamlit_secrets):
     """
@@ -553,8 +1071,8 @@ def test_conectar_sheets_devuelve_spreadsheet(mock_streamlit_secrets):
     mock_credentials = MagicMock()
 
     with (
-        patch("utils.data_manager.Credentials") as mock_creds_class,
-        patch("utils.data_manager.gspread.authorize") as mock_authorize,
+        patch("utils.sheets_backend.Credentials") as mock_creds_class,
+        patch("utils.sheets_backend.gspread.authorize") as mock_authorize,
     ):
         mock_creds_class.from_service_account_info.return_value = mock_credentials
         mock_authorize.return_value = mock_client
@@ -0,0 +1,112 @@
+"""
+========================================
+TESTS - DECIMACIÓN DE SERIES DE TIEMPO
+========================================
+
+Verifica utils/decimation.py: cada traza se reduce a los puntos que caben en
+el ancho de la gráfica sin perder sus picos.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.decimation import (
+    decimate_frame,
+    lttb_indices,
+    minmax_indices,
+    points_for_width,
+)
+
+
+@pytest.fixture
+def serie_con_picos():
+    """Serie diaria de 5 años con un pico y un valle aislados."""
+    fechas = pd.date_range("2020-01-01", periods=1826, freq="D")
+    valores = np.sin(np.arange(1826) / 60) * 100 + 1000
+    valores[700], valores[1500] = 5000, -300
+    return fechas, valores
+
+
+@pytest.mark.unit
+def test_lttb_respeta_el_presupuesto_y_los_extremos(serie_con_picos):
+    """
+    TEST: LTTB devuelve exactamente n_out posiciones crecientes, incluye el
+    primer y el último punto, y un pico aislado no se pierde.
+    """
+
+    # ARRANGE
+    fechas, valores = serie_con_picos
+
+    # ACT
+    elegidos = lttb_indices(pd.Series(fechas), valores, 200)
+
+    # ASSERT
+    assert len(elegidos) == 200
+    assert elegidos[0] == 0 and elegidos[-1] == len(valores) - 1
+    assert np.all(np.diff(elegidos) > 0)
+    assert {700, 1500} <= set(elegidos.tolist())
+    assert len(lttb_indices(fechas, valores[:100], 200)) == 100
+
+
+@pytest.mark.unit
+def test_minmax_conserva_el_minimo_y_maximo_de_cada_bucket(serie_con_picos):
+    """
+    TEST: minmax_indices() toma el mínimo y el máximo de cada bucket.
+
+    OBJETIVO: Ningún pico local desaparece de la gráfica
+    """
+
+    # ARRANGE
+    _, valores = serie_con_picos
+
+    # ACT
+    elegidos = minmax_indices(valores, 100)
+
+    # ASSERT
+    assert len(elegidos) <= 102
+    assert {700, 1500} <= set(elegidos.tolist())
+    bordes = np.linspace(0, len(valores), 51).astype(int)
+    for inicio, fin in zip(bordes[:-1], bordes[1:]):
+        assert inicio + int(np.argmax(valores[inicio:fin])) in elegidos
+
+
+@pytest.mark.unit
+def test_decimate_frame_por_traza_y_ancho(serie_con_picos):
+    """
+    TEST: decimate_frame() reduce cada grupo por separado al presupuesto del
+    ancho en píxeles, ordena por fecha y conserva los picos de todas las
+    columnas Y; los datos pequeños pasan sin cambios.
+    """
+
+    # ARRANGE
+    fechas, valores = serie_con_picos
+    df = pd.DataFrame(
+        {
+            "fecha": np.concatenate([fechas[::-1], fechas]),
+            "seguidores": np.concatenate([valores[::-1], valores]),
+            "engagement_rate": np.concatenate([np.ones(1826), np.arange(1826.0)]),
+            "plataforma": ["Facebook"] * 1826 + ["Instagram"] * 1826,
+        }
+    )
+    presupuesto = points_for_width(300)
+
+    # ACT
+    reducido = decimate_frame(
+        df,
+        "fecha",
+        ["seguidores", "engagement_rate"],
+        group="plataforma",
+        max_points=presupuesto,
+    )
+    pequeno = df.head(50)
+
+    # ASSERT
+    por_traza = reducido.groupby("plataforma")
+    assert (por_traza.size() <= 2 * presupuesto + 2).all()
+    for _, traza in por_traza:
+        assert traza["fecha"].is_monotonic_increasing
+        assert traza["seguidores"].max() == 5000
+        assert traza["seguidores"].min() == -300
+    assert reducido["engagement_rate"].max() == 1825.0
+    assert decimate_frame(pequeno, "fecha", "seguidores") is pequeno
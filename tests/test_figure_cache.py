@@ -0,0 +1,102 @@
+"""
+========================================
+TESTS - CACHÉ DE FIGURAS
+========================================
+
+Verifica utils/figure_cache.py: las figuras se reutilizan entre reruns
+mientras no cambien los datos ni los filtros, con desalojo LRU por memoria y
+tasa de aciertos en el log.
+"""
+
+import logging
+
+import pandas as pd
+import plotly.graph_objects as go
+import pytest
+
+from utils import figure_cache
+from utils.figure_cache import cached_figure, data_version, figure_cache_stats
+
+
+def _figura(n: int = 10) -> go.Figure:
+    return go.Figure(go.Scatter(x=list(range(n)), y=list(range(n))))
+
+
+@pytest.mark.unit
+def test_misma_version_y_filtros_reutiliza_la_figura():
+    """
+    TEST: Con la misma versión de datos, tipo y filtros, la figura no se
+    vuelve a construir; otro filtro u otros datos sí la construyen.
+
+    OBJETIVO: Un widget ajeno a la gráfica no reconstruye la figura
+    """
+
+    # ARRANGE
+    construidas = []
+
+    def construir():
+        construidas.append(1)
+        return _figura()
+
+    df = pd.DataFrame({"fecha": pd.to_datetime(["2024-01-01"]), "seguidores": [10]})
+    version = data_version(df)
+
+    # ACT
+    primera = cached_figure("linea", version, construir, entidad="Norte")
+    segunda = cached_figure("linea", version, construir, entidad="Norte")
+    cached_figure("linea", version, construir, entidad="Sur")
+    cambiada = data_version(df.assign(seguidores=[11]))
+    cached_figure("linea", cambiada, construir, entidad="Norte")
+
+    # ASSERT
+    assert primera is segunda
+    assert len(construidas) == 3
+    assert version == data_version(df.copy())
+    assert figure_cache_stats()["hits"] == 1
+
+
+@pytest.mark.unit
+def test_limite_de_memoria_desaloja_la_menos_usada(monkeypatch):
+    """
+    TEST: Al superar el límite de bytes se desaloja la figura usada hace más
+    tiempo; una figura sin datos (None) no se guarda.
+    """
+
+    # ARRANGE
+    tamano = figure_cache._figure_size(_figura())
+    monkeypatch.setattr(figure_cache.figure_cache, "max_bytes", int(tamano * 2.5))
+
+    # ACT
+    cached_figure("a", "v1", _figura)
+    cached_figure("b", "v1", _figura)
+    cached_figure("a", "v1", _figura)  # "a" pasa a ser la más reciente
+    cached_figure("c", "v1", _figura)
+    vacia = cached_figure("d", "v1", lambda: None)
+
+    # ASSERT
+    stats = figure_cache_stats()
+    assert vacia is None
+    assert stats["items"] == 2 and stats["evictions"] == 1
+    assert figure_cache.figure_cache.get(("v1", "b", ())) is None
+    assert figure_cache.figure_cache.get(("v1", "a", ())) is not None
+
+
+@pytest.mark.unit
+def test_tasa_de_aciertos_en_el_log(monkeypatch, caplog):
+    """
+    TEST: Cada FIGURE_CACHE_LOG_EVERY consultas se registra en INFO el resumen
+    de aciertos de la caché.
+    """
+
+    # ARRANGE
+    monkeypatch.setattr(figure_cache, "FIGURE_CACHE_LOG_EVERY", 4)
+
+    # ACT
+    with caplog.at_level(logging.INFO, logger="utils.figure_cache"):
+        for _ in range(4):
+            cached_figure("torta", "v1", _figura)
+
+    # ASSERT
+    mensajes = [r.getMessage() for r in caplog.records if r.levelno == logging.INFO]
+    assert len(mensajes) == 1
+    assert "3 aciertos / 1 fallos (75%)" in mensajes[0]
@@ -0,0 +1,134 @@
+"""
+========================================
+TESTS - BLOQUEO Y ESCRITURA ATÓMICA DE CSV
+========================================
+
+Verifica que utils/file_lock.py serializa a los escritores concurrentes
+(procesos distintos, como varias sesiones de Streamlit) sin perder filas y
+que los lectores nunca ven un archivo a medio escribir.
+"""
+
+import multiprocessing
+import threading
+
+import pandas as pd
+import pytest
+
+from utils.file_lock import file_lock, read_csv_locked, write_csv_atomic
+
+ESCRITORES = 4
+FILAS_POR_ESCRITOR = 25
+
+
+def _escritor(ruta: str, worker: int) -> None:
+    """Ciclo lectura-modificación-escritura, como save_batch/get_id."""
+    for i in range(FILAS_POR_ESCRITOR):
+        with file_lock(ruta):
+            df = pd.read_csv(ruta)
+            fila = pd.DataFrame([{"worker": worker, "n": i}])
+            write_csv_atomic(
+                pd.concat([df, fila], ignore_index=True), ruta, index=False
+            )
+
+
+def _lector(ruta: str, errores) -> None:
+    """Lee continuamente; cada lectura debe ser un CSV completo y creciente."""
+    ultimo = 0
+    total = ESCRITORES * FILAS_POR_ESCRITOR
+    while ultimo < total:
+        try:
+            df = read_csv_locked(ruta)
+        except Exception as e:  # CSV truncado o corrupto
+            errores.put(repr(e))
+            return
+        if list(df.columns) != ["worker", "n"] or len(df) < ultimo:
+            errores.put(f"lectura inconsistente: {len(df)} filas tras {ultimo}")
+            return
+        ultimo = len(df)
+
+
+@pytest.mark.integration
+def test_escritores_concurrentes_multiproceso_no_pierden_filas(tmp_path):
+    """
+    TEST: Varios procesos escribiendo el mismo CSV a la vez no pierden filas
+
+    OBJETIVO: Reproducir dos sesiones guardando al mismo tiempo (stress test)
+    """
+
+    # ARRANGE
+    ruta = tmp_path / "metricas.csv"
+    pd.DataFrame(columns=["worker", "n"]).to_csv(ruta, index=False)
+    errores = multiprocessing.Queue()
+
+    procesos = [
+        multiprocessing.Process(target=_escritor, args=(str(ruta), w))
+        for w in range(ESCRITORES)
+    ]
+    procesos.append(multiprocessing.Process(target=_lector, args=(str(ruta), errores)))
+
+    # ACT
+    for p in procesos:
+        p.start()
+    for p in procesos:
+        p.join(timeout=120)
+
+    # ASSERT
+    assert all(p.exitcode == 0 for p in procesos)
+    assert errores.empty(), errores.get()
+    df = pd.read_csv(ruta)
+    assert len(df) == ESCRITORES * FILAS_POR_ESCRITOR
+    assert not df.duplicated().any()
+    # Sin temporales huérfanos junto al CSV
+    assert not list(tmp_path.glob(".metricas.csv.*.tmp"))
+
+
+@pytest.mark.unit
+def test_file_lock_es_reentrante_en_el_mismo_hilo(tmp_path):
+    """
+    TEST: Un hilo que ya tiene el bloqueo exclusivo puede volver a pedirlo
+    (p. ej. save_batch → load_data) sin auto-bloquearse.
+    """
+    ruta = tmp_path / "cuentas.csv"
+    pd.DataFrame({"a": [1]}).to_csv(ruta, index=False)
+
+    with file_lock(ruta):
+        df = read_csv_locked(ruta)
+        write_csv_atomic(df, ruta, index=False)
+
+    assert pd.read_csv(ruta)["a"].tolist() == [1]
+
+
+@pytest.mark.unit
+def test_file_lock_serializa_hilos(tmp_path):
+    """
+    TEST: Sesiones en hilos distintos del mismo proceso también se serializan
+    """
+    ruta = tmp_path / "cuentas.csv"
+    pd.DataFrame(columns=["worker", "n"]).to_csv(ruta, index=False)
+
+    hilos = [threading.Thread(target=_escritor, args=(str(ruta), w)) for w in range(3)]
+    for h in hilos:
+        h.start()
+    for h in hilos:
+        h.join()
+
+    assert len(pd.read_csv(ruta)) == 3 * FILAS_POR_ESCRITOR
+
+
+@pytest.mark.unit
+def test_write_csv_atomic_conserva_original_si_falla(tmp_path):
+    """
+    TEST: Si la escritura falla a mitad, el archivo original queda intacto
+    """
+    ruta = tmp_path / "cuentas.csv"
+    pd.DataFrame({"a": [1, 2]}).to_csv(ruta, index=False)
+
+    class Explota(pd.DataFrame):
+        def to_csv(self, *args, **kwargs):
+            raise IOError("disco lleno")
+
+    with pytest.raises(IOError):
+        write_csv_atomic(Explota({"a": [3]}), ruta, index=False)
+
+    assert pd.read_csv(ruta)["a"].tolist() == [1, 2]
+    assert not list(tmp_path.glob("*.tmp"))
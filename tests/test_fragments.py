@@ -0,0 +1,126 @@
+"""
+========================================
+TESTS - FRAGMENTOS DEL TABLERO
+========================================
+
+Verifica components/fragments.py (fragmentos con medición de latencia y
+fallback sin soporte de fragmentos) y el conjunto enriquecido que comparten
+los fragmentos de views/dashboard.py.
+"""
+
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+
+from components import fragments
+from views.dashboard import TODAS, build_dashboard_data
+
+
+@pytest.fixture
+def sesion(monkeypatch):
+    estado = {}
+    monkeypatch.setattr("streamlit.session_state", estado)
+    return estado
+
+
+@pytest.mark.unit
+def test_fragmento_usa_la_api_disponible_de_streamlit(sesion, monkeypatch):
+    """
+    TEST: fragment() envuelve la función con st.fragment o, si no existe,
+    con st.experimental_fragment.
+    """
+
+    # ARRANGE
+    experimental = MagicMock(side_effect=lambda f: f)
+    monkeypatch.delattr("streamlit.fragment", raising=False)
+    monkeypatch.setattr("streamlit.experimental_fragment", experimental, raising=False)
+
+    # ACT
+    @fragments.fragment
+    def bloque(x):
+        return x * 2
+
+    # ASSERT
+    experimental.assert_called_once()
+    assert bloque(21) == 42
+    assert bloque.__name__ == "bloque"
+
+
+@pytest.mark.unit
+def test_sin_soporte_de_fragmentos_se_ejecuta_y_mide(sesion, monkeypatch):
+    """
+    TEST: Sin st.fragment ni st.experimental_fragment, la función se ejecuta
+    como parte normal del script y cada ejecución queda registrada.
+
+    OBJETIVO: La latencia por fragmento se mide con o sin soporte
+    """
+
+    # ARRANGE
+    monkeypatch.delattr("streamlit.fragment", raising=False)
+    monkeypatch.delattr("streamlit.experimental_fragment", raising=False)
+
+    @fragments.fragment
+    def constructor():
+        return "ok"
+
+    # ACT
+    resultados = [constructor() for _ in range(3)]
+    resumen = fragments.fragment_latency()
+
+    # ASSERT
+    assert resultados == ["ok"] * 3
+    assert resumen["constructor"]["n"] == 3
+    assert resumen["constructor"]["ultimo_ms"] >= 0
+    assert len(sesion[fragments.LATENCY_KEY]["constructor"]) == 3
+
+
+@pytest.mark.unit
+def test_datos_enriquecidos_se_calculan_una_vez_para_todos_los_fragmentos():
+    """
+    TEST: build_dashboard_data() fusiona, filtra por institución y precalcula
+    el mes de cada fila y el resumen mensual que antes se recalculaba en cada
+    gráfica y tabla.
+    """
+
+    # ARRANGE
+    cuentas = pd.DataFrame(
+        {
+            "id_cuenta": ["a", "b"],
+            "entidad": ["Norte", "Sur"],
+            "plataforma": ["Facebook", "Instagram"],
+            "usuario_red": ["@a", "@b"],
+        }
+    )
+    metricas = pd.DataFrame(
+        {
+            "id_cuenta": ["a", "a", "b"],
+            "fecha": pd.to_datetime(["2024-01-05", "2024-02-05", "2024-01-20"]),
+            "seguidores": [100, 120, 50],
+            "interacciones": [10, 20, 5],
+            "engagement_rate": [2.0, 4.0, 6.0],
+        }
+    )
+
+    # ACT
+    todas = build_dashboard_data(cuentas, metricas, TODAS)
+    norte = build_dashboard_data(cuentas, metricas, "Norte")
+    vacia = build_dashboard_data(cuentas.iloc[0:0], metricas, TODAS)
+
+    # ASSERT
+    assert list(todas.meses) == ["2024-01", "2024-02", "2024-01"]
+    assert todas.mensual.to_dict("list") == {
+        "Mes": ["2024-01", "2024-02"],
+        "seguidores": [150, 120],
+        "interacciones": [15, 20],
+        "engagement_rate": [4.0, 4.0],
+    }
+    assert "Mes" not in todas.df.columns
+    assert set(norte.df["entidad"]) == {"Norte"}
+    assert list(norte.cuentas["id_cuenta"]) == ["a"]
+    assert norte.mensual["seguidores"].tolist() == [100, 120]
+    assert todas.seguidores_actuales.to_dict("list") == {
+        "entidad": ["Norte", "Sur"],
+        "seguidores": [120, 50],
+    }
+    assert not todas.sin_datos and vacia.sin_datos
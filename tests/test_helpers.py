@@ -0,0 +1,228 @@
+"""
+========================================
+TESTS - HELPERS (REPORTE HTML E IMÁGENES)
+========================================
+
+Verifica que utils/helpers.py genera el reporte HTML por partes, con
+paginación opcional y memoria acotada para exportaciones grandes, y que las
+imágenes embebidas se cachean por ruta y fecha de modificación.
+"""
+
+import base64
+import io
+import os
+import sys
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils import helpers
+from utils.helpers import (
+    generar_reporte_html,
+    get_banner_css,
+    get_image_base64,
+    iter_reporte_html,
+    load_optimized_image,
+    write_reporte_html,
+)
+
+
+def _metricas(n: int) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "id_cuenta": np.arange(n) % 40,
+            "fecha": pd.date_range("2020-01-01", periods=n, freq="h"),
+            "seguidores": np.arange(n),
+            "interacciones": np.arange(n) * 2,
+            "engagement_rate": np.linspace(0, 10, n),
+        }
+    )
+
+
+class _Contador(io.TextIOBase):
+    """Destino que solo cuenta caracteres (no retiene el documento)."""
+
+    def __init__(self):
+        self.total = 0
+
+    def write(self, texto):
+        self.total += len(texto)
+        return len(texto)
+
+
+@pytest.mark.unit
+def test_iter_reporte_html_entrega_bloques_y_equivale_al_string():
+    """
+    TEST: Los fragmentos concatenados forman el mismo documento de siempre
+    """
+
+    # ARRANGE
+    df = _metricas(25)
+
+    # ACT
+    partes = list(iter_reporte_html(df, "Prueba", batch_size=10))
+
+    # ASSERT
+    documento = "".join(partes)
+    assert documento.count("<tr><td>") == 25
+    assert len([p for p in partes if p.startswith("<tr>")]) == 3  # 10 + 10 + 5
+    assert "<strong>Total de registros:</strong> 25" in documento
+    assert documento.rstrip().endswith("</html>")
+    # El envoltorio clásico produce el mismo contenido (salvo la hora)
+    assert generar_reporte_html(df, "Prueba").count("<tr><td>") == 25
+
+
+@pytest.mark.unit
+def test_iter_reporte_html_pagina_y_escapa():
+    """
+    TEST: start_row/max_rows limitan la tabla y el texto se escapa
+    """
+    df = _metricas(30)
+    df["id_cuenta"] = df["id_cuenta"].astype(str) + "<b>"
+
+    documento = "".join(iter_reporte_html(df, start_row=10, max_rows=5))
+
+    assert documento.count("<tr><td>") == 5
+    assert "Mostrando registros 11–15 de 30" in documento
+    assert "<b>" not in documento and "&lt;b&gt;" in documento
+    # Las estadísticas siguen siendo del dataset completo
+    assert "<strong>Total de registros:</strong> 30" in documento
+
+
+@pytest.mark.integration
+def test_write_reporte_html_memoria_acotada():
+    """
+    TEST: Exportar miles de filas no construye el documento completo en memoria
+
+    OBJETIVO: El pico de memoria depende del tamaño de bloque, no del total
+    """
+
+    # ARRANGE
+    df = _metricas(40_000)
+    destino = _Contador()
+
+    # ACT
+    tracemalloc.start()
+    write_reporte_html(df, destino, batch_size=500)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # ASSERT
+    assert destino.total > 4_000_000  # documento de más de 4 MB
+    assert pico < destino.total / 2
+
+
+@pytest.mark.unit
+def test_write_reporte_html_a_ruta_y_binario(tmp_path):
+    """
+    TEST: Acepta rutas y archivos binarios (UTF-8)
+    """
+    df = _metricas(5)
+    ruta = tmp_path / "reporte.html"
+    binario = io.BytesIO()
+
+    write_reporte_html(df, ruta, titulo="Institución")
+    write_reporte_html(df, binario, titulo="Institución")
+
+    assert "Institución" in ruta.read_text(encoding="utf-8")
+    assert "Institución".encode("utf-8") in binario.getvalue()
+
+
+# ========================================
+# TESTS DE IMÁGENES
+# ========================================
+
+
+def _banner_png(ruta, ancho=1200, alto=700):
+    """PNG con ruido: pesa más de BANNER_WEBP_MIN_BYTES."""
+    from PIL import Image
+
+    rng = np.random.default_rng(0)
+    pixeles = rng.integers(0, 256, size=(alto, ancho, 3), dtype=np.uint8)
+    Image.fromarray(pixeles, "RGB").save(ruta)
+
+
+@pytest.mark.unit
+def test_get_image_base64_cachea_por_ruta_y_mtime(tmp_path, monkeypatch):
+    """
+    TEST: get_image_base64() no relee el archivo mientras no cambie y se
+    invalida al cambiar su fecha de modificación.
+
+    OBJETIVO: Evitar leer y codificar el banner en cada rerun
+    """
+
+    # ARRANGE
+    ruta = tmp_path / "logo.png"
+    ruta.write_bytes(b"v1")
+    lecturas = []
+    open_real = open
+
+    def open_contado(path, *args, **kwargs):
+        lecturas.append(path)
+        return open_real(path, *args, **kwargs)
+
+    monkeypatch.setattr("builtins.open", open_contado)
+
+    # ACT
+    primero = get_image_base64(ruta)
+    segundo = get_image_base64(ruta)
+    ruta.write_bytes(b"v2")
+    os.utime(ruta, ns=(0, ruta.stat().st_mtime_ns + 1_000_000))
+    tercero = get_image_base64(ruta)
+
+    # ASSERT
+    assert primero == segundo == "djE="
+    assert tercero == "djI="
+    assert len(lecturas) == 2
+
+
+@pytest.mark.unit
+def test_banner_grande_se_sirve_como_webp_reducido(tmp_path, monkeypatch):
+    """
+    TEST: get_banner_css() usa una variante WebP reducida a BANNER_MAX_WIDTH
+    cuando la imagen original es grande.
+    """
+    pytest.importorskip("PIL")
+
+    # ARRANGE
+    _banner_png(tmp_path / "banner.png")
+    monkeypatch.setattr(helpers, "IMAGES_DIR", tmp_path)
+    monkeypatch.setattr(helpers, "BANNER_MAX_WIDTH", 600)
+
+    # ACT
+    mime, img_b64 = load_optimized_image("banner.png", max_width=600)
+    css = get_banner_css("banner.png", height="300px")
+
+    # ASSERT
+    from PIL import Image
+
+    imagen = Image.open(io.BytesIO(base64.b64decode(img_b64)))
+    assert mime == "image/webp"
+    assert imagen.size == (600, 350)
+    assert f"url(data:image/webp;base64,{img_b64})" in css
+    assert "height: 300px" in css
+
+
+@pytest.mark.unit
+def test_banner_sin_pillow_usa_la_imagen_original(tmp_path, monkeypatch):
+    """
+    TEST: Sin Pillow, load_optimized_image() devuelve la imagen original
+    con su tipo MIME.
+    """
+
+    # ARRANGE
+    ruta = tmp_path / "banner.jpg"
+    ruta.write_bytes(b"\xff" * (helpers.BANNER_WEBP_MIN_BYTES + 1))
+    monkeypatch.setattr(helpers, "IMAGES_DIR", tmp_path)
+    monkeypatch.setitem(sys.modules, "PIL", None)
+
+    # ACT
+    mime, img_b64 = load_optimized_image("banner.jpg")
+
+    # ASSERT
+    assert mime == "image/jpeg"
+    assert img_b64 == get_image_base64(ruta)
+    assert load_optimized_image("no_existe.jpg") is None
+    assert get_banner_css("no_existe.jpg") == ""
@@ -0,0 +1,168 @@
+"""
+========================================
+TESTS - CHANGELOG Y ROADMAP CACHEADOS
+========================================
+
+Verifica utils/project_docs.py: entradas estructuradas del changelog,
+búsqueda por índice invertido y caché por fecha de modificación.
+"""
+
+import os
+
+import pytest
+
+from utils import project_docs
+from utils.project_docs import ChangelogDoc, load_changelog, load_roadmap
+
+CHANGELOG = """# Historial
+
+Intro que no es una entrada.
+
+## [1.1.0] - 2025-02-01
+
+### ✨ Agregado
+- **Gráfica de tendencia**:
+  - Línea de referencia por plataforma
+- Exportación a PDF
+
+### 🐛 Corregido
+- Error al cargar métricas vacías
+
+## [1.0.0] - 2025-01-01
+
+### ✨ Agregado
+- Dashboard inicial con KPIs
+
+## Roadmap (Próximas Versiones)
+
+### [2.0.0] - Planificado
+- Gráficas de pronóstico
+"""
+
+
+@pytest.mark.unit
+def test_changelog_se_parsea_en_entradas_con_sus_encabezados():
+    """
+    TEST: Cada elemento de lista (con sus sub-elementos) es una entrada con su
+    versión y sección; los contadores y bloques por versión se precalculan.
+    """
+
+    # ACT
+    doc = ChangelogDoc(CHANGELOG)
+
+    # ASSERT
+    assert [e.texto.split("\n")[0] for e in doc.entries] == [
+        "- **Gráfica de tendencia**:",
+        "- Exportación a PDF",
+        "- Error al cargar métricas vacías",
+        "- Dashboard inicial con KPIs",
+        "- Gráficas de pronóstico",
+    ]
+    assert doc.entries[0].texto.endswith("Línea de referencia por plataforma")
+    assert doc.entries[2].seccion == "### 🐛 Corregido"
+    assert [e.roadmap for e in doc.entries] == [False] * 4 + [True]
+    assert doc.versions[:2] == ["1.1.0", "1.0.0"]
+    assert doc.version_blocks["1.0.0"].startswith("## [1.0.0]")
+    assert (doc.features_count, doc.fixes_count) == (2, 1)
+
+
+@pytest.mark.unit
+def test_busqueda_por_prefijo_sin_acentos_y_todas_las_palabras():
+    """
+    TEST: search() encuentra prefijos de palabras sin distinguir acentos y
+    exige todas las palabras del término.
+
+    OBJETIVO: Filtrar con el índice invertido en lugar de recorrer el markdown
+    """
+
+    # ARRANGE
+    doc = ChangelogDoc(CHANGELOG)
+
+    # ACT
+    graficas = doc.search("grafica")
+    sin_roadmap = doc.search("GRAF", incluir_roadmap=False)
+    ambas = doc.search("referencia plataf")
+    ninguna = doc.search("pdf kpis")
+
+    # ASSERT
+    assert [e.texto.split("\n")[0] for e in graficas] == [
+        "- **Gráfica de tendencia**:",
+        "- Gráficas de pronóstico",
+    ]
+    assert len(sin_roadmap) == 1
+    assert ambas == [doc.entries[0]]
+    assert ninguna == []
+    assert doc.search("  ") == []
+    assert doc.to_markdown(doc.search("pdf")) == (
+        "## [1.1.0] - 2025-02-01\n\n### ✨ Agregado\n- Exportación a PDF"
+    )
+
+
+@pytest.mark.unit
+def test_busqueda_en_parrafos_y_fragmentos_dentro_de_palabras():
+    """
+    TEST: Los párrafos bajo una versión también son entradas, y un fragmento
+    en medio de una palabra se encuentra recorriendo el texto cuando el
+    índice de prefijos no tiene coincidencias.
+    """
+
+    # ARRANGE
+    doc = ChangelogDoc(
+        CHANGELOG.replace(
+            "### ✨ Agregado\n- Dashboard",
+            "Versión con benchmarking\nde la carga inicial.\n\n---\n\n"
+            "### ✨ Agregado\n- Dashboard",
+        )
+    )
+
+    # ACT
+    parrafo = doc.search("carga inicial")
+    fragmento = doc.search("mark")
+    corto = doc.search("d")
+
+    # ASSERT
+    assert [e.texto for e in parrafo] == [
+        "Versión con benchmarking\nde la carga inicial."
+    ]
+    assert parrafo[0].titulo == "## [1.0.0] - 2025-01-01" and not parrafo[0].seccion
+    assert fragmento == parrafo
+    assert doc.search("endenc") == [doc.entries[0]]
+    assert doc.search("pronos", incluir_roadmap=False) == []
+    assert len(corto) == len(doc.entries)
+
+
+@pytest.mark.unit
+def test_documentos_se_cachean_hasta_que_cambia_el_archivo(tmp_path, monkeypatch):
+    """
+    TEST: load_changelog() y load_roadmap() no vuelven a parsear mientras el
+    archivo no cambie de fecha de modificación.
+    """
+
+    # ARRANGE
+    changelog = tmp_path / "CHANGELOG.md"
+    roadmap = tmp_path / "ROADMAP.md"
+    changelog.write_text(CHANGELOG, encoding="utf-8")
+    roadmap.write_text("- [x] **A**: hecho\n- [ ] **B**: pendiente\n", "utf-8")
+    parseos = []
+    original = project_docs.ChangelogDoc
+
+    def contar(content):
+        parseos.append(content)
+        return original(content)
+
+    monkeypatch.setattr(project_docs, "ChangelogDoc", contar)
+
+    # ACT
+    primero = load_changelog(changelog)
+    segundo = load_changelog(changelog)
+    changelog.write_text(CHANGELOG + "\n## [1.2.0] - 2025-03-01\n", "utf-8")
+    os.utime(changelog, ns=(0, changelog.stat().st_mtime_ns + 1_000_000))
+    tercero = load_changelog(changelog)
+    plan = load_roadmap(roadmap)
+
+    # ASSERT
+    assert primero is segundo
+    assert tercero.versions[-1] == "1.2.0"
+    assert len(parseos) == 2
+    assert (plan.completed_tasks, plan.total_tasks, plan.progress) == (1, 2, 50)
+    assert load_roadmap(roadmap) is plan
@@ -0,0 +1,100 @@
+"""
+========================================
+TESTS - POOL PERSISTENTE DE RENDERIZADO
+========================================
+
+Verifica utils/render_pool.py con un renderizador de prueba (sin Kaleido):
+procesos reutilizados entre peticiones, tiempo límite con reinicio
+automático y recuperación si un proceso muere.
+"""
+
+import json
+import os
+import time
+
+import pytest
+
+from utils.render_pool import RenderPool
+
+
+def renderer_prueba(spec: str, width: int, height: int) -> bytes:
+    """Devuelve el PID del proceso; el título controla fallos simulados."""
+    titulo = json.loads(spec).get("layout", {}).get("title", "")
+    if titulo == "lento":
+        time.sleep(30)
+    if titulo == "muere":
+        os._exit(1)
+    if titulo == "error":
+        raise ValueError("figura inválida")
+    return f"{os.getpid()}:{width}x{height}".encode()
+
+
+def _spec(titulo: str = "") -> str:
+    return json.dumps({"data": [], "layout": {"title": titulo}})
+
+
+@pytest.fixture
+def pool():
+    p = RenderPool(size=1, timeout=2, startup_timeout=60, renderer=renderer_prueba)
+    yield p
+    p.shutdown()
+
+
+@pytest.mark.integration
+def test_pool_reutiliza_proceso_caliente(pool):
+    """
+    TEST: Peticiones sucesivas las atiende el mismo proceso ya arrancado
+
+    OBJETIVO: El costo de arranque se paga una sola vez
+    """
+
+    # ACT
+    primero = pool.render(_spec(), 800, 400)
+    inicio = time.perf_counter()
+    segundo = pool.render(_spec(), 800, 400)
+    latencia = time.perf_counter() - inicio
+
+    # ASSERT
+    assert primero == segundo
+    assert primero.endswith(b":800x400")
+    assert int(primero.split(b":")[0]) != os.getpid()
+    assert latencia < 0.5
+
+
+@pytest.mark.integration
+def test_pool_reinicia_proceso_tras_timeout(pool):
+    """
+    TEST: Un renderizado colgado se corta por tiempo y el proceso se reemplaza
+    """
+    pid_inicial = pool.render(_spec(), 10, 10).split(b":")[0]
+
+    with pytest.raises(TimeoutError):
+        pool.render(_spec("lento"), 10, 10)
+
+    pid_nuevo = pool.render(_spec(), 10, 10).split(b":")[0]
+    assert pid_nuevo != pid_inicial
+    assert pool.restarts == 1
+
+
+@pytest.mark.integration
+def test_pool_se_recupera_si_el_proceso_muere(pool):
+    """
+    TEST: Si el proceso muere a mitad de una petición, se levanta otro
+    """
+    with pytest.raises(EOFError):
+        pool.render(_spec("muere"), 10, 10)
+
+    assert pool.render(_spec(), 10, 10).endswith(b":10x10")
+    assert pool.restarts == 1
+
+
+@pytest.mark.integration
+def test_pool_propaga_error_de_figura_sin_reiniciar(pool):
+    """
+    TEST: Un error de la figura se reporta y el proceso sigue vivo
+    """
+    with pytest.raises(RuntimeError, match="figura inválida"):
+        pool.render(_spec("error"), 10, 10)
+
+    assert pool.render(_spec(), 10, 10)
+    assert pool.restarts == 0
@@ -0,0 +1,129 @@
+"""
+========================================
+TESTS - MODELO DE DATOS DE REPORTES
+========================================
+
+Verifica que ReportData agrega por mes y plataforma con calculate_growth_metrics
+y que los seguidores salen del último registro de cada cuenta en el mes.
+"""
+
+import pandas as pd
+import pytest
+
+from utils.analytics import calculate_growth_metrics
+from utils.report_data import ReportData
+
+
+@pytest.fixture
+def df_metricas():
+    filas = []
+    for plataforma, base in [("Facebook", 100), ("Instagram", 200)]:
+        for mes, factor in [(1, 1.0), (2, 1.1), (3, 1.21)]:
+            for dia in (5, 20):
+                filas.append(
+                    {
+                        "id_cuenta": plataforma.lower(),
+                        "plataforma": plataforma,
+                        "fecha": f"2024-{mes:02d}-{dia:02d}",
+                        "seguidores": base * factor,
+                        "alcance": 1000,
+                        "interacciones": 10,
+                        "engagement_rate": 5.0,
+                    }
+                )
+    return pd.DataFrame(filas)
+
+
+@pytest.mark.unit
+def test_report_data_agrega_por_mes_y_plataforma(df_metricas):
+    """
+    TEST: Una fila por (Mes, plataforma) con deltas calculados por plataforma
+    """
+
+    # ACT
+    datos = ReportData(df_metricas)
+
+    # ASSERT
+    assert list(datos.mensual["Mes"]) == [
+        "2024-01",
+        "2024-01",
+        "2024-02",
+        "2024-02",
+        "2024-03",
+        "2024-03",
+    ]
+    facebook = datos.mensual[datos.mensual["plataforma"] == "Facebook"]
+    assert facebook["Delta_Seguidores"].round(6).tolist() == [0.0, 10.0, 10.0]
+
+
+@pytest.mark.unit
+def test_report_data_total_coincide_con_calculate_growth_metrics(df_metricas):
+    """
+    TEST: El total mensual es el de calculate_growth_metrics con seguidores
+    del último registro por cuenta
+    """
+    datos = ReportData(df_metricas)
+
+    pd.testing.assert_frame_equal(
+        datos.total,
+        calculate_growth_metrics(df_metricas, followers_from_latest=True),
+    )
+    assert datos.total["Seguidores"].tolist() == pytest.approx([300, 330, 363])
+    assert datos.total["Interacciones"].tolist() == [40, 40, 40]
+    resumen = datos.growth_summary()
+    assert (resumen["mes_inicio"], resumen["mes_fin"]) == ("2024-01", "2024-03")
+    assert resumen["crecimiento"] == pytest.approx(21.0)
+
+
+@pytest.mark.unit
+def test_report_data_sin_plataforma_ni_alcance():
+    """
+    TEST: Datos mínimos (sin 'plataforma' ni 'alcance') no rompen el modelo
+    """
+    df = pd.DataFrame(
+        {
+            "id_cuenta": ["a", "a"],
+            "fecha": ["2024-01-01", "2024-02-01"],
+            "seguidores": [10, 20],
+            "interacciones": [1, 2],
+            "engagement_rate": [10.0, 10.0],
+        }
+    )
+
+    datos = ReportData(df)
+
+    assert set(datos.mensual["plataforma"]) == {"Total"}
+    assert datos.growth_summary()["crecimiento"] == pytest.approx(100.0)
+
+
+@pytest.mark.unit
+def test_report_data_capturas_diarias_no_inflan_seguidores():
+    """
+    TEST: Con capturas diarias, los seguidores del mes son la audiencia real
+    (no la suma de 30 capturas) y un último mes parcial no simula una caída.
+
+    OBJETIVO: "Inició con X / finalizó con Y" refleja seguidores reales
+    """
+
+    # ARRANGE
+    fechas = pd.date_range("2024-01-01", "2024-03-05", freq="D")
+    df = pd.DataFrame(
+        {
+            "id_cuenta": ["a"] * len(fechas) + ["b"] * len(fechas),
+            "plataforma": ["Facebook"] * len(fechas) + ["Instagram"] * len(fechas),
+            "fecha": list(fechas) * 2,
+            "seguidores": list(range(1000, 1000 + len(fechas))) + [500] * len(fechas),
+            "interacciones": 1,
+            "engagement_rate": 1.0,
+        }
+    )
+
+    # ACT
+    datos = ReportData(df)
+    resumen = datos.growth_summary()
+
+    # ASSERT
+    assert resumen["seguidores_inicio"] == 1030 + 500  # 31 de enero
+    assert resumen["seguidores_fin"] == 1064 + 500  # 5 de marzo
+    assert datos.total["Seguidores"].is_monotonic_increasing
+    assert datos.total["Interacciones"].tolist() == [62, 58, 10]
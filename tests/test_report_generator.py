@@ -0,0 +1,263 @@
+"""
+========================================
+TESTS - GENERACIÓN DE REPORTES PDF
+========================================
+
+Verifica que ReportBuilder genera el PDF por completo en memoria (sin
+archivos temporales) y que es seguro ejecutarlo en paralelo.
+"""
+
+import struct
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+from fpdf import FPDF
+
+from utils import chart_render, report_generator
+from utils.report_generator import ReportBuilder, format_table, png_info
+
+
+def _png_rgba(ancho: int = 4, alto: int = 3) -> bytes:
+    """PNG RGBA mínimo (como los que exporta Kaleido)."""
+
+    def chunk(tipo: bytes, datos: bytes) -> bytes:
+        crc = zlib.crc32(tipo + datos) & 0xFFFFFFFF
+        return struct.pack(">I", len(datos)) + tipo + datos + struct.pack(">I", crc)
+
+    filas = b"".join(
+        b"\x00"
+        + b"".join(
+            bytes([x * 30 % 256, y * 60 % 256, 200, 255 - x]) for x in range(ancho)
+        )
+        for y in range(alto)
+    )
+    ihdr = struct.pack(">IIBBBBB", ancho, alto, 8, 6, 0, 0, 0)
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", ihdr)
+        + chunk(b"IDAT", zlib.compress(filas))
+        + chunk(b"IEND", b"")
+    )
+
+
+@pytest.fixture
+def df_reporte():
+    return pd.DataFrame(
+        {
+            "fecha": pd.date_range("2024-01-01", periods=6, freq="MS"),
+            "seguidores": [100, 120, 130, 150, 160, 190],
+            "interacciones": [10, 12, 15, 14, 18, 20],
+            "engagement_rate": [10.0, 10.0, 11.5, 9.3, 11.2, 10.5],
+        }
+    )
+
+
+@pytest.mark.unit
+def test_png_info_equivale_a_parsepng_de_fpdf(tmp_path):
+    """
+    TEST: El parser en memoria produce lo mismo que FPDF._parsepng desde archivo
+
+    OBJETIVO: Garantizar que la imagen embebida es idéntica a la anterior
+    """
+
+    # ARRANGE
+    png = _png_rgba()
+    ruta = tmp_path / "grafica.png"
+    ruta.write_bytes(png)
+
+    # ACT
+    esperado = FPDF()._parsepng(str(ruta))
+    obtenido = png_info(png)
+
+    # ASSERT
+    assert obtenido == esperado
+    assert "smask" in obtenido  # canal alfa separado
+
+
+@pytest.mark.unit
+def test_generate_no_escribe_en_disco(df_reporte, tmp_path, monkeypatch):
+    """
+    TEST: El reporte con gráficas se genera sin crear archivos
+
+    OBJETIVO: Ni PDF temporal ni PNG temporal en el directorio de trabajo
+    """
+
+    # ARRANGE
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(chart_render.pio, "to_image", lambda fig, **kw: _png_rgba(8, 4))
+
+    # ACT
+    pdf = ReportBuilder(df_reporte, "Colegio México").generate(
+        ["kpis", "graficas", "analisis"]
+    )
+
+    # ASSERT: el PNG con alfa lleva /SMask, que exige PDF 1.4
+    assert pdf.startswith(b"%PDF-1.4")
+    assert b"/Subtype /Image" in pdf and b"/SMask" in pdf
+    assert b"/S /Transparency" in pdf
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.unit
+def test_generate_en_paralelo_es_independiente(df_reporte, monkeypatch):
+    """
+    TEST: Varias sesiones generando reportes a la vez no se interfieren
+    """
+    monkeypatch.setattr(chart_render.pio, "to_image", lambda fig, **kw: _png_rgba(8, 4))
+
+    def generar(i):
+        builder = ReportBuilder(df_reporte, f"Colegio {i}")
+        builder.set_compression(False)  # para poder buscar el texto
+        return builder.generate(["graficas"])
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        pdfs = list(pool.map(generar, range(8)))
+
+    assert all(b"/Subtype /Image" in p for p in pdfs)
+    assert all(f"Colegio {i}".encode() in p for i, p in enumerate(pdfs))
+
+
+@pytest.mark.unit
+def test_grafica_se_exporta_mientras_se_arma_la_portada(df_reporte, monkeypatch):
+    """
+    TEST: generate() lanza la exportación de la gráfica antes de la portada y
+    solo la espera al insertarla.
+
+    OBJETIVO: El hilo del script no queda bloqueado durante el render
+    """
+
+    # ARRANGE
+    empezo, portada = threading.Event(), threading.Event()
+    hilos, vio_portada = [], []
+
+    def fake_render(fig, *args, **kwargs):
+        hilos.append(threading.current_thread())
+        empezo.set()
+        vio_portada.append(portada.wait(5))
+        return _png_rgba(8, 4)
+
+    original = ReportBuilder.add_cover_page
+
+    def cover_concurrente(builder):
+        assert empezo.wait(5), "la gráfica no se lanzó antes de la portada"
+        original(builder)
+        portada.set()
+
+    monkeypatch.setattr(chart_render, "render_png", fake_render)
+    monkeypatch.setattr(ReportBuilder, "add_cover_page", cover_concurrente)
+
+    # ACT
+    pdf = ReportBuilder(df_reporte, "Colegio").generate(["graficas"])
+
+    # ASSERT
+    assert vio_portada == [True]
+    assert hilos[0] is not threading.main_thread()
+    assert b"/Subtype /Image" in pdf
+
+
+@pytest.mark.unit
+def test_format_table_formatea_por_tipo_de_columna():
+    """
+    TEST: Cada tipo de columna se convierte a texto de forma vectorizada
+    """
+
+    # ARRANGE
+    df = pd.DataFrame(
+        {
+            "fecha": pd.to_datetime(["2024-01-15", None]),
+            "plataforma": ["Instagram", "Una plataforma con nombre largo"],
+            "seguidores": [1500.0, float("nan")],
+            "engagement_rate": [3.14159, 10.0],
+        }
+    )
+
+    # ACT
+    tabla = format_table(df, list(df.columns))
+
+    # ASSERT
+    assert tabla.to_dict("list") == {
+        "fecha": ["2024-01-15", ""],
+        "plataforma": ["Instagram", "Una platafor..."],
+        "seguidores": ["1500", ""],
+        "engagement_rate": ["3.14", "10.00"],
+    }
+
+
+@pytest.mark.unit
+def test_tabla_kpis_completa_pagina_con_cabecera_repetida():
+    """
+    TEST: Miles de filas se renderizan todas, con la cabecera en cada página
+
+    OBJETIVO: Sin límite de 15 filas y sin desbordar la página
+    """
+
+    # ARRANGE
+    n = 3000
+    df = pd.DataFrame(
+        {
+            "fecha": pd.date_range("2020-01-01", periods=n, freq="D"),
+            "plataforma": ["Facebook", "Instagram", "TikTok"] * (n // 3),
+            "seguidores": range(n),
+            "interacciones": range(n),
+            "engagement_rate": [1.5] * n,
+        }
+    )
+    builder = ReportBuilder(df, "Colegio")
+    builder.set_compression(False)
+
+    # ACT
+    builder.add_table(df, {c: c for c in df.columns})
+    pdf = builder.output(dest="S")
+
+    # ASSERT
+    paginas_tabla = builder.page
+    assert paginas_tabla > 1
+    assert pdf.count("(SEGUIDORES)") == paginas_tabla
+    assert f"({n - 1})" in pdf  # la última fila está en el PDF
+
+
+@pytest.mark.unit
+def test_reporte_usa_agregados_mensuales_y_no_filas_crudas(monkeypatch):
+    """
+    TEST: Con años de datos diarios, la gráfica y la tabla usan un punto por
+    mes y plataforma
+
+    OBJETIVO: El tamaño del reporte no crece con el número de filas crudas
+    """
+
+    # ARRANGE
+    dias = pd.date_range("2022-01-01", "2023-12-31", freq="D")
+    df = pd.concat(
+        [
+            pd.DataFrame(
+                {
+                    "id_cuenta": plataforma,
+                    "plataforma": plataforma,
+                    "fecha": dias,
+                    "seguidores": range(len(dias)),
+                    "interacciones": 5,
+                    "engagement_rate": 1.0,
+                }
+            )
+            for plataforma in ["Facebook", "Instagram"]
+        ]
+    )
+    figuras = []
+
+    def fake_render(fig, **kw):
+        figuras.append(fig)
+        return _png_rgba(8, 4)
+
+    monkeypatch.setattr(chart_render, "render_png", fake_render)
+    builder = ReportBuilder(df, "Colegio")
+
+    # ACT
+    pdf = builder.generate(["kpis", "graficas", "analisis"])
+
+    # ASSERT
+    assert len(builder.data.mensual) == 24 * 2
+    assert sum(len(traza.x) for traza in figuras[0].data) == 24 * 2
+    assert pdf.startswith(b"%PDF")
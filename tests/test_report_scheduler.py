@@ -0,0 +1,104 @@
+"""
+========================================
+TESTS - PRE-GENERACIÓN PROGRAMADA DE REPORTES
+========================================
+
+Verifica utils/report_scheduler.py: genera PDF y HTML del mes cerrado para
+cada institución, escribe el manifiesto y find_prebuilt los localiza.
+"""
+
+import json
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from utils import chart_render, report_scheduler
+from utils.report_scheduler import closed_month, find_prebuilt, main, run
+
+
+@pytest.fixture
+def datos(monkeypatch):
+    """load_data simulado con dos instituciones y métricas hasta octubre."""
+    cuentas = pd.DataFrame(
+        {"id_cuenta": ["a1", "b1"], "entidad": ["Colegio A", "Colegio B"]}
+    )
+    metricas = pd.DataFrame(
+        [
+            {
+                "id_cuenta": cuenta,
+                "fecha": pd.Timestamp(f"2024-{mes:02d}-15"),
+                "seguidores": 100 * mes,
+                "interacciones": 10,
+                "engagement_rate": 10.0,
+            }
+            for cuenta in ["a1", "b1"]
+            for mes in range(6, 11)
+        ]
+    )
+    monkeypatch.setattr(
+        report_scheduler.dm, "load_data", lambda: (cuentas.copy(), metricas.copy())
+    )
+    # Sin Kaleido: un PNG mínimo válido
+    from tests.test_report_generator import _png_rgba
+
+    monkeypatch.setattr(chart_render.pio, "to_image", lambda fig, **kw: _png_rgba())
+
+
+@pytest.mark.unit
+def test_closed_month_es_el_mes_anterior():
+    assert closed_month(date(2024, 10, 3)) == "2024-09"
+    assert closed_month(date(2024, 1, 1)) == "2023-12"
+
+
+@pytest.mark.integration
+def test_run_genera_reportes_y_manifiesto(datos, tmp_path):
+    """
+    TEST: Un PDF y un HTML por institución y el manifiesto del mes
+
+    OBJETIVO: Solo entra la historia hasta el fin del mes cerrado
+    """
+
+    # ACT
+    entrada = run("2024-09", cache_dir=tmp_path, max_workers=1)
+
+    # ASSERT
+    assert sorted(entrada["reportes"]) == ["Colegio A", "Colegio B"]
+    assert entrada["errores"] == {}
+    manifiesto = json.loads((tmp_path / "manifest.json").read_text("utf-8"))
+    assert manifiesto["2024-09"]["reportes"]["Colegio A"] == {
+        "pdf": "2024-09/Reporte_Colegio_A.pdf",
+        "html": "2024-09/Reporte_Colegio_A.html",
+    }
+    assert (tmp_path / "2024-09/Reporte_Colegio_A.pdf").read_bytes()[:4] == b"%PDF"
+    html = (tmp_path / "2024-09/Reporte_Colegio_A.html").read_text("utf-8")
+    assert "2024-09-15" in html and "2024-10-15" not in html
+
+
+@pytest.mark.integration
+def test_find_prebuilt_devuelve_mes_mas_reciente(datos, tmp_path):
+    """
+    TEST: Con varios meses generados se sirve el más reciente
+    """
+    run("2024-08", cache_dir=tmp_path, max_workers=1)
+    run("2024-09", cache_dir=tmp_path, max_workers=1)
+
+    prearmado = find_prebuilt("Colegio B", cache_dir=tmp_path)
+
+    assert prearmado["mes"] == "2024-09"
+    assert prearmado["pdf"].name == "Reporte_Colegio_B.pdf"
+    assert find_prebuilt("Colegio B", mes="2024-08", cache_dir=tmp_path)
+    assert find_prebuilt("No Existe", cache_dir=tmp_path) is None
+
+
+@pytest.mark.unit
+def test_main_devuelve_error_sin_datos(monkeypatch, tmp_path):
+    """
+    TEST: Sin datos, el punto de entrada termina con código 1 (para cron)
+    """
+    monkeypatch.setattr(
+        report_scheduler.dm, "load_data", lambda: (pd.DataFrame(), pd.DataFrame())
+    )
+
+    assert main(["--mes", "2024-09", "--salida", str(tmp_path)]) == 1
+    assert find_prebuilt("Colegio A", cache_dir=tmp_path) is None
@@ -0,0 +1,194 @@
+"""
+========================================
+TESTS - TRANSPORTE ASÍNCRONO DE SHEETS
+========================================
+
+Verifica utils/sheets_async.py contra un servidor HTTP local que imita la
+API `spreadsheets.values` de Google Sheets v4: lecturas en paralelo y
+aislamiento de errores.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from urllib.parse import unquote, urlparse
+
+import pytest
+
+from utils import sheets_async
+
+RETARDO = 0.3
+
+
+class _FakeSheetsAPI(BaseHTTPRequestHandler):
+    """Atiende GET /values/<hoja>."""
+
+    hojas = {}
+    tokens = []
+
+    def log_message(self, *args):
+        pass
+
+    def _responder(self, codigo, cuerpo):
+        datos = json.dumps(cuerpo).encode()
+        self.send_response(codigo)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(datos)))
+        self.end_headers()
+        self.wfile.write(datos)
+
+    def do_GET(self):
+        self.tokens.append(self.headers.get("Authorization"))
+        hoja = unquote(urlparse(self.path).path.rsplit("/values/", 1)[1])
+        time.sleep(RETARDO)
+        if hoja not in self.hojas:
+            self._responder(400, {"error": {"message": "Unable to parse range"}})
+            return
+        self._responder(200, {"range": hoja, "values": self.hojas[hoja]})
+
+
+@pytest.fixture
+def fake_api():
+    """Servidor local; devuelve (base_url, handler) y lo apaga al terminar."""
+    _FakeSheetsAPI.hojas = {
+        "cuentas": [["id_cuenta", "entidad"], ["a1", "Colegio A"], ["a2"]],
+        "metricas": [["id_cuenta", "fecha", "seguidores"], ["a1", "2024-01-01", "10"]],
+    }
+    _FakeSheetsAPI.tokens = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeSheetsAPI)
+    hilo = threading.Thread(target=server.serve_forever, daemon=True)
+    hilo.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}/v4/spreadsheets", _FakeSheetsAPI
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.mark.integration
+def test_fetch_values_lee_hojas_en_paralelo(fake_api):
+    """
+    TEST: Dos hojas con latencia RETARDO se leen en ~RETARDO, no en 2×RETARDO
+
+    OBJETIVO: Confirmar que las lecturas independientes no son secuenciales
+    """
+
+    # ARRANGE
+    base_url, api = fake_api
+    spreadsheet = SimpleNamespace(id="sheet-123")
+
+    # ACT
+    inicio = time.perf_counter()
+    hojas = sheets_async.fetch_values(
+        spreadsheet, ["cuentas", "metricas"], base_url=base_url, token="tok"
+    )
+    duracion = time.perf_counter() - inicio
+
+    # ASSERT
+    assert duracion < 2 * RETARDO
+    assert hojas["metricas"] == api.hojas["metricas"]
+    # Filas cortas se rellenan como en worksheet.get_values()
+    assert hojas["cuentas"][2] == ["a2", ""]
+    assert api.tokens == ["Bearer tok", "Bearer tok"]
+
+
+@pytest.mark.integration
+def test_fetch_values_aisla_error_de_una_hoja(fake_api):
+    """
+    TEST: Una hoja inexistente devuelve su excepción sin afectar a las demás
+    """
+    base_url, api = fake_api
+
+    hojas = sheets_async.fetch_values(
+        SimpleNamespace(id="x"),
+        ["cuentas", "no_existe"],
+        base_url=base_url,
+        token=lambda: "fresco",
+    )
+
+    assert isinstance(hojas["no_existe"], Exception)
+    assert hojas["cuentas"][1] == ["a1", "Colegio A"]
+    assert set(api.tokens) == {"Bearer fresco"}
+
+
+@pytest.mark.unit
+def test_read_sheets_secuencial_sin_credenciales_reales(mock_gspread_client):
+    """
+    TEST: Con un spreadsheet simulado se usa la lectura secuencial
+
+    OBJETIVO: El transporte asíncrono solo se activa con un gspread real
+    """
+    from utils.data_manager import _read_sheets
+
+    spreadsheet = mock_gspread_client[0].open.return_value
+    assert not sheets_async.supports(spreadsheet)
+
+    hojas = _read_sheets(spreadsheet, ["cuentas", "metricas"])
+
+    assert set(hojas) == {"cuentas", "metricas"}
+    assert not any(isinstance(v, Exception) for v in hojas.values())
+
+
+@pytest.mark.unit
+def test_read_sheets_vuelve_a_secuencial_si_falla_async(monkeypatch):
+    """
+    TEST: Si el transporte paralelo falla, se repite la lectura secuencialmente
+    """
+    from utils import data_manager
+
+    spreadsheet = MagicMock()
+    spreadsheet.worksheet.return_value.get_values.return_value = [["a"], ["1"]]
+    monkeypatch.setattr(sheets_async, "supports", lambda s: True)
+    monkeypatch.setattr(
+        sheets_async,
+        "fetch_values",
+        MagicMock(side_effect=ConnectionError("sin red")),
+    )
+
+    hojas = data_manager._read_sheets(spreadsheet, ["cuentas"])
+
+    assert hojas == {"cuentas": [["a"], ["1"]]}
+
+
+@pytest.mark.unit
+def test_config_y_comentarios_usan_el_mismo_transporte(monkeypatch):
+    """
+    TEST: load_configs() y load_comments() leen su hoja con _read_sheets, con
+    tipos explícitos; una hoja inexistente devuelve el DataFrame vacío.
+
+    OBJETIVO: Las hojas auxiliares no quedan fuera del transporte paralelo
+    """
+    from utils import data_manager
+
+    # ARRANGE
+    hojas = {
+        "config": [["Entidad ", "meta_seguidores", "meta_engagement"], ["A", "10", ""]],
+        "comentarios": [["entidad", "mes", "comentario"], ["A", "2024-01", "ok"]],
+    }
+    leidas = []
+
+    def fake_read(spreadsheet, nombres):
+        leidas.extend(nombres)
+        return {n: hojas.get(n, KeyError(n)) for n in nombres}
+
+    monkeypatch.setattr(data_manager, "conectar_sheets", lambda: MagicMock())
+    monkeypatch.setattr(data_manager, "_read_sheets", fake_read)
+
+    # ACT
+    configs = data_manager.load_configs()
+    comentarios = data_manager.load_comments()
+    del hojas["comentarios"]
+    sin_hoja = data_manager.load_comments()
+
+    # ASSERT
+    assert leidas == ["config", "comentarios", "comentarios"]
+    assert configs.to_dict("records") == [
+        {"entidad": "A", "meta_seguidores": 10.0, "meta_engagement": 0.0}
+    ]
+    assert comentarios.to_dict("records") == [
+        {"entidad": "A", "mes": "2024-01", "comentario": "ok"}
+    ]
+    assert sin_hoja.empty and list(sin_hoja.columns) == data_manager.COLS_COMENTARIOS
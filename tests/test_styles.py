@@ -0,0 +1,139 @@
+"""
+========================================
+TESTS - INYECCIÓN DE CSS
+========================================
+
+Verifica components/styles.py: la hoja de estilos se inyecta una sola vez
+por sesión y se vuelve a enviar solo cuando cambia el archivo.
+"""
+
+import json
+import logging
+import os
+from unittest.mock import MagicMock
+
+import pytest
+
+from components import styles
+
+
+@pytest.fixture
+def sesion(monkeypatch):
+    """Session state y componentes de Streamlit simulados."""
+    estado = {}
+    html = MagicMock()
+    markdown = MagicMock()
+    monkeypatch.setattr("streamlit.session_state", estado)
+    monkeypatch.setattr(styles.st_components, "html", html)
+    monkeypatch.setattr("streamlit.markdown", markdown)
+    return estado, html, markdown
+
+
+@pytest.mark.unit
+def test_css_se_inyecta_una_vez_por_sesion(sesion):
+    """
+    TEST: inject_custom_css() solo envía la hoja de estilos en el primer rerun
+    de la sesión.
+
+    OBJETIVO: Las interacciones no reenvían ni re-parsean el CSS
+    """
+
+    # ARRANGE
+    estado, html, markdown = sesion
+    css, version = styles.load_css()
+
+    # ACT
+    for _ in range(3):
+        styles.inject_custom_css()
+
+    # ASSERT
+    html.assert_called_once()
+    script = html.call_args[0][0]
+    assert json.dumps(css).replace("</", "<\\/") in script
+    assert f'"{styles.CSS_ELEMENT_ID}"' in script
+    assert estado["_css_version"] == version
+    markdown.assert_not_called()
+
+
+@pytest.mark.unit
+def test_css_cambiado_se_reinyecta(sesion, tmp_path, monkeypatch):
+    """
+    TEST: Si styles.css cambia, el siguiente rerun envía la nueva versión.
+    """
+
+    # ARRANGE
+    _, html, _ = sesion
+    ruta = tmp_path / "styles.css"
+    ruta.write_text(".a { color: red; }", encoding="utf-8")
+    monkeypatch.setattr(styles, "CSS_PATH", ruta)
+    styles.inject_custom_css()
+
+    # ACT
+    ruta.write_text(".a { color: blue; }", encoding="utf-8")
+    os.utime(ruta, ns=(0, ruta.stat().st_mtime_ns + 1_000_000))
+    styles.inject_custom_css()
+    styles.inject_custom_css()
+
+    # ASSERT
+    assert html.call_count == 2
+    assert "blue" in html.call_args[0][0]
+
+
+@pytest.mark.unit
+def test_css_sin_import_de_fuentes_remotas_y_modo_inline(sesion, monkeypatch):
+    """
+    TEST: El CSS no usa @import de Google Fonts; con INJECT_ONCE_PER_SESSION
+    desactivado se envía inline con st.markdown en cada rerun.
+    """
+
+    # ARRANGE
+    _, html, markdown = sesion
+    monkeypatch.setattr(styles, "INJECT_ONCE_PER_SESSION", False)
+    css, _ = styles.load_css()
+
+    # ACT
+    styles.inject_custom_css()
+    styles.inject_custom_css()
+
+    # ASSERT
+    assert "fonts.googleapis.com" not in css
+    assert "app/static/fonts/" in css
+    assert markdown.call_count == 2
+    html.assert_not_called()
+
+
+@pytest.mark.unit
+def test_google_fonts_no_bloqueante_solo_si_faltan_fuentes_locales(
+    sesion, tmp_path, monkeypatch, caplog
+):
+    """
+    TEST: Sin los woff2 de static/fonts/ se agrega el enlace preload a Google
+    Fonts con display=swap y se avisa en el log qué archivos faltan; con todos
+    los archivos presentes no se envía.
+
+    OBJETIVO: Montserrat no se pierde mientras las fuentes no estén en el repo
+    """
+
+    # ARRANGE
+    _, html, _ = sesion
+    monkeypatch.setattr(styles, "FONTS_DIR", tmp_path)
+    styles._warn_missing_fonts.cache_clear()
+
+    # ACT
+    with caplog.at_level(logging.WARNING, logger="components.styles"):
+        styles.inject_custom_css()
+    sin_fuentes = html.call_args[0][0]
+    for nombre in styles.FONT_FILES:
+        (tmp_path / nombre).write_bytes(b"wOF2")
+    styles.st.session_state.clear()
+    styles.inject_custom_css()
+    con_fuentes = html.call_args[0][0]
+
+    # ASSERT
+    assert json.dumps(styles.REMOTE_FONTS_URL) in sin_fuentes
+    assert "display=swap" in styles.REMOTE_FONTS_URL
+    assert 'link.rel = "preload"' in sin_fuentes
+    assert styles.remote_fonts_url() == ""
+    assert 'const fontsUrl = "";' in con_fuentes
+    avisos = [r.getMessage() for r in caplog.records]
+    assert len(avisos) == 1 and styles.FONT_FILES[0] in avisos[0]
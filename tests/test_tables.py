@@ -0,0 +1,125 @@
+"""
+========================================
+TESTS - TABLA PAGINADA
+========================================
+
+Verifica components/tables.py: el orden y el recorte se hacen en el servidor
+y a st.dataframe solo llega la página visible.
+"""
+
+from unittest.mock import MagicMock
+
+import numpy as np
+import pandas as pd
+import pytest
+import streamlit as st
+
+from components import tables
+from components.tables import page_slice, paginated_dataframe, sort_order
+
+
+@pytest.fixture
+def widgets(monkeypatch):
+    """Streamlit simulado: cada widget devuelve el valor de `valores`."""
+    valores = {"orden": "seguidores", "desc": True, "tamano": 25, "pagina": 2}
+    columna = MagicMock()
+    columna.selectbox.side_effect = lambda label, opciones, index, key: valores[
+        key.rsplit("_", 1)[1]
+    ]
+    columna.toggle.side_effect = lambda label, value, key: valores["desc"]
+    columna.number_input.side_effect = lambda *a, **k: valores["pagina"]
+    dataframe = MagicMock()
+    monkeypatch.setattr("streamlit.session_state", {})
+    monkeypatch.setattr("streamlit.columns", lambda spec: [columna] * len(spec))
+    monkeypatch.setattr("streamlit.dataframe", dataframe)
+    monkeypatch.setattr("streamlit.caption", MagicMock())
+    return valores, dataframe
+
+
+@pytest.mark.unit
+def test_orden_estable_con_nulos_al_final():
+    """
+    TEST: sort_order() ordena por posición, es estable y deja los nulos al
+    final en ambas direcciones; page_slice() toma la página pedida.
+    """
+
+    # ARRANGE
+    df = pd.DataFrame({"x": [3, np.nan, 1, 3, 2]}, index=[10, 11, 12, 13, 14])
+
+    # ACT
+    asc = sort_order(df, "x", True)
+    desc = sort_order(df, "x", False)
+    pagina = page_slice(df, asc, pagina=2, tamano=2)
+
+    # ASSERT
+    assert asc.tolist() == [2, 4, 0, 3, 1]
+    assert desc.tolist() == [0, 3, 4, 2, 1]
+    assert sort_order(df, None, True).tolist() == [0, 1, 2, 3, 4]
+    assert pagina.index.tolist() == [10, 13]
+
+
+@pytest.mark.unit
+def test_solo_se_envia_la_pagina_visible(widgets):
+    """
+    TEST: paginated_dataframe() envía a st.dataframe solo las filas de la
+    página elegida, ordenadas en el servidor.
+
+    OBJETIVO: El costo por rerun depende del tamaño de página, no de la tabla
+    """
+
+    # ARRANGE
+    valores, dataframe = widgets
+    df = pd.DataFrame({"seguidores": np.arange(10_000)})
+
+    # ACT
+    visible = paginated_dataframe(df, key="t", hide_index=True)
+
+    # ASSERT
+    enviado = dataframe.call_args[0][0]
+    assert len(enviado) == 25
+    assert enviado["seguidores"].tolist() == list(range(9974, 9949, -1))
+    assert dataframe.call_args.kwargs["hide_index"] is True
+    assert visible is enviado
+
+
+@pytest.mark.unit
+def test_cambiar_de_pagina_reutiliza_el_orden(widgets, monkeypatch):
+    """
+    TEST: Con la misma versión de datos y columna, cambiar de página no vuelve
+    a ordenar aunque el DataFrame sea otra copia (st.cache_data devuelve una
+    copia por rerun); una página fuera de rango muestra la última.
+
+    OBJETIVO: La sesión guarda solo el arreglo de orden, no la tabla
+    """
+
+    # ARRANGE
+    valores, dataframe = widgets
+    df = pd.DataFrame({"seguidores": np.arange(100)})
+    llamadas = []
+    original = tables.sort_order
+    monkeypatch.setattr(
+        tables, "sort_order", lambda *a: llamadas.append(a) or original(*a)
+    )
+
+    # ACT
+    paginated_dataframe(df, key="t", version="v1")
+    valores["pagina"] = 99
+    paginated_dataframe(df.copy(), key="t", version="v1")
+    valores["desc"] = False
+    paginated_dataframe(df.copy(), key="t", version="v1")
+    paginated_dataframe(df.copy(), key="t", version="v2")
+    paginated_dataframe(df, key="sin_version")
+    paginated_dataframe(df, key="sin_version")
+
+    # ASSERT
+    assert len(llamadas) == 5
+    assert dataframe.call_args_list[1][0][0]["seguidores"].tolist() == list(
+        range(24, -1, -1)
+    )
+    assert dataframe.call_args_list[2][0][0]["seguidores"].tolist() == list(
+        range(75, 100)
+    )
+    clave, orden = st.session_state["_tabla_orden_t"]
+    assert clave == ("v2", "seguidores", True)
+    assert isinstance(orden, np.ndarray)
+    assert "_tabla_orden_sin_version" not in st.session_state
@@ -9,6 +9,8 @@ from .data_manager import (
     save_batch,
     get_id,
     reset_db,
+    get_latest_snapshot,
+    get_total_seguidores,
     COLEGIOS_MARISTAS,
     COLS_CUENTAS,
     COLS_METRICAS,
@@ -17,9 +19,12 @@ from .data_manager import (
 from .helpers import (
     get_image_base64,
     load_image,
+    load_optimized_image,
     get_banner_css,
     simular,
     generar_reporte_html,
+    iter_reporte_html,
+    write_reporte_html,
 )
 
 __all__ = [
@@ -30,13 +35,18 @@ __all__ = [
     "save_batch",
     "get_id",
     "reset_db",
+    "get_latest_snapshot",
+    "get_total_seguidores",
     "COLEGIOS_MARISTAS",
     "COLS_CUENTAS",
     "COLS_METRICAS",
     # Helpers
     "get_image_base64",
     "load_image",
+    "load_optimized_image",
     "get_banner_css",
     "simular",
     "generar_reporte_html",
+    "iter_reporte_html",
+    "write_reporte_html",
 ]
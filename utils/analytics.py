@@ -34,9 +34,16 @@ def _safe_pct_change(values: pd.Series) -> pd.Series:
     return delta.fillna(0.0)
 
 
-def calculate_growth_metrics(df_metricas: pd.DataFrame) -> pd.DataFrame:
+def calculate_growth_metrics(
+    df_metricas: pd.DataFrame, followers_from_latest: bool = False
+) -> pd.DataFrame:
     """
     Calcula métricas agrupadas por MES y sus variaciones (MoM y YoY).
+
+    Con `followers_from_latest`, los seguidores de cada mes son la suma del
+    último registro de cada cuenta en ese mes (la audiencia al cierre del
+    mes), en lugar de sumar todas las capturas; interacciones y alcance se
+    siguen sumando.
     """
     # 1. Estructura de retorno vacía para Cold Start
     empty_structure = pd.DataFrame(
@@ -80,6 +87,14 @@ def calculate_growth_metrics(df_metricas: pd.DataFrame) -> pd.DataFrame:
         Interacciones=("interacciones", "sum"),
     )
 
+    if followers_from_latest:
+        # Última captura de cada cuenta en el mes (empates: la última fila)
+        ultimos = df.sort_values("fecha", kind="stable").drop_duplicates(
+            ["Mes_DT", "id_cuenta"], keep="last"
+        )
+        por_mes = ultimos.groupby("Mes_DT")["seguidores"].sum()
+        grouped["Seguidores"] = grouped["Mes_DT"].map(por_mes).to_numpy()
+
     grouped = grouped.sort_values("Mes_DT").reset_index(drop=True)
 
     # 4. Cálculos de KPIs derivados
@@ -122,3 +137,77 @@ def calculate_growth_metrics(df_metricas: pd.DataFrame) -> pd.DataFrame:
     ].copy()
 
     return result
+
+
+BOX_WHISKER_IQR = 1.5  # Bigotes de Tukey, como los calcula Plotly
+
+
+def calculate_box_stats(df: pd.DataFrame, by: str, value: str) -> pd.DataFrame:
+    """
+    Estadísticas de diagrama de caja por grupo, calculadas en el servidor.
+
+    Una sola pasada `groupby().quantile()` obtiene q1, mediana y q3; los
+    bigotes llegan al dato más extremo dentro de 1.5 * IQR, igual que en
+    `px.box`. El resultado tiene una fila por grupo, así que la figura pesa
+    lo mismo sin importar cuántas filas tenga `df`.
+
+    Returns:
+        DataFrame con columnas [by, q1, median, q3, lowerfence, upperfence,
+        mean, n], ordenado por `by`.
+    """
+    columnas = [by, "q1", "median", "q3", "lowerfence", "upperfence", "mean", "n"]
+    datos = df[[by, value]].dropna()
+    if datos.empty:
+        return pd.DataFrame(columns=columnas)
+
+    grupos = datos.groupby(by)[value]
+    cuartiles = grupos.quantile([0.25, 0.5, 0.75]).unstack()
+    cuartiles.columns = ["q1", "median", "q3"]
+    iqr = cuartiles["q3"] - cuartiles["q1"]
+    limite_inf = (cuartiles["q1"] - BOX_WHISKER_IQR * iqr).rename("limite_inf")
+    limite_sup = (cuartiles["q3"] + BOX_WHISKER_IQR * iqr).rename("limite_sup")
+
+    # Bigotes: extremos de los datos que caen dentro de los límites
+    limites = datos.join(limite_inf, on=by).join(limite_sup, on=by)
+    dentro = limites[value].between(limites["limite_inf"], limites["limite_sup"])
+    bigotes = limites[dentro].groupby(by)[value].agg(["min", "max"])
+
+    stats = cuartiles.assign(
+        lowerfence=bigotes["min"],
+        upperfence=bigotes["max"],
+        mean=grupos.mean(),
+        n=grupos.size(),
+    )
+    return stats.reset_index()[columnas]
+
+
+def latest_followers_by(df: pd.DataFrame, by: str = "entidad") -> pd.DataFrame:
+    """
+    Seguidores actuales por grupo: suma del último registro de cada cuenta.
+
+    A diferencia de sumar todas las filas (que acumula cada captura mensual
+    o diaria), el resultado es la audiencia vigente de cada grupo. Si una
+    cuenta tiene varias filas con la misma fecha gana la última, como en
+    `utils.data_manager.latest_per_account`.
+
+    Returns:
+        DataFrame [by, seguidores] con una fila por grupo, de mayor a menor.
+    """
+    if df.empty:
+        return pd.DataFrame(columns=[by, "seguidores"])
+    ultimos = (
+        df[["id_cuenta", "fecha", by, "seguidores"]]
+        .assign(
+            fecha=lambda d: pd.to_datetime(d["fecha"], errors="coerce"),
+            seguidores=lambda d: pd.to_numeric(d["seguidores"], errors="coerce"),
+        )
+        .dropna(subset=["fecha"])
+        .sort_values("fecha", kind="stable")
+        .drop_duplicates("id_cuenta", keep="last")
+    )
+    return (
+        ultimos.groupby(by)["seguidores"]
+        .sum()
+        .sort_values(ascending=False)
+        .reset_index()
+    )
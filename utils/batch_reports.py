@@ -0,0 +1,207 @@
+"""
+Exportación masiva de reportes PDF (todas las instituciones en un ZIP).
+
+El dataset enriquecido (métricas + nombre de la entidad) se prepara una sola
+vez y se entrega a cada proceso del pool al arrancar; las tareas solo llevan
+el nombre de la institución. Cada proceso genera sus PDFs (incluidas las
+gráficas) en paralelo con los demás y el resultado se empaqueta en memoria.
+
+Uso:
+    from utils.batch_reports import merge_report_data, generate_all_reports
+
+    df = merge_report_data(cuentas, metricas)
+    zip_bytes, errores = generate_all_reports(df, progress_callback=avance)
+"""
+
+import io
+import multiprocessing
+import os
+import re
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_SECTIONS = ["kpis", "graficas", "analisis"]
+MAX_BATCH_WORKERS = 4
+
+# Dataset compartido dentro de cada proceso del pool (ver _init_worker)
+_DATASET: Optional[pd.DataFrame] = None
+
+
+# ===========================
+# PREPARACIÓN DE DATOS
+# ===========================
+
+
+def merge_report_data(cuentas: pd.DataFrame, metricas: pd.DataFrame) -> pd.DataFrame:
+    """
+    Cruza métricas con cuentas para obtener el nombre oficial de la entidad.
+
+    Las métricas sin cuenta quedan como "Desconocido".
+    """
+    metricas = metricas.copy()
+    cuentas = cuentas.copy()
+    metricas["id_cuenta"] = metricas["id_cuenta"].astype(str).str.strip()
+    cuentas["id_cuenta"] = cuentas["id_cuenta"].astype(str).str.strip()
+
+    # Usar siempre la entidad de 'cuentas' (evita columnas entidad_x/entidad_y)
+    if "entidad" in metricas.columns:
+        metricas = metricas.drop(columns=["entidad"])
+
+    df = pd.merge(
+        metricas, cuentas[["id_cuenta", "entidad"]], on="id_cuenta", how="left"
+    )
+    df["entidad"] = df["entidad"].fillna("Desconocido")
+    return df
+
+
+def report_entities(df: pd.DataFrame) -> List[str]:
+    """Instituciones con datos válidos para reportar, ordenadas."""
+    return [
+        str(e)
+        for e in sorted(df["entidad"].dropna().unique().tolist())
+        if e and str(e).lower() != "nan" and str(e) != "Desconocido"
+    ]
+
+
+def report_file_name(entidad: str) -> str:
+    """Nombre de archivo seguro para el PDF de una institución."""
+    limpio = re.sub(r'[\\/:*?"<>|]', "", str(entidad).strip())
+    return f"Reporte_{limpio.replace(' ', '_')}.pdf"
+
+
+# ===========================
+# GENERACIÓN
+# ===========================
+
+
+def build_report(df: pd.DataFrame, entidad: str, sections: List[str]) -> bytes:
+    """Genera el PDF de una institución a partir del dataset enriquecido."""
+    # fpdf y plotly se importan al generar el primer reporte, no al abrir la vista
+    from utils.report_generator import ReportBuilder
+
+    df_entidad = df[df["entidad"] == entidad].copy()
+    if df_entidad.empty:
+        raise ValueError(f"Sin métricas para {entidad}")
+
+    if "fecha" in df_entidad.columns:
+        df_entidad["fecha"] = pd.to_datetime(df_entidad["fecha"])
+        df_entidad = df_entidad.sort_values("fecha")
+
+    return ReportBuilder(df=df_entidad, entity_name=str(entidad).strip()).generate(
+        sections
+    )
+
+
+def _init_worker(df: pd.DataFrame) -> None:
+    """Inicializador del pool: recibe el dataset una vez por proceso."""
+    global _DATASET
+    _DATASET = df
+
+    # Cada proceso ya es un renderizador en paralelo: exportar localmente
+    from utils import chart_render
+
+    chart_render.USE_RENDER_POOL = False
+
+
+def _build_in_worker(entidad: str, sections: List[str]) -> Tuple[str, bytes]:
+    return entidad, build_report(_DATASET, entidad, sections)
+
+
+def generate_reports(
+    df: pd.DataFrame,
+    entidades: Optional[List[str]] = None,
+    sections: Optional[List[str]] = None,
+    max_workers: Optional[int] = None,
+    progress_callback: Optional[Callable[[int, int, str], None]] = None,
+) -> Tuple[Dict[str, bytes], Dict[str, str]]:
+    """
+    Genera los PDFs de varias instituciones en paralelo.
+
+    Args:
+        df: Dataset enriquecido (ver `merge_report_data`).
+        entidades: Instituciones a incluir (por defecto, todas con datos).
+        sections: Secciones del reporte (por defecto, todas).
+        max_workers: Procesos del pool; 1 genera en el proceso actual.
+        progress_callback: Se llama con (terminados, total, entidad) al
+            completar cada institución.
+
+    Returns:
+        Tupla ({entidad: bytes del PDF}, {entidad: mensaje de error}).
+    """
+    entidades = report_entities(df) if entidades is None else list(entidades)
+    sections = DEFAULT_SECTIONS if sections is None else sections
+    total = len(entidades)
+    if max_workers is None:
+        max_workers = min(MAX_BATCH_WORKERS, os.cpu_count() or 1, total or 1)
+
+    pdfs: Dict[str, bytes] = {}
+    errores: Dict[str, str] = {}
+
+    def registrar(entidad: str, pdf: Optional[bytes], error: Optional[Exception]):
+        if error is None:
+            pdfs[entidad] = pdf
+        else:
+            errores[entidad] = str(error)
+            logger.error(f"Reporte de {entidad} falló: {error}")
+        if progress_callback:
+            progress_callback(len(pdfs) + len(errores), total, entidad)
+
+    if max_workers <= 1:
+        for entidad in entidades:
+            try:
+                registrar(entidad, build_report(df, entidad, sections), None)
+            except Exception as e:
+                registrar(entidad, None, e)
+    else:
+        # Solo las filas de las instituciones pedidas viajan a los procesos
+        dataset = df[df["entidad"].isin(entidades)]
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(dataset,),
+        ) as pool:
+            futuros = {
+                pool.submit(_build_in_worker, entidad, sections): entidad
+                for entidad in entidades
+            }
+            for futuro in as_completed(futuros):
+                entidad = futuros[futuro]
+                try:
+                    registrar(entidad, futuro.result()[1], None)
+                except Exception as e:
+                    registrar(entidad, None, e)
+
+    logger.info(f"Exportación masiva: {len(pdfs)}/{total} reportes generados")
+    return pdfs, errores
+
+
+def generate_all_reports(
+    df: pd.DataFrame,
+    entidades: Optional[List[str]] = None,
+    **kwargs,
+) -> Tuple[bytes, Dict[str, str]]:
+    """
+    Genera los PDFs de varias instituciones y los empaqueta en un ZIP.
+
+    `kwargs` van a `generate_reports`.
+
+    Returns:
+        Tupla (bytes del ZIP, {entidad: mensaje de error} de las que fallaron).
+    """
+    entidades = report_entities(df) if entidades is None else list(entidades)
+    pdfs, errores = generate_reports(df, entidades, **kwargs)
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for entidad in entidades:
+            if entidad in pdfs:
+                zf.writestr(report_file_name(entidad), pdfs[entidad])
+    return buffer.getvalue(), errores
@@ -0,0 +1,187 @@
+"""
+Renderizado de gráficas a imagen para los reportes PDF.
+
+Exportar una figura con Kaleido tarda del orden de segundos (arranca un
+Chromium sin interfaz). Como regenerar el reporte de la misma institución, o
+uno cuyos datos no cambiaron, produce exactamente la misma figura, los PNG se
+guardan en una caché LRU en memoria con clave = hash de la especificación
+completa de la figura (series de datos + layout) y del tamaño de salida.
+
+`render_png_async` devuelve un `Future`: la exportación corre en un hilo
+auxiliar (que espera al pool de procesos) mientras el script de Streamlit
+sigue armando el resto del reporte.
+
+Uso:
+    from utils.chart_render import render_png, render_png_async, png_cache
+
+    png = render_png(fig, width=800, height=400)
+    futuro = render_png_async(fig, width=800, height=400)  # no bloqueante
+    png_cache.stats()  # {'hits': ..., 'misses': ..., 'hit_rate': ...}
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Generic, Hashable, Optional, TypeVar
+
+import plotly.io as pio
+
+from utils import render_pool
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Límites por defecto de la caché de PNG
+PNG_CACHE_MAX_BYTES = 64 * 1024 * 1024  # 64 MB
+PNG_CACHE_MAX_ITEMS = 256
+
+# Exportar en el pool de procesos persistentes (utils.render_pool)
+USE_RENDER_POOL = True
+
+V = TypeVar("V")
+
+
+# ===========================
+# CACHÉ LRU CON LÍMITE DE TAMAÑO
+# ===========================
+
+
+class SizedLRUCache(Generic[V]):
+    """
+    Caché LRU segura entre hilos, limitada por número de entradas y por
+    tamaño total (según `sizeof`). Lleva estadísticas de aciertos y fallos.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_bytes: int,
+        max_items: int,
+        sizeof: Callable[[V], int] = len,
+    ):
+        self.name = name
+        self.max_bytes = max_bytes
+        self.max_items = max_items
+        self._sizeof = sizeof
+        self._items: "OrderedDict[Hashable, V]" = OrderedDict()
+        self._sizes: Dict[Hashable, int] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[V]:
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return self._items[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: Hashable, value: V) -> None:
+        size = self._sizeof(value)
+        if size > self.max_bytes:
+            return  # Nunca cabría: no vaciar la caché por un solo elemento
+        with self._lock:
+            if key in self._items:
+                self._bytes -= self._sizes.pop(key)
+                del self._items[key]
+            self._items[key] = value
+            self._sizes[key] = size
+            self._bytes += size
+            while self._bytes > self.max_bytes or len(self._items) > self.max_items:
+                viejo, _ = self._items.popitem(last=False)
+                self._bytes -= self._sizes.pop(viejo)
+                self.evictions += 1
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], V]) -> V:
+        """Devuelve el valor cacheado o lo calcula (fuera del lock) y lo guarda."""
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self._sizes.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "items": len(self._items),
+                "bytes": self._bytes,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+png_cache: SizedLRUCache[bytes] = SizedLRUCache(
+    "png", max_bytes=PNG_CACHE_MAX_BYTES, max_items=PNG_CACHE_MAX_ITEMS
+)
+
+
+# ===========================
+# RENDERIZADO
+# ===========================
+
+
+def _figure_spec(fig) -> str:
+    return pio.to_json(fig, validate=False, pretty=False, remove_uids=True)
+
+
+def figure_key(fig, width: int, height: int, fmt: str = "png", spec=None) -> str:
+    """Huella de la figura: datos, layout y parámetros de exportación."""
+    spec = _figure_spec(fig) if spec is None else spec
+    h = hashlib.sha256(spec.encode("utf-8"))
+    h.update(f"|{width}x{height}|{fmt}".encode("ascii"))
+    return h.hexdigest()
+
+
+def _export_png(fig, spec: str, width: int, height: int) -> bytes:
+    """Exporta en el pool de procesos; si no está disponible, en este proceso."""
+    if USE_RENDER_POOL:
+        try:
+            return render_pool.get_pool().render(spec, width, height)
+        except Exception as e:
+            logger.warning(f"Pool de render no disponible, exportando local: {e}")
+    return pio.to_image(fig, format="png", width=width, height=height)
+
+
+def render_png(fig, width: int = 800, height: int = 400) -> bytes:
+    """Exporta `fig` a PNG reutilizando el resultado si ya se renderizó."""
+    spec = _figure_spec(fig)
+    key = figure_key(fig, width, height, spec=spec)
+    png = png_cache.get_or_compute(key, lambda: _export_png(fig, spec, width, height))
+    stats = png_cache.stats()
+    logger.info(
+        f"Caché PNG: {stats['hits']} aciertos / {stats['misses']} fallos "
+        f"({stats['hit_rate']:.0%}), {stats['bytes'] / 1e6:.1f} MB"
+    )
+    return png
+
+
+# Hilos que esperan las exportaciones; el trabajo pesado ocurre en el pool
+_render_executor = ThreadPoolExecutor(
+    max_workers=render_pool.RENDER_POOL_SIZE, thread_name_prefix="png"
+)
+
+
+def render_png_async(fig, width: int = 800, height: int = 400) -> "Future[bytes]":
+    """
+    Versión no bloqueante de `render_png`: el PNG se exporta (o se toma de la
+    caché) fuera del hilo que llama, que solo espera al pedir `.result()`.
+    """
+    return _render_executor.submit(render_png, fig, width=width, height=height)
@@ -5,15 +5,26 @@ Maneja conexiones a Google Sheets, carga, guardado de datos y comentarios contex
 
 import streamlit as st
 import pandas as pd
-import gspread
-from google.oauth2.service_account import Credentials
 from pathlib import Path
-from typing import Tuple, Optional, Dict, List
+from typing import TYPE_CHECKING, Tuple, Optional, Dict, List, Callable
+import hashlib
+import importlib
+import json
 import os
+import time
 import uuid
 
 # Importar sistema de logging centralizado
 from utils.logger import get_logger, log_exception
+from utils.file_lock import (
+    file_lock,
+    read_csv_locked,
+    write_csv_atomic,
+    write_text_atomic,
+)
+
+if TYPE_CHECKING:
+    import gspread
 
 # Crear logger para este módulo
 logger = get_logger(__name__)
@@ -28,6 +39,15 @@ DATA_DIR = BASE_DIR / "data"
 CUENTAS_CSV = DATA_DIR / "cuentas.csv"
 METRICAS_CSV = DATA_DIR / "metricas.csv"
 
+# Subida por bloques a Sheets (checkpoints para reanudar cargas interrumpidas)
+UPLOAD_CHUNK_SIZE = 500
+UPLOAD_CHECKPOINTS_FILE = DATA_DIR / ".upload_checkpoints.json"
+UPLOAD_CHECKPOINT_TTL = 7 * 24 * 3600  # segundos; subidas no reintentadas
+
+# Último registro de seguidores por cuenta (total de la red sin leer el histórico)
+SNAPSHOT_FILE = DATA_DIR / "latest_snapshot.json"
+SNAPSHOT_MAX_AGE = 24 * 3600  # segundos; se reconstruye desde el histórico
+
 # Columnas de las tablas
 COLS_CUENTAS = ["id_cuenta", "entidad", "plataforma", "usuario_red"]
 COLS_METRICAS = [
@@ -40,7 +60,25 @@ COLS_METRICAS = [
     "engagement_rate",
 ]
 COLS_CONFIG = ["entidad", "meta_seguidores", "meta_engagement"]
+
+# Tipos explícitos por columna para construir los DataFrames desde Sheets
+DTYPES_CUENTAS = {col: "str" for col in COLS_CUENTAS}
+DTYPES_METRICAS = {
+    "id_cuenta": "str",
+    "fecha": "datetime",
+    "seguidores": "numeric",
+    "alcance": "numeric",
+    "interacciones": "numeric",
+    "likes_promedio": "numeric",
+    "engagement_rate": "numeric",
+}
 COLS_COMENTARIOS = ["entidad", "mes", "comentario"]
+DTYPES_CONFIG = {
+    "entidad": "str",
+    "meta_seguidores": "numeric",
+    "meta_engagement": "numeric",
+}
+DTYPES_COMENTARIOS = {col: "str" for col in COLS_COMENTARIOS}
 
 # Catálogo de instituciones Maristas y sus redes sociales
 COLEGIOS_MARISTAS: Dict[str, Dict[str, str]] = {
@@ -113,12 +151,28 @@ COLEGIOS_MARISTAS: Dict[str, Dict[str, str]] = {
     },
 }
 
+# ===========================
+# BACKENDS DE ALMACENAMIENTO
+# ===========================
+
+# Módulo de cada backend remoto. Se importa la primera vez que se usa, así que
+# el modo local (CSV) nunca carga gspread ni google-auth.
+BACKENDS: Dict[str, str] = {"sheets": "utils.sheets_backend"}
+
+
+def get_backend(nombre: str = "sheets"):
+    """Módulo del backend `nombre`, importado bajo demanda (una sola vez)."""
+    if nombre not in BACKENDS:
+        raise ValueError(f"Backend de datos desconocido: {nombre}")
+    return importlib.import_module(BACKENDS[nombre])
+
+
 # ===========================
 # FUNCIONES DE CONEXIÓN
 # ===========================
 
 
-def conectar_sheets() -> Optional[gspread.Spreadsheet]:
+def conectar_sheets() -> Optional["gspread.Spreadsheet"]:
     """
     Conecta con Google Sheets usando credenciales de Streamlit secrets.
     """
@@ -132,16 +186,8 @@ def conectar_sheets() -> Optional[gspread.Spreadsheet]:
                 pass
             return None
 
-        scope = [
-            "https://www.googleapis.com/auth/spreadsheets",
-            "https://www.googleapis.com/auth/drive",
-        ]
         creds_dict = st.secrets["gcp_service_account"]
-        creds = Credentials.from_service_account_info(creds_dict, scopes=scope)
-        client = gspread.authorize(creds)
-
-        spreadsheet = client.open("BaseDatosMatriz")
-        return spreadsheet
+        return get_backend("sheets").connect(creds_dict)
     except Exception as e:
         logger.error(f"Error conectando a Google Sheets: {e}")
         try:
@@ -154,10 +200,10 @@ def conectar_sheets() -> Optional[gspread.Spreadsheet]:
 def init_files() -> None:
     """Inicializa archivos CSV si no existen (fallback para desarrollo local)."""
     DATA_DIR.mkdir(exist_ok=True)
-    if not CUENTAS_CSV.exists():
-        pd.DataFrame(columns=COLS_CUENTAS).to_csv(CUENTAS_CSV, index=False)
-    if not METRICAS_CSV.exists():
-        pd.DataFrame(columns=COLS_METRICAS).to_csv(METRICAS_CSV, index=False)
+    for ruta, columnas in [(CUENTAS_CSV, COLS_CUENTAS), (METRICAS_CSV, COLS_METRICAS)]:
+        with file_lock(ruta):
+            if not ruta.exists():
+                write_csv_atomic(pd.DataFrame(columns=columnas), ruta, index=False)
 
 
 # ===========================
@@ -184,11 +230,83 @@ def validate_and_fill_columns(
     return df
 
 
+def _typed_column(valores, dtype: Optional[str]) -> pd.Series:
+    """Convierte una columna cruda de Sheets (strings) al tipo indicado."""
+    serie = pd.Series(valores, dtype=object)
+    if dtype == "numeric":
+        # Separador de miles con formato de Sheets ("1,234"), como el
+        # `numericise` de gspread; celdas vacías o no numéricas -> NaN
+        sin_comas = serie.str.replace(",", "", regex=False)
+        serie = sin_comas.where(sin_comas.notna(), serie)
+        return pd.to_numeric(serie, errors="coerce")
+    if dtype == "datetime":
+        return pd.to_datetime(serie, errors="coerce")
+    return serie
+
+
+def frame_from_values(values: List[List[str]], dtypes: Dict[str, str]) -> pd.DataFrame:
+    """
+    Construye un DataFrame columna por columna a partir de la matriz cruda de
+    `worksheet.get_values()` (primera fila = encabezados).
+
+    Evita materializar un dict por fila como `get_all_records` y aplica tipos
+    explícitos, en lugar de que pandas los infiera desde objetos Python.
+
+    Args:
+        values: Matriz de celdas tal como la devuelve `get_values()`.
+        dtypes: Tipo por columna normalizada ("str", "numeric" o "datetime").
+
+    Returns:
+        pd.DataFrame con encabezados normalizados (strip + lower).
+    """
+    if not values:
+        return pd.DataFrame()
+
+    header = [str(h).strip().lower() for h in values[0]]
+    filas = values[1:]
+    columnas = list(zip(*filas)) if filas else []
+
+    data = {}
+    for i, nombre in enumerate(header):
+        if not nombre or nombre in data:
+            continue
+        crudos = columnas[i] if i < len(columnas) else [""] * len(filas)
+        data[nombre] = _typed_column(crudos, dtypes.get(nombre))
+    return pd.DataFrame(data)
+
+
 # ===========================
 # FUNCIONES DE CARGA (CORE)
 # ===========================
 
 
+def _read_sheets(spreadsheet, nombres: List[str]) -> Dict[str, object]:
+    """Lee varias hojas como matrices de `get_values` (ver `sheets_backend`)."""
+    return get_backend("sheets").read_values(spreadsheet, nombres)
+
+
+def _load_sheet_frame(
+    nombre: str, columnas: List[str], dtypes: Dict[str, str]
+) -> pd.DataFrame:
+    """
+    Lee una hoja auxiliar (config, comentarios) por el mismo transporte que
+    `load_data`. Sin conexión, si la hoja no existe o está vacía devuelve un
+    DataFrame vacío con `columnas`.
+    """
+    vacio = pd.DataFrame(columns=columnas)
+    try:
+        spreadsheet = conectar_sheets()
+        if spreadsheet is None:
+            return vacio
+        valores = _read_sheets(spreadsheet, [nombre])[nombre]
+        if isinstance(valores, Exception):
+            raise valores
+        return frame_from_values(valores, dtypes) if valores else vacio
+    except Exception as e:
+        logger.warning(f"No se pudo leer la hoja '{nombre}': {e}")
+        return vacio
+
+
 def load_data() -> Tuple[pd.DataFrame, pd.DataFrame]:
     """
     Carga datos desde Google Sheets con normalización estricta.
@@ -207,14 +325,16 @@ def load_data() -> Tuple[pd.DataFrame, pd.DataFrame]:
         if spreadsheet is None:
             raise Exception("No se pudo conectar a Google Sheets")
 
+        hojas = _read_sheets(spreadsheet, ["cuentas", "metricas"])
+
         # Leer HOJA: cuentas
         try:
-            sheet_cuentas = spreadsheet.worksheet("cuentas")
-            data_cuentas = sheet_cuentas.get_all_records(expected_headers=[])
-            if data_cuentas:
-                cuentas = pd.DataFrame(data_cuentas)
+            data_cuentas = hojas["cuentas"]
+            if isinstance(data_cuentas, Exception):
+                raise data_cuentas
+            if len(data_cuentas) > 1:
+                cuentas = frame_from_values(data_cuentas, DTYPES_CUENTAS)
                 # Limpieza de columnas y datos
-                cuentas.columns = cuentas.columns.str.strip().str.lower()
                 cuentas = validate_and_fill_columns(cuentas, COLS_CUENTAS)
                 if "id_cuenta" in cuentas.columns:
                     cuentas["id_cuenta"] = (
@@ -225,12 +345,12 @@ def load_data() -> Tuple[pd.DataFrame, pd.DataFrame]:
 
         # Leer HOJA: metricas
         try:
-            sheet_metricas = spreadsheet.worksheet("metricas")
-            data_metricas = sheet_metricas.get_all_records(expected_headers=[])
-            if data_metricas:
-                metricas = pd.DataFrame(data_metricas)
+            data_metricas = hojas["metricas"]
+            if isinstance(data_metricas, Exception):
+                raise data_metricas
+            if len(data_metricas) > 1:
+                metricas = frame_from_values(data_metricas, DTYPES_METRICAS)
                 # Limpieza
-                metricas.columns = metricas.columns.str.strip().str.lower()
                 metricas = validate_and_fill_columns(metricas, COLS_METRICAS)
                 if "id_cuenta" in metricas.columns:
                     metricas["id_cuenta"] = (
@@ -252,12 +372,12 @@ def load_data() -> Tuple[pd.DataFrame, pd.DataFrame]:
         init_files()
         try:
             if CUENTAS_CSV.exists():
-                cuentas = pd.read_csv(CUENTAS_CSV, dtype=str, encoding="utf-8-sig")
+                cuentas = read_csv_locked(CUENTAS_CSV, dtype=str, encoding="utf-8-sig")
                 cuentas.columns = cuentas.columns.str.strip().str.lower()
                 cuentas = validate_and_fill_columns(cuentas, COLS_CUENTAS)
 
             if METRICAS_CSV.exists():
-                metricas = pd.read_csv(METRICAS_CSV, encoding="utf-8-sig")
+                metricas = read_csv_locked(METRICAS_CSV, encoding="utf-8-sig")
                 metricas.columns = metricas.columns.str.strip().str.lower()
                 metricas = validate_and_fill_columns(metricas, COLS_METRICAS)
                 if "id_cuenta" in metricas.columns:
@@ -272,6 +392,143 @@ def load_data() -> Tuple[pd.DataFrame, pd.DataFrame]:
     return cuentas, metricas
 
 
+# ===========================
+# SNAPSHOT DE SEGUIDORES
+# ===========================
+
+
+def latest_per_account(metricas: pd.DataFrame) -> Dict[str, Dict]:
+    """
+    Último registro de cada cuenta: {id_cuenta: {"fecha", "seguidores"}}.
+
+    Si una cuenta tiene varias filas con la misma fecha gana la última.
+    """
+    if metricas.empty:
+        return {}
+    df = metricas[["id_cuenta", "fecha", "seguidores"]].copy()
+    df["id_cuenta"] = df["id_cuenta"].astype(str).str.strip().str.lower()
+    df["fecha"] = pd.to_datetime(df["fecha"], errors="coerce")
+    df["seguidores"] = pd.to_numeric(df["seguidores"], errors="coerce").fillna(0)
+    df = df.dropna(subset=["fecha"])
+    ultimos = df.sort_values("fecha", kind="stable").drop_duplicates(
+        "id_cuenta", keep="last"
+    )
+    return {
+        id_cuenta: {"fecha": fecha.strftime("%Y-%m-%d"), "seguidores": int(seg)}
+        for id_cuenta, fecha, seg in ultimos.itertuples(index=False)
+    }
+
+
+def _read_snapshot() -> Optional[Dict]:
+    """Snapshot guardado ({"generado", "cuentas"}); None si no existe o está dañado."""
+    try:
+        if SNAPSHOT_FILE.exists():
+            with file_lock(SNAPSHOT_FILE, shared=True):
+                return json.loads(SNAPSHOT_FILE.read_text(encoding="utf-8"))
+    except Exception as e:
+        logger.warning(f"Snapshot de seguidores ilegible, se reconstruye: {e}")
+    return None
+
+
+def _write_snapshot(cuentas: Dict[str, Dict], generado: float) -> None:
+    snapshot = {"generado": generado, "cuentas": cuentas}
+    write_text_atomic(SNAPSHOT_FILE, json.dumps(snapshot, ensure_ascii=False))
+
+
+def rebuild_snapshot() -> Dict[str, Dict]:
+    """
+    Recalcula el snapshot desde el histórico completo (solo métricas con cuenta).
+
+    Si la carga falla o no trae cuentas o métricas, devuelve el resultado sin
+    guardarlo: un snapshot vacío con fecha nueva ocultaría el total real
+    durante `SNAPSHOT_MAX_AGE` segundos.
+    """
+    try:
+        cuentas, metricas = load_data()
+    except Exception as e:
+        logger.error(f"Error cargando datos para el snapshot de seguidores: {e}")
+        return {}
+    if cuentas.empty or metricas.empty:
+        logger.warning("Snapshot de seguidores sin datos; no se guarda")
+        return {}
+    ids = cuentas["id_cuenta"].astype(str).str.strip().str.lower()
+    metricas = metricas[
+        metricas["id_cuenta"].astype(str).str.strip().str.lower().isin(ids)
+    ]
+    ultimos = latest_per_account(metricas)
+    if not ultimos:
+        logger.warning("Snapshot de seguidores sin datos; no se guarda")
+        return ultimos
+    with file_lock(SNAPSHOT_FILE):
+        _write_snapshot(ultimos, time.time())
+    logger.info(f"Snapshot de seguidores reconstruido ({len(ultimos)} cuentas)")
+    return ultimos
+
+
+def update_snapshot(nuevas: pd.DataFrame) -> None:
+    """
+    Incorpora filas recién guardadas al snapshot (una fila nueva solo
+    reemplaza a la de su cuenta si es igual o más reciente).
+
+    Si el snapshot aún no existe no se crea a medias: la próxima lectura lo
+    reconstruye desde el histórico.
+    """
+    try:
+        recientes = latest_per_account(nuevas)
+        if not recientes:
+            return
+        with file_lock(SNAPSHOT_FILE):
+            snapshot = _read_snapshot()
+            if snapshot is None:
+                return
+            cuentas = snapshot.get("cuentas", {})
+            for id_cuenta, registro in recientes.items():
+                actual = cuentas.get(id_cuenta)
+                if actual is None or registro["fecha"] >= actual["fecha"]:
+                    cuentas[id_cuenta] = registro
+            _write_snapshot(cuentas, snapshot.get("generado", time.time()))
+    except Exception as e:
+        logger.error(f"Error actualizando snapshot de seguidores: {e}")
+
+
+def drop_snapshot_accounts(ids: set) -> None:
+    """Quita cuentas eliminadas del snapshot."""
+    try:
+        with file_lock(SNAPSHOT_FILE):
+            snapshot = _read_snapshot()
+            if snapshot is None:
+                return
+            cuentas = {
+                k: v for k, v in snapshot.get("cuentas", {}).items() if k not in ids
+            }
+            _write_snapshot(cuentas, snapshot.get("generado", time.time()))
+    except Exception as e:
+        logger.error(f"Error actualizando snapshot de seguidores: {e}")
+
+
+def get_latest_snapshot() -> Dict[str, Dict]:
+    """
+    Último registro de seguidores de cada cuenta.
+
+    Se lee del snapshot local (O(cuentas)). Se reconstruye desde el histórico
+    si falta, está dañado o tiene más de `SNAPSHOT_MAX_AGE` segundos, lo que
+    acota la deriva por escrituras hechas desde otra instancia de la app. Si
+    esa reconstrucción no trae datos, se sigue usando el snapshot vencido.
+    """
+    snapshot = _read_snapshot()
+    if snapshot is None or time.time() - snapshot.get("generado", 0) > (
+        SNAPSHOT_MAX_AGE
+    ):
+        # Si la reconstrucción no trae datos se conserva el snapshot vencido
+        return rebuild_snapshot() or (snapshot or {}).get("cuentas", {})
+    return snapshot.get("cuentas", {})
+
+
+def get_total_seguidores() -> int:
+    """Seguidores actuales de la red: suma del último registro de cada cuenta."""
+    return sum(r["seguidores"] for r in get_latest_snapshot().values())
+
+
 # ===========================
 # FUNCIONES DE UTILIDAD (IDS)
 # ===========================
@@ -324,12 +581,13 @@ def get_id(
     )
 
     try:
-        if CUENTAS_CSV.exists():
-            current_csv = pd.read_csv(CUENTAS_CSV)
-            updated = pd.concat([current_csv, nueva_cuenta], ignore_index=True)
-            updated.to_csv(CUENTAS_CSV, index=False, encoding="utf-8-sig")
-        else:
-            nueva_cuenta.to_csv(CUENTAS_CSV, index=False, encoding="utf-8-sig")
+        with file_lock(CUENTAS_CSV):
+            if CUENTAS_CSV.exists():
+                current_csv = pd.read_csv(CUENTAS_CSV)
+                updated = pd.concat([current_csv, nueva_cuenta], ignore_index=True)
+            else:
+                updated = nueva_cuenta
+            write_csv_atomic(updated, CUENTAS_CSV, index=False, encoding="utf-8-sig")
     except Exception as e:
         logger.error(f"Error guardando nuevo ID localmente: {e}")
 
@@ -376,20 +634,7 @@ def save_comment(entidad: str, mes: str, comentario: str) -> bool:
 
 def load_comments() -> pd.DataFrame:
     """Carga comentarios desde Sheets."""
-    try:
-        spreadsheet = conectar_sheets()
-        if spreadsheet is None:
-            return pd.DataFrame(columns=COLS_COMENTARIOS)
-        try:
-            sheet_coment = spreadsheet.worksheet("comentarios")
-            data = sheet_coment.get_all_records(expected_headers=[])
-            return (
-                pd.DataFrame(data) if data else pd.DataFrame(columns=COLS_COMENTARIOS)
-            )
-        except:
-            return pd.DataFrame(columns=COLS_COMENTARIOS)
-    except:
-        return pd.DataFrame(columns=COLS_COMENTARIOS)
+    return _load_sheet_frame("comentarios", COLS_COMENTARIOS, DTYPES_COMENTARIOS)
 
 
 # ===========================
@@ -400,24 +645,11 @@ def load_comments() -> pd.DataFrame:
 @st.cache_data(ttl=600)
 def load_configs() -> pd.DataFrame:
     """Carga configuraciones (metas)."""
-    try:
-        spreadsheet = conectar_sheets()
-        if spreadsheet is None:
-            return pd.DataFrame(columns=COLS_CONFIG)
-        try:
-            sheet = spreadsheet.worksheet("config")
-            data = sheet.get_all_records(expected_headers=[])
-            df = pd.DataFrame(data) if data else pd.DataFrame(columns=COLS_CONFIG)
-            if not df.empty:
-                df.columns = df.columns.str.strip().str.lower()
-                for col in ["meta_seguidores", "meta_engagement"]:
-                    if col in df.columns:
-                        df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0)
-            return df
-        except:
-            return pd.DataFrame(columns=COLS_CONFIG)
-    except:
-        return pd.DataFrame(columns=COLS_CONFIG)
+    df = _load_sheet_frame("config", COLS_CONFIG, DTYPES_CONFIG)
+    for col in ["meta_seguidores", "meta_engagement"]:
+        if col in df.columns:
+            df[col] = df[col].fillna(0)
+    return df
 
 
 def save_config(entidad: str, meta_seguidores: int, meta_engagement: float) -> bool:
@@ -447,13 +679,117 @@ def save_config(entidad: str, meta_seguidores: int, meta_engagement: float) -> b
         return False
 
 
+# ===========================
+# SUBIDA POR BLOQUES (CHUNKED)
+# ===========================
+
+
+def _upload_key(titulo: str, rows: List[List[str]]) -> str:
+    """Huella estable de una subida: misma hoja + mismas filas = misma clave."""
+    h = hashlib.sha256(str(titulo).encode("utf-8"))
+    h.update(json.dumps(rows, ensure_ascii=False).encode("utf-8"))
+    return h.hexdigest()
+
+
+def _read_checkpoints() -> Dict[str, Dict]:
+    """
+    Checkpoints de subidas pendientes ({clave: {"enviadas", "ts"}}).
+
+    Los de más de `UPLOAD_CHECKPOINT_TTL` segundos (subidas fallidas que
+    nunca se reintentaron) se descartan.
+    """
+    try:
+        if UPLOAD_CHECKPOINTS_FILE.exists():
+            with file_lock(UPLOAD_CHECKPOINTS_FILE, shared=True):
+                datos = json.loads(UPLOAD_CHECKPOINTS_FILE.read_text(encoding="utf-8"))
+            limite = time.time() - UPLOAD_CHECKPOINT_TTL
+            return {
+                k: v
+                for k, v in datos.items()
+                if isinstance(v, dict) and v.get("ts", 0) >= limite
+            }
+    except Exception as e:
+        logger.warning(f"Checkpoints de subida ilegibles, se ignoran: {e}")
+    return {}
+
+
+def _write_checkpoint(key: str, enviadas: Optional[int]) -> None:
+    """Registra las filas enviadas de una subida (None la da por terminada)."""
+    # Leer-modificar-escribir bajo el bloqueo: dos subidas a la vez no deben
+    # pisarse las entradas
+    with file_lock(UPLOAD_CHECKPOINTS_FILE):
+        checkpoints = _read_checkpoints()
+        if enviadas is None:
+            checkpoints.pop(key, None)
+        else:
+            checkpoints[key] = {"enviadas": enviadas, "ts": time.time()}
+        write_text_atomic(UPLOAD_CHECKPOINTS_FILE, json.dumps(checkpoints))
+
+
+def append_rows_chunked(
+    worksheet,
+    rows: List[List[str]],
+    chunk_size: int = UPLOAD_CHUNK_SIZE,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+) -> int:
+    """
+    Agrega filas a una hoja en bloques de `chunk_size` con checkpoints.
+
+    Tras cada bloque confirmado se guarda cuántas filas van enviadas. Si la
+    subida falla a mitad, volver a llamar con las mismas filas retoma desde el
+    último bloque confirmado en lugar de duplicar lo ya subido.
+
+    Args:
+        worksheet: Hoja de gspread destino.
+        rows: Filas a agregar (lista de listas de strings).
+        chunk_size: Máximo de filas por llamada a `append_rows`.
+        progress_callback: Función opcional `(enviadas, total)` para reportar avance.
+
+    Returns:
+        Número de filas enviadas en esta llamada.
+    """
+    total = len(rows)
+    if total == 0:
+        return 0
+    chunk_size = max(1, int(chunk_size))
+
+    key = _upload_key(worksheet.title, rows)
+    inicio = min(_read_checkpoints().get(key, {}).get("enviadas", 0), total)
+    if inicio:
+        logger.info(
+            f"Reanudando subida a '{worksheet.title}' desde la fila {inicio}/{total}"
+        )
+    if progress_callback:
+        progress_callback(inicio, total)
+
+    for desde in range(inicio, total, chunk_size):
+        hasta = min(desde + chunk_size, total)
+        worksheet.append_rows(rows[desde:hasta])
+        _write_checkpoint(key, hasta)
+        if progress_callback:
+            progress_callback(hasta, total)
+
+    _write_checkpoint(key, None)
+    return total - inicio
+
+
 # ===========================
 # FUNCIONES DE GUARDADO (CORE)
 # ===========================
 
 
-def guardar_datos(nuevo_df: pd.DataFrame, modo: str = "completo") -> Optional[bool]:
-    """Guarda datos principales en Sheets y CSV local."""
+def guardar_datos(
+    nuevo_df: pd.DataFrame,
+    modo: str = "completo",
+    chunk_size: int = UPLOAD_CHUNK_SIZE,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+) -> Optional[bool]:
+    """
+    Guarda datos principales en Sheets y CSV local.
+
+    Las métricas se suben por bloques de `chunk_size` filas (ver
+    `append_rows_chunked`); `progress_callback(enviadas, total)` recibe el avance.
+    """
     # Validación básica
     required = set(
         [
@@ -526,7 +862,13 @@ def guardar_datos(nuevo_df: pd.DataFrame, modo: str = "completo") -> Optional[bo
             try:
                 sheet_m = spreadsheet.worksheet("metricas")
                 metricas_a_subir = df[cols_m].copy()
-                sheet_m.append_rows(metricas_a_subir.astype(str).values.tolist())
+                append_rows_chunked(
+                    sheet_m,
+                    metricas_a_subir.astype(str).values.tolist(),
+                    chunk_size=chunk_size,
+                    progress_callback=progress_callback,
+                )
+                update_snapshot(nuevo_df)
             except Exception as e:
                 logger.error(f"Error actualizando hoja 'metricas': {e}")
                 try:
@@ -546,7 +888,10 @@ def guardar_datos(nuevo_df: pd.DataFrame, modo: str = "completo") -> Optional[bo
         return False
 
 
-def save_batch(datos: List[Dict]) -> None:
+def save_batch(
+    datos: List[Dict],
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+) -> None:
     """Wrapper para guardar lotes de datos simulados."""
     st.cache_data.clear()
     cuentas, df_m = load_data()
@@ -569,12 +914,22 @@ def save_batch(datos: List[Dict]) -> None:
     if "entidad" not in new.columns:
         new = pd.merge(new, cuentas, on="id_cuenta", how="left")
 
-    # Concatenar y guardar localmente
+    # Concatenar y guardar localmente. Bajo el bloqueo se vuelve a leer el CSV
+    # para incluir filas que otra sesión haya escrito después de load_data().
     try:
-        full_df = pd.concat([df_m, new]).drop_duplicates(
-            subset=["id_cuenta", "fecha"], keep="last"
-        )
-        full_df.to_csv(METRICAS_CSV, index=False)
+        with file_lock(METRICAS_CSV):
+            partes = [df_m]
+            if METRICAS_CSV.exists():
+                actual = pd.read_csv(METRICAS_CSV)
+                if not actual.empty:
+                    actual["id_cuenta"] = actual["id_cuenta"].astype(str)
+                    actual["fecha"] = pd.to_datetime(actual["fecha"], errors="coerce")
+                    partes.append(actual)
+            full_df = pd.concat(partes + [new]).drop_duplicates(
+                subset=["id_cuenta", "fecha"], keep="last"
+            )
+            write_csv_atomic(full_df, METRICAS_CSV, index=False)
+        update_snapshot(new)
     except Exception as e:
         logger.error(f"Error escribiendo METRICAS_CSV: {e}")
         try:
@@ -586,13 +941,13 @@ def save_batch(datos: List[Dict]) -> None:
     cols_c = ["id_cuenta", "entidad", "plataforma", "usuario_red"]
     new_cuentas = new[cols_c].drop_duplicates()
     try:
-        if CUENTAS_CSV.exists():
-            curr_c = pd.read_csv(CUENTAS_CSV)
-            pd.concat([curr_c, new_cuentas]).drop_duplicates(
-                subset=["id_cuenta"]
-            ).to_csv(CUENTAS_CSV, index=False)
-        else:
-            new_cuentas.to_csv(CUENTAS_CSV, index=False)
+        with file_lock(CUENTAS_CSV):
+            if CUENTAS_CSV.exists():
+                curr_c = pd.read_csv(CUENTAS_CSV)
+                new_cuentas = pd.concat([curr_c, new_cuentas]).drop_duplicates(
+                    subset=["id_cuenta"]
+                )
+            write_csv_atomic(new_cuentas, CUENTAS_CSV, index=False)
     except Exception as e:
         logger.error(f"Error escribiendo CUENTAS_CSV: {e}")
         try:
@@ -602,7 +957,10 @@ def save_batch(datos: List[Dict]) -> None:
 
     # Sincronizar Sheets (proteger de fallos)
     try:
-        res = guardar_datos(new)
+        if progress_callback:
+            res = guardar_datos(new, progress_callback=progress_callback)
+        else:
+            res = guardar_datos(new)
         # If guardar_datos returns False or None, surface a warning
         if res is False or res is None:
             try:
@@ -649,22 +1007,23 @@ def registrar_nuevas_cuentas(entidad: str, redes: Dict[str, str]) -> bool:
         df_new = pd.DataFrame(rows)
 
         # 2. Guardar en CSV Local (Respaldo)
-        if CUENTAS_CSV.exists():
-            curr_c = pd.read_csv(CUENTAS_CSV)
-            # Evitar duplicados exactos
-            final_df = pd.concat([curr_c, df_new]).drop_duplicates(
-                subset=["entidad", "plataforma"], keep="last"
-            )
-            final_df.to_csv(CUENTAS_CSV, index=False, encoding="utf-8-sig")
-        else:
-            df_new.to_csv(CUENTAS_CSV, index=False, encoding="utf-8-sig")
+        with file_lock(CUENTAS_CSV):
+            if CUENTAS_CSV.exists():
+                curr_c = pd.read_csv(CUENTAS_CSV)
+                # Evitar duplicados exactos
+                final_df = pd.concat([curr_c, df_new]).drop_duplicates(
+                    subset=["entidad", "plataforma"], keep="last"
+                )
+            else:
+                final_df = df_new
+            write_csv_atomic(final_df, CUENTAS_CSV, index=False, encoding="utf-8-sig")
 
         # 3. Guardar en Google Sheets
         spreadsheet = conectar_sheets()
         if spreadsheet:
             try:
                 sheet_c = spreadsheet.worksheet("cuentas")
-            except gspread.exceptions.WorksheetNotFound:
+            except get_backend("sheets").WorksheetNotFound:
                 sheet_c = spreadsheet.add_worksheet(title="cuentas", rows=100, cols=4)
                 sheet_c.append_row(COLS_CUENTAS)
 
@@ -689,6 +1048,161 @@ def registrar_nuevas_cuentas(entidad: str, redes: Dict[str, str]) -> bool:
         return False
 
 
+# ===========================
+# FUNCIONES DE ELIMINACIÓN
+# ===========================
+
+
+def _sheet_header(worksheet) -> List[str]:
+    """Lee solo la fila de encabezados de una hoja, normalizada."""
+    return [str(h).strip().lower() for h in worksheet.row_values(1)]
+
+
+def _find_rows(
+    worksheet, columna: str, valores: set, header: Optional[List[str]] = None
+) -> List[int]:
+    """
+    Devuelve los índices (base 0, el header es la fila 0) de las filas cuyo
+    valor en `columna` pertenece a `valores`.
+
+    Solo descarga el header y la columna necesaria, no la hoja completa.
+    """
+    if header is None:
+        header = _sheet_header(worksheet)
+    if columna not in header:
+        return []
+    celdas = worksheet.col_values(header.index(columna) + 1)
+    return [
+        i
+        for i, valor in enumerate(celdas)
+        if i > 0 and str(valor).strip().lower() in valores
+    ]
+
+
+def _delete_rows_requests(sheet_id: int, filas: List[int]) -> List[Dict]:
+    """
+    Construye peticiones `deleteDimension` agrupando filas contiguas.
+
+    Se emiten de abajo hacia arriba para que los índices sigan siendo válidos
+    mientras Sheets aplica las peticiones del lote en orden.
+    """
+    rangos: List[List[int]] = []
+    for fila in sorted(set(filas)):
+        if rangos and rangos[-1][1] == fila:
+            rangos[-1][1] = fila + 1
+        else:
+            rangos.append([fila, fila + 1])
+
+    return [
+        {
+            "deleteDimension": {
+                "range": {
+                    "sheetId": sheet_id,
+                    "dimension": "ROWS",
+                    "startIndex": inicio,
+                    "endIndex": fin,
+                }
+            }
+        }
+        for inicio, fin in reversed(rangos)
+    ]
+
+
+def delete_institution(entidad: str) -> bool:
+    """
+    Elimina una institución con todas sus cuentas, métricas, metas y comentarios.
+
+    En Sheets localiza las filas afectadas leyendo solo las columnas clave y las
+    borra con un único `batch_update` de peticiones `deleteDimension`, en lugar
+    de vaciar y reescribir la hoja completa.
+
+    Args:
+        entidad: Nombre de la institución a eliminar.
+
+    Returns:
+        True si la eliminación se completó, False si hubo algún error.
+    """
+    entidad_norm = entidad.strip().lower()
+    try:
+        # 1. CSV local (Respaldo)
+        ids_locales = set()
+        with file_lock(CUENTAS_CSV):
+            if CUENTAS_CSV.exists():
+                cuentas_df = pd.read_csv(CUENTAS_CSV, dtype=str)
+                mask = cuentas_df["entidad"].astype(str).str.strip().str.lower() == (
+                    entidad_norm
+                )
+                ids_locales = set(
+                    cuentas_df.loc[mask, "id_cuenta"]
+                    .astype(str)
+                    .str.strip()
+                    .str.lower()
+                )
+                write_csv_atomic(
+                    cuentas_df[~mask], CUENTAS_CSV, index=False, encoding="utf-8-sig"
+                )
+        if ids_locales:
+            with file_lock(METRICAS_CSV):
+                if METRICAS_CSV.exists():
+                    metricas_df = pd.read_csv(METRICAS_CSV)
+                    huerfanas = (
+                        metricas_df["id_cuenta"].astype(str).str.strip().str.lower()
+                    ).isin(ids_locales)
+                    write_csv_atomic(metricas_df[~huerfanas], METRICAS_CSV, index=False)
+            drop_snapshot_accounts(ids_locales)
+
+        # 2. Google Sheets (un solo batch_update con cascada)
+        spreadsheet = conectar_sheets()
+        if not spreadsheet:
+            logger.warning(
+                "No se pudo conectar a Google Sheets. Eliminación aplicada solo localmente."
+            )
+            st.cache_data.clear()
+            return True
+
+        sheet_cuentas = spreadsheet.worksheet("cuentas")
+        header = _sheet_header(sheet_cuentas)
+        filas_cuentas = _find_rows(sheet_cuentas, "entidad", {entidad_norm}, header)
+        ids_cuenta = set(ids_locales)
+        if filas_cuentas and "id_cuenta" in header:
+            col_ids = sheet_cuentas.col_values(header.index("id_cuenta") + 1)
+            ids_cuenta.update(
+                str(col_ids[i]).strip().lower()
+                for i in filas_cuentas
+                if i < len(col_ids)
+            )
+
+        requests = _delete_rows_requests(sheet_cuentas.id, filas_cuentas)
+        resumen = {"cuentas": len(filas_cuentas)}
+
+        for hoja, columna, valores in [
+            ("metricas", "id_cuenta", ids_cuenta),
+            ("config", "entidad", {entidad_norm}),
+            ("comentarios", "entidad", {entidad_norm}),
+        ]:
+            if not valores:
+                continue
+            try:
+                ws = spreadsheet.worksheet(hoja)
+            except get_backend("sheets").WorksheetNotFound:
+                continue
+            filas = _find_rows(ws, columna, valores)
+            resumen[hoja] = len(filas)
+            requests.extend(_delete_rows_requests(ws.id, filas))
+
+        if requests:
+            spreadsheet.batch_update({"requests": requests})
+        drop_snapshot_accounts(ids_cuenta)
+
+        st.cache_data.clear()
+        logger.info(f"Institución {entidad} eliminada: {resumen}")
+        return True
+
+    except Exception as e:
+        logger.error(f"Error eliminando institución {entidad}: {e}")
+        return False
+
+
 # ===========================
 # UTILIDADES
 # ===========================
@@ -696,10 +1210,10 @@ def registrar_nuevas_cuentas(entidad: str, redes: Dict[str, str]) -> bool:
 
 def reset_db() -> None:
     """Limpia todo."""
-    if CUENTAS_CSV.exists():
-        os.remove(CUENTAS_CSV)
-    if METRICAS_CSV.exists():
-        os.remove(METRICAS_CSV)
+    for ruta in (CUENTAS_CSV, METRICAS_CSV, SNAPSHOT_FILE):
+        with file_lock(ruta):
+            if ruta.exists():
+                os.remove(ruta)
     init_files()
     try:
         ss = conectar_sheets()
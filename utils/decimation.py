@@ -0,0 +1,174 @@
+"""
+Decimación de series de tiempo para gráficas de Plotly.
+
+Una gráfica de líneas no puede mostrar más de un punto distinto por píxel
+horizontal: varios años de datos diarios de muchas cuentas solo inflan el
+JSON de la figura y ralentizan el navegador. Antes de construir la figura,
+cada traza se reduce a un número de puntos proporcional al ancho en píxeles.
+Streamlit no informa al servidor el ancho real del contenedor, así que por
+defecto se usa un presupuesto fijo (`WIDTH_BUDGET_PX`); quien conozca el
+ancho puede pasar `max_points=points_for_width(ancho)`.
+
+- "lttb" (Largest-Triangle-Three-Buckets): conserva la forma visual; además
+  se fuerzan el mínimo y el máximo de la serie para que los picos no se
+  pierdan.
+- "minmax": mínimo y máximo de cada bucket; conserva todos los picos locales.
+
+Uso:
+    from utils.decimation import decimate_frame
+
+    df_plot = decimate_frame(df, x="fecha", y="seguidores", group="plataforma")
+    fig = px.line(df_plot, x="fecha", y="seguidores", color="plataforma")
+"""
+
+from typing import List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+# Presupuesto fijo de ancho: una gráfica a pantalla completa con layout="wide"
+WIDTH_BUDGET_PX = 1200
+POINTS_PER_PX = 1.0
+MIN_POINTS = 3
+
+
+def points_for_width(
+    width_px: int = WIDTH_BUDGET_PX, points_per_px: float = POINTS_PER_PX
+) -> int:
+    """Puntos por traza que aprovecha una gráfica de `width_px` píxeles."""
+    return max(MIN_POINTS, int(width_px * points_per_px))
+
+
+def _as_float(valores) -> np.ndarray:
+    """Valores numéricos o fechas como float (fechas en nanosegundos)."""
+    serie = pd.Series(valores)
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        return serie.astype("int64").to_numpy(dtype=float)
+    return pd.to_numeric(serie, errors="coerce").to_numpy(dtype=float)
+
+
+def _x_values(valores) -> np.ndarray:
+    """Eje X como float; categorías (p. ej. 'YYYY-MM') por su posición."""
+    serie = pd.Series(valores)
+    if pd.api.types.is_datetime64_any_dtype(serie) or pd.api.types.is_numeric_dtype(
+        serie
+    ):
+        return _as_float(serie)
+    return np.arange(len(serie), dtype=float)
+
+
+def lttb_indices(x, y, n_out: int) -> np.ndarray:
+    """
+    Posiciones que elige LTTB para reducir (x, y) a `n_out` puntos.
+
+    `x` debe estar ordenado (fechas, números o categorías en orden). Siempre
+    incluye el primer y el último punto.
+    """
+    n = len(y)
+    if n_out >= n or n_out < MIN_POINTS:
+        return np.arange(n)
+    xs, ys = _x_values(x), np.nan_to_num(_as_float(y))
+
+    # Buckets interiores de tamaño (n - 2) / (n_out - 2)
+    bordes = np.linspace(1, n - 1, n_out - 1).astype(int)
+    elegidos = np.empty(n_out, dtype=int)
+    elegidos[0], elegidos[-1] = 0, n - 1
+    anterior = 0
+    for i in range(n_out - 2):
+        inicio, fin = bordes[i], bordes[i + 1]
+        # Promedio del bucket siguiente (o el último punto)
+        sig_inicio, sig_fin = fin, bordes[i + 2] if i + 2 < len(bordes) else n
+        prom_x = xs[sig_inicio:sig_fin].mean()
+        prom_y = ys[sig_inicio:sig_fin].mean()
+        # Área del triángulo (anterior, candidato, promedio siguiente)
+        areas = np.abs(
+            (xs[anterior] - prom_x) * (ys[inicio:fin] - ys[anterior])
+            - (xs[anterior] - xs[inicio:fin]) * (prom_y - ys[anterior])
+        )
+        anterior = inicio + int(np.argmax(areas))
+        elegidos[i + 1] = anterior
+    return elegidos
+
+
+def minmax_indices(y, n_out: int) -> np.ndarray:
+    """Posiciones del mínimo y el máximo de cada uno de `n_out // 2` buckets."""
+    n = len(y)
+    if n_out >= n or n_out < MIN_POINTS:
+        return np.arange(n)
+    ys = _as_float(y)
+    ys_min = np.where(np.isnan(ys), np.inf, ys)
+    ys_max = np.where(np.isnan(ys), -np.inf, ys)
+    bordes = np.linspace(0, n, max(1, n_out // 2) + 1).astype(int)
+    elegidos = [0, n - 1]
+    for inicio, fin in zip(bordes[:-1], bordes[1:]):
+        if fin > inicio:
+            elegidos.append(inicio + int(np.argmin(ys_min[inicio:fin])))
+            elegidos.append(inicio + int(np.argmax(ys_max[inicio:fin])))
+    return np.unique(elegidos)
+
+
+def decimate_indices(x, y, n_out: int, method: str = "lttb") -> np.ndarray:
+    """Posiciones a conservar de una traza, con sus extremos garantizados."""
+    if method == "minmax":
+        return minmax_indices(y, n_out)
+    if method != "lttb":
+        raise ValueError(f"Método de decimación desconocido: {method}")
+    elegidos = lttb_indices(x, y, n_out)
+    if len(elegidos) == len(y):
+        return elegidos
+    ys = _as_float(y)
+    if np.isnan(ys).all():
+        return elegidos
+    picos = [int(np.nanargmin(ys)), int(np.nanargmax(ys))]
+    return np.unique(np.concatenate([elegidos, picos]))
+
+
+def decimate_frame(
+    df: pd.DataFrame,
+    x: str,
+    y: Union[str, Sequence[str]],
+    group: Optional[str] = None,
+    max_points: Optional[int] = None,
+    method: str = "lttb",
+) -> pd.DataFrame:
+    """
+    Filas de `df` que bastan para dibujar cada una de sus trazas.
+
+    Args:
+        df: Datos en formato largo (una fila por punto).
+        x: Columna del eje X (fechas, números o categorías ordenables).
+        y: Columna o columnas graficadas; con varias se conserva la unión de
+           los puntos que necesita cada una.
+        group: Columna que separa las trazas (p. ej. 'plataforma').
+        max_points: Puntos por traza; por defecto `points_for_width()`
+           (presupuesto fijo de `WIDTH_BUDGET_PX`).
+        method: "lttb" o "minmax".
+
+    Returns:
+        `df` sin cambios si ninguna traza supera `max_points`; si no, el
+        subconjunto de filas elegido, ordenado por `x` dentro de cada traza
+        (mismas columnas e índice original).
+    """
+    columnas_y = [y] if isinstance(y, str) else list(y)
+    max_points = max_points or points_for_width()
+    grupos = df.groupby(group, sort=False, dropna=False) if group else [(None, df)]
+
+    if all(len(parte) <= max_points for _, parte in grupos):
+        return df
+
+    partes: List[pd.DataFrame] = []
+    for _, parte in grupos:
+        parte = parte.sort_values(x, kind="stable")
+        if len(parte) <= max_points:
+            partes.append(parte)
+            continue
+        elegidos = np.unique(
+            np.concatenate(
+                [
+                    decimate_indices(parte[x], parte[col], max_points, method)
+                    for col in columnas_y
+                ]
+            )
+        )
+        partes.append(parte.iloc[elegidos])
+    return pd.concat(partes)
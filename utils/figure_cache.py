@@ -0,0 +1,102 @@
+"""
+Caché de figuras de Plotly entre reruns de Streamlit.
+
+Cada rerun del Tablero o de Comparativas volvía a construir las mismas
+figuras (agrupaciones de plotly.express, validación de trazas) aunque el
+usuario solo hubiera tocado un widget ajeno a la gráfica. Las figuras se
+guardan en una caché LRU en memoria, compartida por las sesiones del proceso,
+con clave = (versión de los datos, tipo de gráfica, filtros):
+
+- La versión es una huella del contenido de los DataFrames de entrada, así
+  que cualquier escritura (desde esta instancia o desde otra) produce figuras
+  nuevas sin necesidad de invalidar a mano.
+- El tamaño de cada figura se mide por su JSON; la caché se limita por número
+  de figuras y por memoria total, y desaloja la menos usada.
+- Los aciertos y fallos se registran en el log de la app.
+
+Las figuras cacheadas se comparten: quien las recibe no debe modificarlas.
+
+Uso:
+    from utils.figure_cache import cached_figure, data_version
+
+    version = data_version(df)
+    fig = cached_figure("linea", version, lambda: px.line(df, ...), entidad=entidad)
+    st.plotly_chart(fig)
+"""
+
+import hashlib
+from typing import Callable
+
+import pandas as pd
+import plotly.io as pio
+
+from utils.chart_render import SizedLRUCache
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+FIGURE_CACHE_MAX_BYTES = 32 * 1024 * 1024  # 32 MB de JSON de figuras
+FIGURE_CACHE_MAX_ITEMS = 128
+FIGURE_CACHE_LOG_EVERY = 50  # Resumen de aciertos en INFO cada N consultas
+
+
+def _figure_size(fig) -> int:
+    """Bytes del JSON de la figura (lo que Streamlit envía al navegador)."""
+    return len(pio.to_json(fig, validate=False, pretty=False))
+
+
+figure_cache = SizedLRUCache(
+    "figuras",
+    max_bytes=FIGURE_CACHE_MAX_BYTES,
+    max_items=FIGURE_CACHE_MAX_ITEMS,
+    sizeof=_figure_size,
+)
+
+
+def data_version(*frames: pd.DataFrame) -> str:
+    """Huella del contenido (columnas y valores) de uno o más DataFrames."""
+    h = hashlib.sha1()
+    for df in frames:
+        h.update(repr(list(df.columns)).encode("utf-8"))
+        h.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def _log_stats() -> None:
+    stats = figure_cache.stats()
+    consultas = stats["hits"] + stats["misses"]
+    mensaje = (
+        f"Caché de figuras: {stats['hits']} aciertos / {stats['misses']} fallos "
+        f"({stats['hit_rate']:.0%}), {stats['items']} figuras, "
+        f"{stats['bytes'] / 1e6:.1f} MB, {stats['evictions']} desalojos"
+    )
+    if consultas % FIGURE_CACHE_LOG_EVERY == 0:
+        logger.info(mensaje)
+    else:
+        logger.debug(mensaje)
+
+
+def cached_figure(kind: str, version: str, build: Callable[[], object], **filtros):
+    """
+    Figura de tipo `kind` para los datos `version` y los `filtros` dados.
+
+    `build` solo se llama si la figura no está en caché. Si devuelve None (no
+    hay datos para graficar), no se guarda nada.
+    """
+    key = (version, kind, tuple(sorted(filtros.items())))
+    fig = figure_cache.get(key)
+    if fig is None:
+        fig = build()
+        if fig is not None:
+            figure_cache.put(key, fig)
+    _log_stats()
+    return fig
+
+
+def figure_cache_stats() -> dict:
+    """Aciertos, fallos, tasa de acierto, figuras y bytes de la caché."""
+    return figure_cache.stats()
+
+
+def clear_figure_cache() -> None:
+    figure_cache.clear()
@@ -0,0 +1,186 @@
+"""
+Escritura atómica y bloqueo de archivos locales para CHAMPILYTICS.
+
+Varias sesiones de Streamlit (hilos del mismo proceso o procesos distintos)
+pueden leer y reescribir los CSV de respaldo al mismo tiempo. Este módulo
+serializa a los escritores con un bloqueo exclusivo sobre un archivo `.lock`
+vecino, permite lectores concurrentes con un bloqueo compartido y reemplaza
+los archivos de forma atómica (temporal + fsync + rename) para que ningún
+lector vea un CSV a medio escribir.
+
+Uso:
+    from utils.file_lock import file_lock, read_csv_locked, write_csv_atomic
+
+    with file_lock(METRICAS_CSV):
+        df = read_csv_locked(METRICAS_CSV)
+        df = pd.concat([df, nuevas])
+        write_csv_atomic(df, METRICAS_CSV, index=False)
+"""
+
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Union
+
+import pandas as pd
+
+if os.name == "nt":  # pragma: no cover - solo Windows
+    import msvcrt
+else:
+    import fcntl
+
+PathLike = Union[str, Path]
+
+# Bloqueos retenidos por el hilo actual: {ruta_lock: [modo, contador]}
+_held = threading.local()
+
+
+def _held_locks() -> Dict[str, List]:
+    if not hasattr(_held, "locks"):
+        _held.locks = {}
+    return _held.locks
+
+
+def _lock_path(path: PathLike) -> Path:
+    """Archivo de bloqueo vecino (el CSV se reemplaza, así que no se bloquea él)."""
+    path = Path(path)
+    return path.with_name(path.name + ".lock")
+
+
+def _acquire(fd: int, shared: bool) -> None:
+    if os.name == "nt":  # pragma: no cover - solo Windows
+        # msvcrt no tiene bloqueo compartido: los lectores también serializan
+        while True:
+            try:
+                msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                continue
+    fcntl.flock(fd, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+
+
+def _release(fd: int) -> None:
+    if os.name == "nt":  # pragma: no cover - solo Windows
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        return
+    fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+@contextmanager
+def file_lock(path: PathLike, shared: bool = False) -> Iterator[None]:
+    """
+    Bloquea `path` mientras dura el bloque `with`.
+
+    Es reentrante por hilo: si el hilo ya tiene el bloqueo (por ejemplo,
+    `save_batch` escribiendo y llamando a `load_data`), se reutiliza en lugar de
+    auto-bloquearse.
+
+    Args:
+        path: Archivo a proteger.
+        shared: True para bloqueo de lectura (varios lectores a la vez).
+    """
+    lock_file = _lock_path(path)
+    key = str(lock_file.resolve())
+    held = _held_locks()
+
+    if key in held:
+        modo, _ = held[key]
+        if modo == "shared" and not shared:
+            raise RuntimeError(
+                f"No se puede promover un bloqueo compartido a exclusivo: {path}"
+            )
+        held[key][1] += 1
+        try:
+            yield
+        finally:
+            held[key][1] -= 1
+        return
+
+    lock_file.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(str(lock_file), os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        _acquire(fd, shared)
+        held[key] = ["shared" if shared else "exclusive", 1]
+        try:
+            yield
+        finally:
+            del held[key]
+            _release(fd)
+    finally:
+        os.close(fd)
+
+
+def read_csv_locked(path: PathLike, **kwargs) -> pd.DataFrame:
+    """Lee un CSV bajo bloqueo compartido (`kwargs` van a `pd.read_csv`)."""
+    with file_lock(path, shared=True):
+        return pd.read_csv(path, **kwargs)
+
+
+def _replace_atomic(path: Path, write, encoding: Optional[str] = "utf-8") -> None:
+    """
+    Escribe en un temporal del mismo directorio, hace fsync y lo renombra.
+
+    Con `encoding=None` el temporal se abre en modo binario.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(
+        dir=str(path.parent), prefix=f".{path.name}.", suffix=".tmp"
+    )
+    try:
+        if encoding is None:
+            f = os.fdopen(fd, "wb")
+        else:
+            f = os.fdopen(fd, "w", encoding=encoding, newline="")
+        with f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.remove(tmp_name)
+        raise
+
+    if os.name != "nt":
+        # Persistir también la entrada del directorio tras el rename
+        dir_fd = os.open(str(path.parent), os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+def write_csv_atomic(df: pd.DataFrame, path: PathLike, **kwargs) -> None:
+    """
+    Reemplaza `path` con el contenido de `df` de forma atómica.
+
+    Toma el bloqueo exclusivo (reentrante si el llamador ya lo tiene), así que
+    para lectura-modificación-escritura hay que envolver todo el ciclo en
+    `file_lock(path)`. `kwargs` van a `DataFrame.to_csv`.
+    """
+    path = Path(path)
+    encoding = kwargs.pop("encoding", "utf-8")
+    with file_lock(path):
+        _replace_atomic(path, lambda f: df.to_csv(f, **kwargs), encoding=encoding)
+
+
+def write_text_atomic(path: PathLike, text: str) -> None:
+    """Reemplaza un archivo de texto de forma atómica y bajo bloqueo exclusivo."""
+    path = Path(path)
+    with file_lock(path):
+        _replace_atomic(path, lambda f: f.write(text))
+
+
+def write_atomic(path: PathLike, write, encoding: Optional[str] = "utf-8") -> None:
+    """
+    Reemplaza `path` de forma atómica con lo que `write(f)` escriba en `f`.
+
+    Útil para contenido que se genera por partes (no se arma en memoria).
+    `encoding=None` abre el archivo en modo binario.
+    """
+    path = Path(path)
+    with file_lock(path):
+        _replace_atomic(path, write, encoding=encoding)
@@ -5,25 +5,87 @@ Incluye funciones para manejo de imágenes, generación de reportes y simulació
 
 import pandas as pd
 import base64
+import functools
+import html
+import io
+import mimetypes
 import random
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from typing import IO, Iterator, List, Dict, Optional, Tuple, Union
 import logging
 
 # Configuración de directorio base
 BASE_DIR = Path(__file__).parent.parent
 IMAGES_DIR = BASE_DIR / "images"
 
+# Caché de imágenes codificadas (clave: ruta + fecha de modificación)
+ASSET_CACHE_SIZE = 32
+# Variante WebP para banners grandes (requiere Pillow, opcional)
+BANNER_MAX_WIDTH = 1920
+BANNER_WEBP_QUALITY = 80
+BANNER_WEBP_MIN_BYTES = 200 * 1024
+
 # ===========================
 # FUNCIONES DE IMÁGENES
 # ===========================
 
 
+def _asset_key(image_path: Path) -> Tuple[str, int]:
+    """Ruta absoluta y mtime: si el archivo cambia, cambia la clave de caché."""
+    image_path = Path(image_path).resolve()
+    return str(image_path), image_path.stat().st_mtime_ns
+
+
+@functools.lru_cache(maxsize=ASSET_CACHE_SIZE)
+def _encode_file(path: str, mtime_ns: int) -> str:
+    with open(path, "rb") as f:
+        return base64.b64encode(f.read()).decode()
+
+
+def _webp_variant(data: bytes, max_width: int, quality: int) -> Optional[bytes]:
+    """Reduce y recomprime la imagen a WebP; None si Pillow no está disponible."""
+    try:
+        from PIL import Image
+    except ImportError:
+        return None
+
+    with Image.open(io.BytesIO(data)) as img:
+        if img.mode not in ("RGB", "RGBA"):
+            img = img.convert("RGBA" if "transparency" in img.info else "RGB")
+        if img.width > max_width:
+            alto = round(img.height * max_width / img.width)
+            img = img.resize((max_width, alto), Image.LANCZOS)
+        buffer = io.BytesIO()
+        img.save(buffer, format="WEBP", quality=quality, method=4)
+    return buffer.getvalue()
+
+
+@functools.lru_cache(maxsize=ASSET_CACHE_SIZE)
+def _optimized_file(
+    path: str, mtime_ns: int, max_width: int, quality: int
+) -> Tuple[str, str]:
+    """(tipo MIME, base64) de la imagen, en WebP si resulta más liviana."""
+    with open(path, "rb") as f:
+        data = f.read()
+    mime = mimetypes.guess_type(path)[0] or "image/png"
+    if len(data) >= BANNER_WEBP_MIN_BYTES:
+        try:
+            webp = _webp_variant(data, max_width, quality)
+            if webp is not None and len(webp) < len(data):
+                data, mime = webp, "image/webp"
+        except Exception as e:
+            logging.warning(f"No se pudo optimizar la imagen {path}: {e}")
+    return mime, base64.b64encode(data).decode()
+
+
 def get_image_base64(image_path: Path) -> str:
     """
     Convierte una imagen a base64 para embeber en HTML/CSS.
 
+    El resultado se cachea por ruta y fecha de modificación, así que en cada
+    rerun solo se consulta `stat` del archivo.
+
     Args:
         image_path: Ruta al archivo de imagen
 
@@ -31,9 +93,7 @@ def get_image_base64(image_path: Path) -> str:
         String en formato base64
     """
     try:
-        with open(image_path, "rb") as f:
-            data = f.read()
-        return base64.b64encode(data).decode()
+        return _encode_file(*_asset_key(image_path))
     except Exception as e:
         logging.error(f"Error al codificar imagen {image_path}: {e}")
         return ""
@@ -57,22 +117,38 @@ def load_image(filename: str) -> Optional[str]:
         return None
 
 
-def get_banner_css(image_filename: str, height: str = "200px") -> str:
+def load_optimized_image(
+    filename: str,
+    max_width: int = BANNER_MAX_WIDTH,
+    quality: int = BANNER_WEBP_QUALITY,
+) -> Optional[Tuple[str, str]]:
     """
-    Genera CSS para un banner con imagen de fondo.
+    Carga una imagen de images/ lista para un data URI, reducida a `max_width`
+    y recomprimida en WebP cuando pesa más de `BANNER_WEBP_MIN_BYTES`.
 
-    Args:
-        image_filename: Nombre del archivo de imagen
-        height: Altura del banner (CSS)
+    Sin Pillow se devuelve la imagen original.
 
     Returns:
-        String con CSS para el banner
+        Tupla (tipo MIME, base64) o None si no existe
     """
-    img_b64 = load_image(image_filename)
-    if img_b64:
-        return f"""
+    image_path = IMAGES_DIR / filename
+    try:
+        return _optimized_file(*_asset_key(image_path), max_width, quality)
+    except FileNotFoundError:
+        logging.warning(f"Imagen no encontrada: {image_path}")
+    except Exception as e:
+        logging.error(f"Error al codificar imagen {image_path}: {e}")
+    return None
+
+
+@functools.lru_cache(maxsize=ASSET_CACHE_SIZE)
+def _banner_css(path: str, mtime_ns: int, height: str) -> str:
+    mime, img_b64 = _optimized_file(
+        path, mtime_ns, BANNER_MAX_WIDTH, BANNER_WEBP_QUALITY
+    )
+    return f"""
         <div style="
-            background-image: url(data:image/png;base64,{img_b64});
+            background-image: url(data:{mime};base64,{img_b64});
             background-size: cover;
             background-position: center;
             height: {height};
@@ -80,6 +156,29 @@ def get_banner_css(image_filename: str, height: str = "200px") -> str:
             margin-bottom: 20px;
         "></div>
         """
+
+
+def get_banner_css(image_filename: str, height: str = "200px") -> str:
+    """
+    Genera CSS para un banner con imagen de fondo.
+
+    Usa la variante optimizada de la imagen (ver `load_optimized_image`) y
+    cachea el CSS resultante por ruta y fecha de modificación.
+
+    Args:
+        image_filename: Nombre del archivo de imagen
+        height: Altura del banner (CSS)
+
+    Returns:
+        String con CSS para el banner
+    """
+    image_path = IMAGES_DIR / image_filename
+    try:
+        return _banner_css(*_asset_key(image_path), height)
+    except FileNotFoundError:
+        logging.warning(f"Imagen no encontrada: {image_path}")
+    except Exception as e:
+        logging.error(f"Error al codificar imagen {image_path}: {e}")
     return ""
 
 
@@ -202,124 +301,158 @@ def simular(
 # ===========================
 
 
-def generar_reporte_html(df: pd.DataFrame, titulo: str = "Reporte de Métricas") -> str:
-    """
-    Genera un reporte HTML descargable con análisis de métricas.
-
-    Args:
-        df: DataFrame con las métricas
-        titulo: Título del reporte
-
-    Returns:
-        String con HTML completo
-    """
-    if df.empty:
-        return "<html><body><h1>No hay datos para el reporte</h1></body></html>"
-
-    # Preparar estadísticas
-    total_cuentas = df["id_cuenta"].nunique() if "id_cuenta" in df.columns else 0
-    total_registros = len(df)
-
-    fecha_min = (
-        df["fecha"].min().strftime("%Y-%m-%d") if "fecha" in df.columns else "N/A"
-    )
-    fecha_max = (
-        df["fecha"].max().strftime("%Y-%m-%d") if "fecha" in df.columns else "N/A"
-    )
+HTML_BATCH_ROWS = 2000
 
-    # Estadísticas por métrica
-    stats_html = ""
-    metricas_numericas = [
-        "seguidores",
-        "alcance",
-        "interacciones",
-        "likes_promedio",
-        "engagement_rate",
-    ]
-
-    for metrica in metricas_numericas:
-        if metrica in df.columns:
-            promedio = df[metrica].mean()
-            maximo = df[metrica].max()
-            minimo = df[metrica].min()
-            stats_html += f"""
-            <tr>
-                <td><strong>{metrica.replace("_", " ").title()}</strong></td>
-                <td>{promedio:,.2f}</td>
-                <td>{maximo:,.2f}</td>
-                <td>{minimo:,.2f}</td>
-            </tr>
-            """
+METRICAS_NUMERICAS_HTML = [
+    "seguidores",
+    "alcance",
+    "interacciones",
+    "likes_promedio",
+    "engagement_rate",
+]
 
-    # Tabla de datos
-    tabla_datos = df.to_html(index=False, classes="table table-striped", border=0)
-
-    # HTML completo
-    html = f"""
-    <!DOCTYPE html>
-    <html lang="es">
-    <head>
-        <meta charset="UTF-8">
-        <title>{titulo}</title>
+_HTML_STYLE = """
         <style>
-            body {{
+            body {
                 font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
                 margin: 40px;
                 background-color: #f5f5f5;
-            }}
-            .header {{
+            }
+            .header {
                 background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
                 color: white;
                 padding: 30px;
                 border-radius: 10px;
                 margin-bottom: 30px;
-            }}
-            h1 {{
+            }
+            h1 {
                 margin: 0;
                 font-size: 28px;
-            }}
-            .stats {{
+            }
+            .stats {
                 background: white;
                 padding: 20px;
                 border-radius: 8px;
                 margin-bottom: 20px;
                 box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-            }}
-            table {{
+            }
+            table {
                 width: 100%;
                 border-collapse: collapse;
                 background: white;
                 border-radius: 8px;
                 overflow: hidden;
                 box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-            }}
-            th {{
+            }
+            th {
                 background-color: #667eea;
                 color: white;
                 padding: 12px;
                 text-align: left;
-            }}
-            td {{
+            }
+            td {
                 padding: 10px;
                 border-bottom: 1px solid #eee;
-            }}
-            tr:hover {{
+            }
+            tr:hover {
                 background-color: #f8f9fa;
-            }}
-            .footer {{
+            }
+            .footer {
                 margin-top: 30px;
                 text-align: center;
                 color: #666;
                 font-size: 12px;
-            }}
+            }
         </style>
-    </head>
+"""
+
+
+def _html_cells(serie: pd.Series) -> pd.Series:
+    """Texto escapado de una columna completa (NaN/NaT como celda vacía)."""
+    texto = serie.astype(str).where(serie.notna(), "")
+    return (
+        texto.str.replace("&", "&amp;", regex=False)
+        .str.replace("<", "&lt;", regex=False)
+        .str.replace(">", "&gt;", regex=False)
+    )
+
+
+def _html_rows(chunk: pd.DataFrame) -> str:
+    """Filas <tr> de un bloque del DataFrame, construidas por columna."""
+    filas = pd.Series("<tr>", index=chunk.index)
+    for col in chunk.columns:
+        filas = filas + "<td>" + _html_cells(chunk[col]) + "</td>"
+    return "\n".join(filas + "</tr>") + "\n"
+
+
+def iter_reporte_html(
+    df: pd.DataFrame,
+    titulo: str = "Reporte de Métricas",
+    batch_size: int = HTML_BATCH_ROWS,
+    start_row: int = 0,
+    max_rows: Optional[int] = None,
+) -> Iterator[str]:
+    """
+    Genera el reporte HTML por partes: encabezado, estadísticas y luego la
+    tabla de datos en bloques de `batch_size` filas.
+
+    La memoria usada depende de `batch_size`, no del tamaño de `df`.
+
+    Args:
+        df: DataFrame con las métricas
+        titulo: Título del reporte
+        batch_size: Filas por bloque de la tabla
+        start_row: Primera fila de la tabla (para paginar)
+        max_rows: Máximo de filas de la tabla (None = todas)
+
+    Yields:
+        Fragmentos de HTML que concatenados forman el documento completo
+    """
+    if df.empty:
+        yield "<html><body><h1>No hay datos para el reporte</h1></body></html>"
+        return
+
+    titulo = html.escape(titulo)
+    yield f"""
+    <!DOCTYPE html>
+    <html lang="es">
+    <head>
+        <meta charset="UTF-8">
+        <title>{titulo}</title>
+{_HTML_STYLE}    </head>
     <body>
         <div class="header">
             <h1>📊 {titulo}</h1>
             <p>Generado el {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}</p>
         </div>
-        
+"""
+
+    # Estadísticas (sobre el dataset completo, no solo la página)
+    total_cuentas = df["id_cuenta"].nunique() if "id_cuenta" in df.columns else 0
+    total_registros = len(df)
+    fecha_min = (
+        df["fecha"].min().strftime("%Y-%m-%d") if "fecha" in df.columns else "N/A"
+    )
+    fecha_max = (
+        df["fecha"].max().strftime("%Y-%m-%d") if "fecha" in df.columns else "N/A"
+    )
+
+    stats_html = ""
+    for metrica in METRICAS_NUMERICAS_HTML:
+        if metrica in df.columns:
+            promedio = df[metrica].mean()
+            maximo = df[metrica].max()
+            minimo = df[metrica].min()
+            stats_html += f"""
+            <tr>
+                <td><strong>{metrica.replace("_", " ").title()}</strong></td>
+                <td>{promedio:,.2f}</td>
+                <td>{maximo:,.2f}</td>
+                <td>{minimo:,.2f}</td>
+            </tr>
+            """
+
+    yield f"""
         <div class="stats">
             <h2>Resumen General</h2>
             <p><strong>Total de cuentas:</strong> {total_cuentas}</p>
@@ -341,11 +474,32 @@ def generar_reporte_html(df: pd.DataFrame, titulo: str = "Reporte de Métricas")
                 </tbody>
             </table>
         </div>
-        
+"""
+
+    # Tabla de datos, en bloques
+    fin = (
+        total_registros
+        if max_rows is None
+        else min(total_registros, start_row + max_rows)
+    )
+    inicio = min(max(start_row, 0), fin)
+    encabezados = "".join(f"<th>{html.escape(str(c))}</th>" for c in df.columns)
+    yield f"""
         <div class="stats">
             <h2>Datos Completos</h2>
-            {tabla_datos}
-        </div>
+            <table class="dataframe table table-striped">
+                <thead><tr>{encabezados}</tr></thead>
+                <tbody>
+"""
+    for desde in range(inicio, fin, max(1, batch_size)):
+        yield _html_rows(df.iloc[desde : min(desde + batch_size, fin)])
+    yield "                </tbody>\n            </table>\n"
+    if fin - inicio < total_registros:
+        yield (
+            f"            <p>Mostrando registros {inicio + 1:,}–{fin:,} "
+            f"de {total_registros:,}</p>\n"
+        )
+    yield """        </div>
         
         <div class="footer">
             <p>CHAMPILYTICS - Matriz de Redes Sociales Maristas</p>
@@ -354,4 +508,38 @@ def generar_reporte_html(df: pd.DataFrame, titulo: str = "Reporte de Métricas")
     </html>
     """
 
-    return html
+
+def write_reporte_html(
+    df: pd.DataFrame, destino: Union[str, Path, IO], **kwargs
+) -> None:
+    """
+    Escribe el reporte HTML por bloques en un archivo o ruta.
+
+    Acepta rutas, archivos de texto y archivos binarios (se codifica en
+    UTF-8). `kwargs` van a `iter_reporte_html`.
+    """
+    if isinstance(destino, (str, Path)):
+        with open(destino, "w", encoding="utf-8") as f:
+            write_reporte_html(df, f, **kwargs)
+        return
+
+    binario = isinstance(destino, (io.RawIOBase, io.BufferedIOBase))
+    for parte in iter_reporte_html(df, **kwargs):
+        destino.write(parte.encode("utf-8") if binario else parte)
+
+
+def generar_reporte_html(df: pd.DataFrame, titulo: str = "Reporte de Métricas") -> str:
+    """
+    Genera un reporte HTML descargable con análisis de métricas.
+
+    Para datasets grandes conviene `iter_reporte_html`/`write_reporte_html`,
+    que no construyen el documento completo en memoria.
+
+    Args:
+        df: DataFrame con las métricas
+        titulo: Título del reporte
+
+    Returns:
+        String con HTML completo
+    """
+    return "".join(iter_reporte_html(df, titulo))
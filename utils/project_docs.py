@@ -0,0 +1,261 @@
+"""
+Parseo y caché de la documentación del proyecto (CHANGELOG.md y ROADMAP.md).
+
+La vista "Historial de Versiones" se vuelve a ejecutar con cada tecla del
+buscador. En lugar de releer y recorrer el markdown en cada rerun, cada
+archivo se parsea una sola vez por fecha de modificación a una estructura con
+las entradas del changelog, los bloques por versión, los contadores y los
+sprints del roadmap. El changelog incluye además un índice invertido de
+prefijos de palabras: una búsqueda cuesta lo que sus coincidencias, no lo que
+mide el documento. Solo si el índice no tiene coincidencias (fragmentos en
+medio de una palabra) se recorre el texto de las entradas.
+
+Uso:
+    from utils.project_docs import load_changelog, load_roadmap
+
+    doc = load_changelog(Path("CHANGELOG.md"))
+    doc.versions                  # ['2.1.0', '2.0.0', ...]
+    doc.search("grafica kpi")     # entradas con ambas palabras (sin acentos)
+    doc.to_markdown(doc.search("benchmark"))
+"""
+
+import functools
+import re
+import unicodedata
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Set, Tuple
+
+DOCS_CACHE_SIZE = 4
+MIN_PREFIX = 2  # Prefijo mínimo indexado (y largo mínimo de palabra buscada)
+
+VERSION_PATTERN = r"## \[(\d+\.\d+\.\d+)\]"
+ROADMAP_HEADING = "## Roadmap"
+
+
+def normalize(texto: str) -> str:
+    """Minúsculas y sin acentos, para buscar 'grafica' y encontrar 'gráfica'."""
+    descompuesto = unicodedata.normalize("NFKD", texto.lower())
+    return "".join(c for c in descompuesto if not unicodedata.combining(c))
+
+
+def tokenize(texto: str) -> List[str]:
+    return re.findall(r"\w+", normalize(texto))
+
+
+def _mtime_key(path: Path) -> Tuple[str, int]:
+    path = Path(path).resolve()
+    return str(path), path.stat().st_mtime_ns
+
+
+# ===========================
+# CHANGELOG
+# ===========================
+
+
+class ChangelogEntry(NamedTuple):
+    """Un elemento de lista de primer nivel con sus sub-elementos, o un párrafo."""
+
+    titulo: str  # Encabezado '## ...' (p. ej. '## [2.1.0] - 2025-12-01')
+    seccion: str  # Encabezado '### ...' o '' si no hay
+    texto: str  # Markdown del elemento o del párrafo
+    roadmap: bool  # True si está dentro de la sección '## Roadmap'
+
+
+class ChangelogDoc:
+    """
+    CHANGELOG.md parseado.
+
+    Atributos:
+        content: Markdown completo.
+        versions: Versiones publicadas, en orden de aparición.
+        version_blocks: {versión: markdown desde su '## [x.y.z]' hasta la siguiente}.
+        entries: Entradas (elementos de lista y párrafos) bajo algún '## '.
+        features_count / fixes_count: Secciones '✨ Agregado' / '🐛 Corregido'.
+    """
+
+    def __init__(self, content: str):
+        self.content = content
+        self.versions = re.findall(VERSION_PATTERN, content)
+        self.version_blocks = {
+            m.group(1): m.group()
+            for m in re.finditer(
+                r"## \[(\d+\.\d+\.\d+)\].*?(?=## \[|$)", content, re.DOTALL
+            )
+        }
+        self.features_count = content.count("✨ Agregado")
+        self.fixes_count = content.count("🐛 Corregido")
+        self.plain_text = re.sub(r"[#*`\[\]]", "", content)
+        self.entries = self._parse_entries(content)
+        self._texts = [
+            normalize(" ".join([e.titulo, e.seccion, e.texto])) for e in self.entries
+        ]
+
+        # Índice invertido: prefijo de palabra -> posiciones en `entries`
+        self._index: Dict[str, Set[int]] = defaultdict(set)
+        for i, texto in enumerate(self._texts):
+            for token in set(re.findall(r"\w+", texto)):
+                for largo in range(MIN_PREFIX, len(token) + 1):
+                    self._index[token[:largo]].add(i)
+
+    @staticmethod
+    def _parse_entries(content: str) -> List[ChangelogEntry]:
+        entradas: List[ChangelogEntry] = []
+        titulo = seccion = ""
+        roadmap = False
+        actual: List[str] = []
+
+        def cerrar():
+            if actual:
+                entradas.append(
+                    ChangelogEntry(titulo, seccion, "\n".join(actual), roadmap)
+                )
+                actual.clear()
+
+        for linea in content.split("\n"):
+            if linea.startswith("## "):
+                cerrar()
+                titulo, seccion = linea, ""
+                roadmap = roadmap or linea.startswith(ROADMAP_HEADING)
+            elif linea.startswith("### "):
+                cerrar()
+                seccion = linea
+            elif linea.startswith("- ") and titulo:
+                cerrar()
+                actual.append(linea)
+            elif actual and linea.startswith((" ", "\t")) and linea.strip():
+                actual.append(linea)  # sub-elemento o continuación
+            elif titulo and linea.strip() and linea.strip() != "---":
+                # Párrafo: sus líneas seguidas forman una entrada
+                if actual and actual[0].startswith("- "):
+                    cerrar()
+                actual.append(linea)
+            else:
+                cerrar()
+        cerrar()
+        return entradas
+
+    def search(
+        self, termino: str, incluir_roadmap: bool = True
+    ) -> List[ChangelogEntry]:
+        """
+        Entradas que contienen todas las palabras de `termino` (como palabra
+        completa o como prefijo de una palabra), sin distinguir acentos.
+
+        Si el índice no encuentra nada, o alguna palabra tiene menos de
+        `MIN_PREFIX` letras, se recorre el texto de las entradas buscando cada
+        palabra como fragmento (p. ej. 'mark' encuentra 'benchmarking').
+        """
+        palabras = tokenize(termino)
+        if not palabras:
+            return []
+        candidatas = range(len(self.entries))
+        if not incluir_roadmap:
+            candidatas = [i for i in candidatas if not self.entries[i].roadmap]
+
+        indices: List[int] = []
+        if min(len(p) for p in palabras) >= MIN_PREFIX:
+            postings = sorted((self._index.get(p, set()) for p in palabras), key=len)
+            indices = sorted(set.intersection(*postings).intersection(candidatas))
+        if not indices:
+            indices = [
+                i for i in candidatas if all(p in self._texts[i] for p in palabras)
+            ]
+        return [self.entries[i] for i in indices]
+
+    @staticmethod
+    def to_markdown(entries: List[ChangelogEntry]) -> str:
+        """Markdown de `entries` agrupadas bajo sus encabezados."""
+        lineas: List[str] = []
+        titulo = seccion = None
+        for entrada in entries:
+            if entrada.titulo != titulo:
+                titulo, seccion = entrada.titulo, None
+                lineas += ["", entrada.titulo]
+            if entrada.seccion and entrada.seccion != seccion:
+                seccion = entrada.seccion
+                lineas += ["", entrada.seccion]
+            lineas.append(entrada.texto)
+        return "\n".join(lineas).strip()
+
+    @staticmethod
+    def without_roadmap(markdown: str) -> str:
+        """Corta `markdown` antes de la sección '## Roadmap'."""
+        corte = markdown.find(ROADMAP_HEADING)
+        return markdown if corte == -1 else markdown[:corte]
+
+
+@functools.lru_cache(maxsize=DOCS_CACHE_SIZE)
+def _load_changelog(path: str, mtime_ns: int) -> ChangelogDoc:
+    return ChangelogDoc(Path(path).read_text(encoding="utf-8"))
+
+
+def load_changelog(path: Path) -> ChangelogDoc:
+    """CHANGELOG parseado; se vuelve a parsear solo si cambió el archivo."""
+    return _load_changelog(*_mtime_key(path))
+
+
+# ===========================
+# ROADMAP
+# ===========================
+
+
+class Sprint(NamedTuple):
+    titulo: str
+    emoji: str
+    estado: str
+    completadas: int
+    total: int
+    tareas: List[Tuple[str, str, str]]  # (marca, nombre, descripción)
+
+    @property
+    def progreso(self) -> float:
+        return self.completadas / self.total * 100 if self.total > 0 else 0
+
+
+class RoadmapDoc:
+    """ROADMAP.md parseado: contadores globales, sprints y prioridades."""
+
+    def __init__(self, content: str):
+        self.content = content
+        self.total_tasks = content.count("- [")
+        self.completed_tasks = content.count("- [x]")
+        self.progress = (
+            self.completed_tasks / self.total_tasks * 100 if self.total_tasks else 0
+        )
+
+        self.sprints: List[Sprint] = []
+        for m in re.finditer(
+            r"## (.+?Sprint \d+:.+?)\n\*\*Status\*\*: (.+?) \*\*(.+?)\*\*.*?\n(.*?)(?=##|---|\Z)",
+            content,
+            re.DOTALL,
+        ):
+            cuerpo = m.group(4)
+            tareas = re.findall(
+                r"- \[([ x])\] \*\*(.+?)\*\*:(.+?)(?=\n-|\n\n|$)", cuerpo, re.DOTALL
+            )
+            self.sprints.append(
+                Sprint(
+                    titulo=m.group(1).strip(),
+                    emoji=m.group(2).strip(),
+                    estado=m.group(3).strip(),
+                    completadas=cuerpo.count("- [x]"),
+                    total=cuerpo.count("- ["),
+                    tareas=sorted(tareas, key=lambda t: (t[0] == " ", t[0] == "x")),
+                )
+            )
+
+        prioridades = re.search(
+            r"## 🎯 Prioridades Actuales.*?\n(.*?)(?=##|---|\Z)", content, re.DOTALL
+        )
+        self.priorities = prioridades.group(1) if prioridades else None
+
+
+@functools.lru_cache(maxsize=DOCS_CACHE_SIZE)
+def _load_roadmap(path: str, mtime_ns: int) -> RoadmapDoc:
+    return RoadmapDoc(Path(path).read_text(encoding="utf-8"))
+
+
+def load_roadmap(path: Path) -> RoadmapDoc:
+    """ROADMAP parseado; se vuelve a parsear solo si cambió el archivo."""
+    return _load_roadmap(*_mtime_key(path))
@@ -0,0 +1,203 @@
+"""
+Pool persistente de procesos para exportar gráficas de reportes.
+
+Kaleido arranca un Chromium sin interfaz la primera vez que se exporta una
+figura en un proceso, y una exportación colgada bloquearía el hilo del script
+de Streamlit. Este módulo mantiene unos pocos procesos de renderizado vivos
+entre peticiones: cada uno se precalienta al arrancar, recibe la figura como
+JSON por un pipe y devuelve los bytes del PNG. Si un renderizado excede el
+tiempo límite o el proceso muere, se reemplaza por uno nuevo automáticamente.
+
+Uso:
+    from utils.render_pool import get_pool
+
+    png = get_pool().render(fig.to_json(), width=800, height=400)
+
+Para no esperar en el hilo del script, los reportes usan
+`utils.chart_render.render_png_async`, que llama a `render` desde un hilo
+auxiliar y devuelve un `Future`.
+"""
+
+import atexit
+import itertools
+import multiprocessing
+import queue
+import threading
+from typing import Callable, Optional
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+RENDER_POOL_SIZE = 2
+RENDER_TIMEOUT = 30.0  # segundos por gráfica
+STARTUP_TIMEOUT = 60.0  # arranque + precalentamiento de Kaleido
+
+Renderer = Callable[[str, int, int], bytes]
+
+# Figura mínima para precalentar Kaleido en cada proceso nuevo
+WARMUP_SPEC = '{"data": [{"type": "scatter", "x": [0, 1], "y": [0, 1]}]}'
+
+
+def kaleido_png(spec: str, width: int, height: int) -> bytes:
+    """Renderizador por defecto: JSON de Plotly → PNG con Kaleido."""
+    import plotly.io as pio
+
+    return pio.to_image(pio.from_json(spec), format="png", width=width, height=height)
+
+
+def _worker_main(conn, renderer: Renderer) -> None:
+    """Bucle del proceso hijo: precalienta y atiende peticiones hasta `None`."""
+    try:
+        renderer(WARMUP_SPEC, 10, 10)
+    except Exception:
+        pass  # El error real aparecerá en la primera petición
+    conn.send(("ready", True, None))
+
+    while True:
+        try:
+            mensaje = conn.recv()
+        except (EOFError, OSError):
+            break
+        if mensaje is None:
+            break
+        job_id, spec, width, height = mensaje
+        try:
+            conn.send((job_id, True, renderer(spec, width, height)))
+        except Exception as e:
+            conn.send((job_id, False, f"{type(e).__name__}: {e}"))
+    conn.close()
+
+
+# ===========================
+# PROCESO TRABAJADOR
+# ===========================
+
+
+class _Worker:
+    """Un proceso de renderizado y su extremo del pipe (uso exclusivo)."""
+
+    def __init__(self, ctx, renderer: Renderer):
+        self.conn, hijo = ctx.Pipe()
+        self.process = ctx.Process(
+            target=_worker_main, args=(hijo, renderer), daemon=True
+        )
+        self.process.start()
+        hijo.close()
+        self.ready = False
+        self._ids = itertools.count()
+
+    def _recv(self, timeout: float):
+        if not self.conn.poll(timeout):
+            raise TimeoutError(f"Renderizado excedió {timeout:.0f}s")
+        return self.conn.recv()
+
+    def request(
+        self, spec: str, width: int, height: int, timeout: float, startup: float
+    ) -> bytes:
+        if not self.ready:
+            self._recv(startup)  # mensaje "ready"
+            self.ready = True
+        job_id = next(self._ids)
+        self.conn.send((job_id, spec, width, height))
+        respuesta_id, ok, resultado = self._recv(timeout)
+        if respuesta_id != job_id:
+            raise RuntimeError("Respuesta fuera de orden del proceso de render")
+        if not ok:
+            raise RuntimeError(f"Error renderizando gráfica: {resultado}")
+        return resultado
+
+    def stop(self, timeout: float = 2.0) -> None:
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout)
+        self.kill()
+
+    def kill(self) -> None:
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+
+# ===========================
+# POOL
+# ===========================
+
+
+class RenderPool:
+    """
+    Pool de `size` procesos de renderizado persistentes.
+
+    `render` bloquea hasta tener el PNG. Es seguro llamarlo desde varios
+    hilos: cada llamada toma un proceso libre o espera a que se libere uno (la
+    versión no bloqueante es `chart_render.render_png_async`).
+    """
+
+    def __init__(
+        self,
+        size: int = RENDER_POOL_SIZE,
+        timeout: float = RENDER_TIMEOUT,
+        startup_timeout: float = STARTUP_TIMEOUT,
+        renderer: Renderer = kaleido_png,
+    ):
+        self.size = size
+        self.timeout = timeout
+        self.startup_timeout = startup_timeout
+        self.restarts = 0
+        self._renderer = renderer
+        self._ctx = multiprocessing.get_context("spawn")
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        self._closed = False
+        for _ in range(size):
+            self._idle.put(_Worker(self._ctx, renderer))
+
+    def render(
+        self, spec: str, width: int, height: int, timeout: Optional[float] = None
+    ) -> bytes:
+        """Renderiza una figura (JSON de Plotly) en un proceso libre del pool."""
+        if self._closed:
+            raise RuntimeError("El pool de renderizado está cerrado")
+        timeout = self.timeout if timeout is None else timeout
+        worker = self._idle.get()
+        try:
+            return worker.request(
+                spec, width, height, timeout=timeout, startup=self.startup_timeout
+            )
+        except (TimeoutError, EOFError, OSError) as e:
+            # Proceso colgado o muerto: reemplazarlo antes de devolverlo
+            logger.warning(f"Reiniciando proceso de render ({e})")
+            worker.kill()
+            worker = _Worker(self._ctx, self._renderer)
+            self.restarts += 1
+            raise
+        finally:
+            self._idle.put(worker)
+
+    def shutdown(self) -> None:
+        """Detiene los procesos (se registra con atexit para el pool global)."""
+        if self._closed:
+            return
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().stop()
+            except queue.Empty:
+                break
+
+
+_pool: Optional[RenderPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> RenderPool:
+    """Pool global del proceso de Streamlit (se crea en el primer uso)."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = RenderPool()
+            atexit.register(_pool.shutdown)
+            logger.info(f"Pool de renderizado iniciado ({_pool.size} procesos)")
+        return _pool
@@ -0,0 +1,80 @@
+"""
+Modelo de datos de los reportes PDF: agregados mensuales precalculados.
+
+En lugar de que cada sección del reporte recorra las filas crudas (diarias,
+a veces de varios años), `ReportData` agrupa una sola vez por mes y por
+plataforma con la misma lógica de `utils.analytics.calculate_growth_metrics`
+y todas las secciones leen de esa tabla compacta. El tamaño del reporte y el
+tiempo de generación dependen del número de meses, no del de filas.
+
+Los seguidores de cada mes son la suma del último registro de cada cuenta en
+ese mes: con capturas diarias, sumar todas las filas multiplicaría la
+audiencia por el número de capturas. Las interacciones sí se suman.
+
+Uso:
+    from utils.report_data import ReportData
+
+    datos = ReportData(df_entidad)
+    datos.mensual   # Mes × plataforma: Seguidores, Interacciones, Engagement, Delta_*
+    datos.total     # Mes (todas las plataformas)
+"""
+
+import pandas as pd
+
+from utils.analytics import REQUIRED_COLUMNS, calculate_growth_metrics
+
+SIN_PLATAFORMA = "Total"
+
+
+def _complete_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Agrega como 0 las métricas requeridas que falten (p. ej. 'alcance')."""
+    faltantes = [c for c in REQUIRED_COLUMNS if c not in df.columns]
+    if not faltantes:
+        return df
+    return df.assign(**{c: 0 for c in faltantes})
+
+
+class ReportData:
+    """
+    Agregados mensuales de una institución, calculados una sola vez.
+
+    Atributos:
+        mensual: Una fila por (Mes, plataforma) con los KPIs y deltas MoM/YoY.
+        total: Una fila por Mes sumando todas las plataformas (seguidores: último
+            registro de cada cuenta en el mes).
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        df = _complete_columns(df)
+        if "plataforma" not in df.columns:
+            df = df.assign(plataforma=SIN_PLATAFORMA)
+
+        self.total = calculate_growth_metrics(df, followers_from_latest=True)
+
+        partes = []
+        for plataforma, grupo in df.groupby("plataforma", sort=True):
+            crecimiento = calculate_growth_metrics(grupo, followers_from_latest=True)
+            if not crecimiento.empty:
+                partes.append(crecimiento.assign(plataforma=plataforma))
+        if partes:
+            mensual = pd.concat(partes, ignore_index=True)
+        else:
+            mensual = self.total.assign(plataforma=pd.Series(dtype=object))
+        self.mensual = mensual.sort_values(["Mes", "plataforma"]).reset_index(drop=True)
+
+    @property
+    def empty(self) -> bool:
+        return self.total.empty
+
+    def growth_summary(self) -> dict:
+        """Seguidores del primer y último mes y el crecimiento entre ambos."""
+        primero = self.total.iloc[0]
+        ultimo = self.total.iloc[-1]
+        inicio, fin = primero["Seguidores"], ultimo["Seguidores"]
+        return {
+            "mes_inicio": primero["Mes"],
+            "mes_fin": ultimo["Mes"],
+            "seguidores_inicio": inicio,
+            "seguidores_fin": fin,
+            "crecimiento": (fin - inicio) / inicio * 100 if inicio > 0 else 0.0,
+        }
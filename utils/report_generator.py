@@ -4,10 +4,146 @@ Versión corregida para integración con Streamlit.
 """
 
 from fpdf import FPDF
-import plotly.io as pio
-import os
+import hashlib
+import struct
+import zlib
+from concurrent.futures import Future
+from typing import List, Optional
+
+import numpy as np
 import pandas as pd
-import uuid
+
+from utils.chart_render import render_png_async
+from utils.report_data import ReportData
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# Columnas de la tabla de KPIs (sobre ReportData.mensual) y su encabezado
+KPI_COLUMNS = {
+    "Mes": "Mes",
+    "plataforma": "Plataforma",
+    "Seguidores": "Seguidores",
+    "Delta_Seguidores": "Var. %",
+    "Interacciones": "Interacciones",
+    "Engagement": "Engagement %",
+}
+TABLE_ROW_HEIGHT = 8
+MAX_CELL_CHARS = 15
+
+
+def format_table(
+    df: pd.DataFrame, columnas: List[str], max_chars: int = MAX_CELL_CHARS
+) -> pd.DataFrame:
+    """
+    Convierte las columnas a texto listo para el PDF, columna por columna.
+
+    Fechas como AAAA-MM-DD, enteros sin decimales, flotantes con 2 decimales,
+    textos largos truncados con "..." y todo codificado a latin-1.
+    """
+    salida = {}
+    for col in columnas:
+        serie = df[col]
+        nulos = serie.isna().to_numpy()
+        if pd.api.types.is_datetime64_any_dtype(serie):
+            texto = serie.dt.strftime("%Y-%m-%d").to_numpy(dtype=object)
+        elif pd.api.types.is_bool_dtype(serie):
+            texto = serie.astype(str).to_numpy(dtype=object)
+        elif pd.api.types.is_numeric_dtype(serie):
+            valores = serie.to_numpy(dtype=float, na_value=np.nan)
+            enteros = np.isfinite(valores) & (valores == np.round(valores))
+            if pd.api.types.is_integer_dtype(serie) or enteros[~nulos].all():
+                texto = np.char.mod("%d", np.nan_to_num(valores).astype(np.int64))
+            else:
+                texto = np.char.mod("%.2f", valores)
+            texto = texto.astype(object)
+        else:
+            texto = serie.astype(str).to_numpy(dtype=object)
+        texto[nulos] = ""
+
+        texto = pd.Series(texto, index=df.index, dtype=object)
+        largos = texto.str.len() > max_chars
+        texto = texto.where(~largos, texto.str.slice(0, max_chars - 3) + "...")
+        salida[col] = texto.str.encode("latin-1", "replace").str.decode("latin-1")
+    return pd.DataFrame(salida, index=df.index)
+
+
+def png_info(data: bytes) -> dict:
+    """
+    Equivalente en memoria de `FPDF._parsepng` (fpdf 1.7.2 solo lee rutas).
+
+    Devuelve el diccionario de imagen que FPDF espera en `self.images`. Si el
+    PNG tiene canal alfa (Kaleido exporta RGBA), se separa en una máscara
+    suave igual que hace FPDF.
+    """
+    if data[:8] != PNG_SIGNATURE or data[12:16] != b"IHDR":
+        raise ValueError("No es un PNG válido")
+    w, h, bpc, ct, _, _, entrelazado = struct.unpack(">IIBBBBB", data[16:29])
+    if bpc > 8:
+        raise ValueError("PNG de 16 bits no soportado")
+    if entrelazado:
+        raise ValueError("PNG entrelazado no soportado")
+    espacios = {
+        0: "DeviceGray",
+        2: "DeviceRGB",
+        3: "Indexed",
+        4: "DeviceGray",
+        6: "DeviceRGB",
+    }
+    if ct not in espacios:
+        raise ValueError(f"Tipo de color PNG desconocido: {ct}")
+
+    pal, trns, idat = "", "", []
+    pos = 8
+    while pos + 8 <= len(data):
+        n, tipo = struct.unpack(">I4s", data[pos : pos + 8])
+        cuerpo = data[pos + 8 : pos + 8 + n]
+        pos += n + 12  # longitud + tipo + datos + CRC
+        if tipo == b"PLTE":
+            pal = cuerpo
+        elif tipo == b"tRNS":
+            if ct == 0:
+                trns = [cuerpo[1]]
+            elif ct == 2:
+                trns = [cuerpo[1], cuerpo[3], cuerpo[5]]
+            elif cuerpo.find(b"\x00") != -1:
+                trns = [cuerpo.find(b"\x00")]
+        elif tipo == b"IDAT":
+            idat.append(cuerpo)
+        elif tipo == b"IEND":
+            break
+    if ct == 3 and not pal:
+        raise ValueError("PNG indexado sin paleta")
+
+    colores = 3 if espacios[ct] == "DeviceRGB" else 1
+    info = {
+        "w": w,
+        "h": h,
+        "cs": espacios[ct],
+        "bpc": bpc,
+        "f": "FlateDecode",
+        "dp": f"/Predictor 15 /Colors {colores} /BitsPerComponent {bpc} /Columns {w}",
+        "pal": pal,
+        "trns": trns,
+        "data": b"".join(idat),
+    }
+    if ct >= 4:
+        # Separar alfa: los filtros PNG operan por canal, así que cada fila
+        # filtrada se puede partir conservando su byte de filtro
+        crudo = zlib.decompress(info["data"])
+        canales = 2 if ct == 4 else 4
+        largo = canales * w
+        color, alfa = bytearray(), bytearray()
+        for fila in range(h):
+            ini = (1 + largo) * fila
+            linea = crudo[ini + 1 : ini + 1 + largo]
+            sin_alfa = bytearray(colores * w)
+            for c in range(colores):
+                sin_alfa[c::colores] = linea[c::canales]
+            color += crudo[ini : ini + 1] + sin_alfa
+            alfa += crudo[ini : ini + 1] + linea[canales - 1 :: canales]
+        info["data"] = zlib.compress(bytes(color))
+        info["smask"] = zlib.compress(bytes(alfa))
+    return info
 
 
 class ReportBuilder(FPDF):
@@ -17,9 +153,10 @@ class ReportBuilder(FPDF):
         """
         super().__init__()
         self.df = df
+        # Agregados mensuales: todas las secciones leen de aquí
+        self.data = ReportData(df)
         # Validación de seguridad: Si entity_name es None, usar string por defecto
         self.entity_name = entity_name if entity_name else "Entidad Desconocida"
-        self.output_path = f"reporte_temp_{uuid.uuid4().hex}.pdf"  # Nombre único para evitar colisiones
 
         # Configuración inicial del PDF
         self.set_auto_page_break(auto=True, margin=15)
@@ -50,6 +187,18 @@ class ReportBuilder(FPDF):
         except Exception:
             return text  # Fallback si falla la codificación
 
+    def image_bytes(self, data: bytes, x=None, y=None, w=0, h=0):
+        """Inserta un PNG desde memoria (sin archivo temporal)."""
+        nombre = f"mem:{hashlib.sha1(data).hexdigest()}.png"
+        if nombre not in self.images:
+            info = png_info(data)
+            if "smask" in info and self.pdf_version < "1.4":
+                # /SMask requiere PDF 1.4 (y el grupo de transparencia por página)
+                self.pdf_version = "1.4"
+            info["i"] = len(self.images) + 1
+            self.images[nombre] = info
+        self.image(nombre, x=x, y=y, w=w, h=h)
+
     def add_cover_page(self):
         """Agrega una portada al reporte."""
         print("Paso 1: Generando portada...")
@@ -62,46 +211,48 @@ class ReportBuilder(FPDF):
         self.cell(0, 10, "Reporte Mensual de Redes Sociales", ln=True, align="C")
         self.add_page()  # Salto de página para lo siguiente
 
+    def _table_header(self, etiquetas, col_width: float, row_height: float):
+        self.set_font("Arial", size=10, style="B")
+        for etiqueta in etiquetas:
+            self.cell(
+                col_width, row_height, self.encode_text(etiqueta.upper()), 1, 0, "C"
+            )
+        self.ln()
+        self.set_font("Arial", size=10)
+
+    def add_table(self, df: pd.DataFrame, columnas: dict):
+        """
+        Dibuja `df` completo, paginado con la cabecera repetida en cada página.
+
+        Las celdas se formatean por columna de antemano (`format_table`), así
+        que el bucle solo dibuja texto ya listo.
+
+        Args:
+            df: Datos a mostrar.
+            columnas: {columna: encabezado}, en el orden de la tabla.
+        """
+        filas = format_table(df, list(columnas)).values.tolist()
+        etiquetas = list(columnas.values())
+
+        col_width = 190 / len(etiquetas)
+        self._table_header(etiquetas, col_width, TABLE_ROW_HEIGHT)
+        for fila in filas:
+            if self.get_y() + TABLE_ROW_HEIGHT > self.page_break_trigger:
+                self.add_page()
+                self._table_header(etiquetas, col_width, TABLE_ROW_HEIGHT)
+            for val in fila:
+                self.cell(col_width, TABLE_ROW_HEIGHT, val, 1, 0, "C")
+            self.ln()
+
     def add_kpis_table(self):
-        """Agrega una tabla de KPIs basada en el DF."""
+        """Agrega la tabla de KPIs mensuales por plataforma."""
         print("Paso 2: Generando tabla de KPIs...")
         self.set_font("Arial", size=14, style="B")
         self.cell(0, 10, "Tabla de Datos", ln=True, align="L")
         self.ln(5)
 
-        # Seleccionar columnas clave para que quepan
-        cols_to_show = [
-            c
-            for c in self.df.columns
-            if c
-            in ["fecha", "plataforma", "seguidores", "interacciones", "engagement_rate"]
-        ]
-        if not cols_to_show:
-            cols_to_show = self.df.columns[:5]  # Fallback
-
-        df_table = self.df[cols_to_show].head(
-            15
-        )  # Solo las primeras 15 filas para no saturar
-
-        # Configuración de celdas
-        col_width = 190 / len(cols_to_show)
-        self.set_font("Arial", size=10, style="B")
-
-        # Cabeceras
-        for col in cols_to_show:
-            self.cell(col_width, 10, self.encode_text(col.upper()), border=1, align="C")
-        self.ln()
-
-        # Filas
-        self.set_font("Arial", size=10)
-        for _, row in df_table.iterrows():
-            for col in cols_to_show:
-                val = str(row[col])
-                # Truncar si es muy largo
-                if len(val) > 15:
-                    val = val[:12] + "..."
-                self.cell(col_width, 10, self.encode_text(val), border=1, align="C")
-            self.ln()
+        columnas = {c: e for c, e in KPI_COLUMNS.items() if c in self.data.mensual}
+        self.add_table(self.data.mensual, columnas)
 
         self.add_page()
 
@@ -111,19 +262,11 @@ class ReportBuilder(FPDF):
         """
         print("Paso 2.5: Generando resumen analítico...")
         try:
-            # Ordenar por fecha para obtener el primer y último registro
-            self.df = self.df.sort_values(by="fecha")
-            first_row = self.df.iloc[0]
-            last_row = self.df.iloc[-1]
-
-            # Extraer métricas clave
-            seguidores_inicio = first_row["seguidores"]
-            seguidores_fin = last_row["seguidores"]
-            crecimiento = (
-                ((seguidores_fin - seguidores_inicio) / seguidores_inicio) * 100
-                if seguidores_inicio > 0
-                else 0
-            )
+            # Primer y último mes de la serie mensual precalculada
+            resumen = self.data.growth_summary()
+            seguidores_inicio = resumen["seguidores_inicio"]
+            seguidores_fin = resumen["seguidores_fin"]
+            crecimiento = resumen["crecimiento"]
 
             # Agregar texto al PDF
             self.set_font("Arial", size=12)
@@ -134,7 +277,7 @@ class ReportBuilder(FPDF):
                 0,
                 10,
                 self.encode_text(
-                    f"La institución {self.entity_name} inició con {seguidores_inicio:,} seguidores y finalizó con {seguidores_fin:,}, "
+                    f"La institución {self.entity_name} inició {resumen['mes_inicio']} con {seguidores_inicio:,.0f} seguidores y finalizó {resumen['mes_fin']} con {seguidores_fin:,.0f}, "
                     f"representando un crecimiento del {crecimiento:.2f}%."
                 ),
             )
@@ -145,27 +288,49 @@ class ReportBuilder(FPDF):
             self.cell(0, 10, f"No se pudo generar el análisis: {str(e)}", ln=True)
             self.set_text_color(0, 0, 0)
 
-    def add_trend_graphs(self):
+    def start_trend_graphs(self) -> "Future[bytes]":
         """
-        Genera gráficas simples usando Plotly y las inserta con manejo de errores.
+        Arma la gráfica de tendencia y lanza su exportación a PNG sin esperarla.
+
+        Un error al armar la figura queda en el `Future` y se reporta en
+        `add_trend_graphs`, igual que un error de exportación.
         """
-        print("Paso 3: Intentando generar gráficas...")
         try:
             import plotly.express as px
 
-            # Gráfica 1: Seguidores
+            # Gráfica 1: Seguidores (un punto por mes y plataforma)
             fig1 = px.line(
-                self.df, x="fecha", y="seguidores", title="Evolución de Seguidores"
+                self.data.mensual,
+                x="Mes",
+                y="Seguidores",
+                color="plataforma",
+                markers=True,
+                title="Evolución de Seguidores",
             )
-            img_path1 = "temp_chart_1.png"
-            pio.write_image(fig1, img_path1, format="png", width=800, height=400)
+            return render_png_async(fig1, width=800, height=400)
+        except Exception as e:
+            fallido: "Future[bytes]" = Future()
+            fallido.set_exception(e)
+            return fallido
+
+    def add_trend_graphs(self, grafica: Optional["Future[bytes]"] = None):
+        """
+        Inserta las gráficas de tendencia con manejo de errores.
+
+        Args:
+            grafica: Exportación lanzada antes con `start_trend_graphs`; si no
+                se pasa, se lanza aquí y se espera.
+        """
+        print("Paso 3: Intentando generar gráficas...")
+        try:
+            grafica = grafica if grafica is not None else self.start_trend_graphs()
+            png1 = grafica.result()
 
             self.set_font("Arial", size=14, style="B")
             self.cell(0, 10, "Tendencias Gráficas", ln=True)
-            self.image(img_path1, x=10, w=190)
+            self.image_bytes(png1, x=10, w=190)
             self.ln(10)
 
-            os.remove(img_path1)
             print("   -> Gráfica 1 insertada")
 
         except Exception as e:
@@ -180,6 +345,10 @@ class ReportBuilder(FPDF):
         """
         print(f"Paso 0: Iniciando reporte para secciones: {sections}")
 
+        # La gráfica se exporta en el pool mientras se arman portada y tabla;
+        # este hilo solo espera lo que falte al insertarla
+        grafica = self.start_trend_graphs() if "graficas" in sections else None
+
         # Lógica de secciones
         # Siempre ponemos portada
         self.add_cover_page()
@@ -188,22 +357,11 @@ class ReportBuilder(FPDF):
             self.add_kpis_table()
 
         if "graficas" in sections:
-            self.add_trend_graphs()
+            self.add_trend_graphs(grafica)
 
         if "analisis" in sections:
             self.add_analysis_summary()
 
-        # Finalizar y guardar temporalmente
-        print("Paso 4: Guardando archivo temporal...")
-        self.output(self.output_path, "F")
-
-        # Leer los bytes para devolverlos a Streamlit
-        print("Paso 5: Leyendo bytes para descarga...")
-        with open(self.output_path, "rb") as f:
-            pdf_bytes = f.read()
-
-        # Limpieza (borrar el archivo temp del servidor)
-        if os.path.exists(self.output_path):
-            os.remove(self.output_path)
-
-        return pdf_bytes
+        # Finalizar en memoria: fpdf 1.7.2 devuelve el documento como str latin-1
+        print("Paso 4: Generando PDF en memoria...")
+        return self.output(dest="S").encode("latin-1")
@@ -0,0 +1,216 @@
+"""
+Pre-generación programada de los reportes mensuales (sin interfaz).
+
+Carga los datos una sola vez, genera el PDF (ReportBuilder) y el HTML de cada
+institución para el mes cerrado y los guarda en la caché local de reportes
+junto con un manifiesto. La pestaña de reportes de Configuración sirve el
+reporte pre-generado al instante cuando existe.
+
+Uso (p. ej. desde cron el día 1 de cada mes):
+    python -m utils.report_scheduler                 # mes anterior
+    python -m utils.report_scheduler --mes 2024-09   # mes concreto
+    python -m utils.report_scheduler --entidad "Colegio X" --workers 2
+
+    # crontab: 0 3 1 * * cd /ruta/app && python -m utils.report_scheduler
+
+Estructura de la caché:
+    data/report_cache/manifest.json
+    data/report_cache/2024-09/Reporte_Colegio_X.pdf
+    data/report_cache/2024-09/Reporte_Colegio_X.html
+"""
+
+import argparse
+import json
+import sys
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+import utils.data_manager as dm
+from utils.batch_reports import (
+    DEFAULT_SECTIONS,
+    generate_reports,
+    merge_report_data,
+    report_entities,
+    report_file_name,
+)
+from utils.file_lock import file_lock, write_atomic, write_text_atomic
+from utils.helpers import write_reporte_html
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+REPORT_CACHE_DIR = dm.DATA_DIR / "report_cache"
+MANIFEST_NAME = "manifest.json"
+
+
+# ===========================
+# MANIFIESTO
+# ===========================
+
+
+def closed_month(hoy: Optional[date] = None) -> str:
+    """Último mes cerrado (el anterior a `hoy`) como 'AAAA-MM'."""
+    hoy = hoy or date.today()
+    return (pd.Period(hoy, freq="M") - 1).strftime("%Y-%m")
+
+
+def load_manifest(cache_dir: Path = REPORT_CACHE_DIR) -> Dict:
+    """Manifiesto de la caché ({mes: {...}}); vacío si no existe o está dañado."""
+    ruta = Path(cache_dir) / MANIFEST_NAME
+    if not ruta.exists():
+        return {}
+    try:
+        with file_lock(ruta, shared=True):
+            return json.loads(ruta.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as e:
+        logger.warning(f"Manifiesto de reportes ilegible: {e}")
+        return {}
+
+
+def find_prebuilt(
+    entidad: str, mes: Optional[str] = None, cache_dir: Path = REPORT_CACHE_DIR
+) -> Optional[Dict]:
+    """
+    Reporte pre-generado de una institución.
+
+    Args:
+        entidad: Nombre de la institución.
+        mes: 'AAAA-MM'; por defecto, el mes más reciente del manifiesto.
+
+    Returns:
+        {"mes", "generado", "pdf": Path, "html": Path} o None si no existe.
+    """
+    manifiesto = load_manifest(cache_dir)
+    meses = [mes] if mes else sorted(manifiesto, reverse=True)
+    for m in meses:
+        entrada = manifiesto.get(m, {})
+        archivos = entrada.get("reportes", {}).get(entidad)
+        if not archivos:
+            continue
+        rutas = {k: Path(cache_dir) / v for k, v in archivos.items()}
+        if all(r.exists() for r in rutas.values()):
+            return {"mes": m, "generado": entrada.get("generado"), **rutas}
+    return None
+
+
+# ===========================
+# GENERACIÓN
+# ===========================
+
+
+def run(
+    mes: Optional[str] = None,
+    entidades: Optional[List[str]] = None,
+    cache_dir: Path = REPORT_CACHE_DIR,
+    max_workers: Optional[int] = None,
+) -> Dict:
+    """
+    Genera los reportes PDF y HTML del mes indicado y actualiza el manifiesto.
+
+    Los datos incluyen toda la historia hasta el fin de `mes` (las gráficas y
+    el análisis muestran la tendencia hasta ese mes).
+
+    Returns:
+        La entrada del manifiesto para `mes`.
+    """
+    mes = mes or closed_month()
+    fin_mes = pd.Period(mes, freq="M").end_time
+    cache_dir = Path(cache_dir)
+    carpeta = cache_dir / mes
+
+    cuentas, metricas = dm.load_data()
+    if cuentas.empty or metricas.empty:
+        raise RuntimeError("No hay datos para generar reportes")
+
+    df = merge_report_data(cuentas, metricas)
+    df["fecha"] = pd.to_datetime(df["fecha"], errors="coerce")
+    df = df[df["fecha"] <= fin_mes]
+    entidades = report_entities(df) if entidades is None else entidades
+    logger.info(f"Generando reportes de {mes} para {len(entidades)} instituciones")
+
+    def _avance(hechos: int, total: int, entidad: str) -> None:
+        logger.info(f"[{hechos}/{total}] {entidad}")
+
+    pdfs, errores = generate_reports(
+        df,
+        entidades,
+        sections=DEFAULT_SECTIONS,
+        max_workers=max_workers,
+        progress_callback=_avance,
+    )
+
+    reportes = {}
+    for entidad, pdf in pdfs.items():
+        nombre_pdf = report_file_name(entidad)
+        nombre_html = nombre_pdf[: -len(".pdf")] + ".html"
+        try:
+            write_atomic(carpeta / nombre_pdf, lambda f: f.write(pdf), encoding=None)
+            write_atomic(
+                carpeta / nombre_html,
+                lambda f: write_reporte_html(
+                    df[df["entidad"] == entidad],
+                    f,
+                    titulo=f"Reporte {entidad} ({mes})",
+                ),
+            )
+        except Exception as e:
+            errores[entidad] = str(e)
+            logger.error(f"No se pudo guardar el reporte de {entidad}: {e}")
+            continue
+        reportes[entidad] = {
+            "pdf": f"{mes}/{nombre_pdf}",
+            "html": f"{mes}/{nombre_html}",
+        }
+
+    entrada = {
+        "generado": datetime.now().isoformat(timespec="seconds"),
+        "secciones": DEFAULT_SECTIONS,
+        "reportes": reportes,
+        "errores": errores,
+    }
+    ruta_manifiesto = cache_dir / MANIFEST_NAME
+    with file_lock(ruta_manifiesto):
+        manifiesto = load_manifest(cache_dir)
+        manifiesto[mes] = entrada
+        write_text_atomic(
+            ruta_manifiesto, json.dumps(manifiesto, ensure_ascii=False, indent=2)
+        )
+
+    logger.info(
+        f"Reportes de {mes}: {len(reportes)} generados, {len(errores)} con error"
+    )
+    return entrada
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Pre-genera los reportes mensuales de CHAMPILYTICS."
+    )
+    parser.add_argument(
+        "--mes", help="Mes a reportar (AAAA-MM); por defecto el anterior"
+    )
+    parser.add_argument(
+        "--entidad",
+        action="append",
+        dest="entidades",
+        help="Institución a incluir (repetible); por defecto todas",
+    )
+    parser.add_argument(
+        "--salida", type=Path, default=REPORT_CACHE_DIR, help="Carpeta de la caché"
+    )
+    parser.add_argument("--workers", type=int, help="Procesos en paralelo")
+    args = parser.parse_args(argv)
+
+    try:
+        entrada = run(args.mes, args.entidades, args.salida, args.workers)
+    except Exception as e:
+        logger.error(f"Falló la generación programada de reportes: {e}")
+        return 1
+    return 1 if entrada["errores"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
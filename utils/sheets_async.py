@@ -0,0 +1,175 @@
+"""
+Transporte asíncrono (asyncio + httpx) para la API REST de Google Sheets v4.
+
+Las lecturas de hojas independientes (cuentas, metricas, config, comentarios)
+se lanzan en paralelo en lugar de una detrás de otra. `fetch_values` es un
+envoltorio síncrono para que las vistas de Streamlit lo llamen sin cambiar
+nada.
+
+Las escrituras siguen yendo por gspread: `guardar_datos` sube las métricas con
+`append_rows_chunked`, que guarda un checkpoint por bloque para reanudar una
+subida interrumpida sin duplicar filas.
+
+Uso:
+    from utils import sheets_async
+
+    if sheets_async.supports(spreadsheet):
+        hojas = sheets_async.fetch_values(spreadsheet, ["cuentas", "metricas"])
+"""
+
+import asyncio
+import threading
+from typing import Callable, Dict, List, Optional, Union
+from urllib.parse import quote
+
+import gspread
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - dependencia opcional
+    httpx = None
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+SHEETS_API_URL = "https://sheets.googleapis.com/v4/spreadsheets"
+DEFAULT_TIMEOUT = 30.0
+
+Rows = List[List[str]]
+TokenProvider = Union[str, Callable[[], str]]
+
+
+# ===========================
+# CLIENTE ASÍNCRONO
+# ===========================
+
+
+class AsyncSheetsClient:
+    """Cliente mínimo de `spreadsheets.values` sobre httpx.AsyncClient."""
+
+    def __init__(
+        self,
+        spreadsheet_id: str,
+        token: TokenProvider,
+        base_url: str = SHEETS_API_URL,
+        timeout: float = DEFAULT_TIMEOUT,
+    ):
+        if httpx is None:
+            raise ImportError("httpx no está instalado (pip install httpx)")
+        self.spreadsheet_id = spreadsheet_id
+        self._token = token
+        self._base = f"{base_url.rstrip('/')}/{quote(spreadsheet_id, safe='')}"
+        self._http = httpx.AsyncClient(timeout=timeout)
+
+    async def __aenter__(self) -> "AsyncSheetsClient":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self._http.aclose()
+
+    def _headers(self) -> Dict[str, str]:
+        token = self._token() if callable(self._token) else self._token
+        return {"Authorization": f"Bearer {token}"}
+
+    async def get_values(self, hoja: str) -> Rows:
+        """Equivalente a `worksheet.get_values()`: matriz rectangular de strings."""
+        resp = await self._http.get(
+            f"{self._base}/values/{quote(hoja, safe='')}", headers=self._headers()
+        )
+        resp.raise_for_status()
+        filas = resp.json().get("values", [])
+        # La API omite las celdas vacías al final de cada fila
+        ancho = max((len(f) for f in filas), default=0)
+        return [list(f) + [""] * (ancho - len(f)) for f in filas]
+
+    async def batch_get_values(
+        self, hojas: List[str]
+    ) -> Dict[str, Union[Rows, Exception]]:
+        """
+        Lee varias hojas en paralelo.
+
+        Un fallo en una hoja no cancela las demás: su entrada contiene la
+        excepción, igual que si se hubiera leído de forma secuencial.
+        """
+        resultados = await asyncio.gather(
+            *(self.get_values(h) for h in hojas), return_exceptions=True
+        )
+        return dict(zip(hojas, resultados))
+
+
+# ===========================
+# ENVOLTORIOS SÍNCRONOS
+# ===========================
+
+
+def _run(coro):
+    """Ejecuta una corrutina desde código síncrono (script de Streamlit)."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+
+    # Ya hay un loop en este hilo: ejecutar en un hilo auxiliar
+    resultado = {}
+
+    def target():
+        try:
+            resultado["ok"] = asyncio.run(coro)
+        except BaseException as e:
+            resultado["error"] = e
+
+    hilo = threading.Thread(target=target)
+    hilo.start()
+    hilo.join()
+    if "error" in resultado:
+        raise resultado["error"]
+    return resultado["ok"]
+
+
+def _credentials(spreadsheet):
+    """Credenciales de google-auth del cliente gspread (v5 y v6)."""
+    client = spreadsheet.client
+    http_client = getattr(client, "http_client", None)
+    return getattr(http_client, "auth", None) or getattr(client, "auth", None)
+
+
+def _current_token(spreadsheet) -> str:
+    """Token OAuth vigente del cliente gspread, refrescándolo si expiró."""
+    creds = _credentials(spreadsheet)
+    if not creds.valid:
+        from google.auth.transport.requests import Request
+
+        creds.refresh(Request())
+    return creds.token
+
+
+def supports(spreadsheet) -> bool:
+    """True si se puede usar el transporte asíncrono con este spreadsheet."""
+    return (
+        httpx is not None
+        and isinstance(spreadsheet, gspread.Spreadsheet)
+        and _credentials(spreadsheet) is not None
+    )
+
+
+def client_for(
+    spreadsheet, base_url: str = SHEETS_API_URL, token: Optional[TokenProvider] = None
+) -> AsyncSheetsClient:
+    """Crea un `AsyncSheetsClient` para un spreadsheet abierto con gspread."""
+    if token is None:
+        # Refrescar aquí (síncrono, usa requests) y no dentro del loop
+        token = _current_token(spreadsheet)
+    return AsyncSheetsClient(spreadsheet.id, token=token, base_url=base_url)
+
+
+def fetch_values(
+    spreadsheet, hojas: List[str], **kwargs
+) -> Dict[str, Union[Rows, Exception]]:
+    """Lee varias hojas en paralelo desde código síncrono."""
+
+    async def main():
+        async with client_for(spreadsheet, **kwargs) as client:
+            return await client.batch_get_values(hojas)
+
+    return _run(main())
@@ -0,0 +1,66 @@
+"""
+Backend de Google Sheets de la capa de datos.
+
+Reúne lo que depende de las librerías de Google (gspread, google-auth y el
+transporte paralelo de `utils.sheets_async`). `utils.data_manager` lo carga
+bajo demanda desde su registro de backends (`get_backend("sheets")`), así que
+el modo local (CSV), los procesos sin credenciales y las pruebas arrancan sin
+importar estas librerías.
+
+Uso:
+    from utils.data_manager import get_backend
+
+    sheets = get_backend("sheets")
+    spreadsheet = sheets.connect(st.secrets["gcp_service_account"])
+"""
+
+from typing import Dict, List
+
+import gspread
+from google.oauth2.service_account import Credentials
+
+from utils import sheets_async
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+SCOPES = [
+    "https://www.googleapis.com/auth/spreadsheets",
+    "https://www.googleapis.com/auth/drive",
+]
+SPREADSHEET_NAME = "BaseDatosMatriz"
+
+Spreadsheet = gspread.Spreadsheet
+WorksheetNotFound = gspread.exceptions.WorksheetNotFound
+
+
+def connect(
+    service_account_info, nombre: str = SPREADSHEET_NAME
+) -> gspread.Spreadsheet:
+    """Abre el spreadsheet `nombre` con una cuenta de servicio."""
+    creds = Credentials.from_service_account_info(service_account_info, scopes=SCOPES)
+    client = gspread.authorize(creds)
+    return client.open(nombre)
+
+
+def read_values(spreadsheet, nombres: List[str]) -> Dict[str, object]:
+    """
+    Lee varias hojas como matrices de `get_values`.
+
+    Con credenciales reales las peticiones salen en paralelo (utils.sheets_async);
+    si no, o si el transporte asíncrono falla, se leen una detrás de otra. Una
+    hoja que falla deja su excepción en el resultado en lugar de los valores.
+    """
+    if sheets_async.supports(spreadsheet):
+        try:
+            return sheets_async.fetch_values(spreadsheet, nombres)
+        except Exception as e:
+            logger.warning(f"Lectura paralela no disponible, secuencial: {e}")
+
+    resultado = {}
+    for nombre in nombres:
+        try:
+            resultado[nombre] = spreadsheet.worksheet(nombre).get_values()
+        except Exception as e:
+            resultado[nombre] = e
+    return resultado
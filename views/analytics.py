@@ -6,9 +6,155 @@ Incluye análisis individual y resumen mensual con deltas.
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-from utils import load_data
 from utils.analytics import calculate_growth_metrics
-from components import COLOR_MAP
+from utils.decimation import decimate_frame
+from utils.figure_cache import cached_figure
+from components import COLOR_MAP, paginated_dataframe
+from views.dashboard import TODAS, load_dashboard_data
+
+
+# ===========================
+# FIGURAS
+# ===========================
+
+
+def _volume_figure(resumen: pd.DataFrame):
+    """Seguidores e interacciones totales por mes."""
+    fig_vol = px.line(
+        resumen,
+        x="Mes",
+        y=["Seguidores", "Interacciones"],
+        markers=True,
+        title="Tendencia de Volumen",
+    )
+    fig_vol.update_layout(
+        template="plotly_white",
+        margin=dict(t=40, b=10, l=0, r=0),
+        hovermode="x unified",
+        legend=dict(orientation="h", y=1.1),
+    )
+    return fig_vol
+
+
+def _quality_figure(resumen: pd.DataFrame):
+    """Engagement rate mensual de la red."""
+    fig_qual = px.line(
+        resumen,
+        x="Mes",
+        y=["Engagement"],
+        markers=True,
+        title="Tendencia de Engagement Rate",
+        color_discrete_sequence=["#FF5733"],
+    )
+    fig_qual.update_layout(
+        template="plotly_white",
+        margin=dict(t=40, b=10, l=0, r=0),
+        hovermode="x unified",
+        legend=dict(orientation="h", y=1.1),
+        yaxis=dict(ticksuffix="%"),
+    )
+    return fig_qual
+
+
+def _followers_figure(df: pd.DataFrame, df_e: pd.DataFrame):
+    """Seguidores de la institución por plataforma vs promedio de red."""
+    # Calcular promedio de red por fecha y plataforma
+    df_network_avg = (
+        df.groupby(["fecha", "plataforma"])
+        .agg(
+            {"seguidores": lambda x: x.groupby(df.loc[x.index, "entidad"]).max().mean()}
+        )
+        .reset_index()
+    )
+    df_network_avg["tipo"] = "Promedio Red"
+
+    # Un punto por píxel como máximo en cada traza (los picos se conservan)
+    df_network_avg = decimate_frame(
+        df_network_avg, "fecha", "seguidores", group="plataforma"
+    )
+    fig_a = px.line(
+        decimate_frame(df_e, "fecha", "seguidores", group="plataforma"),
+        x="fecha",
+        y="seguidores",
+        color="plataforma",
+        color_discrete_map=COLOR_MAP,
+        markers=True,
+        title="Crecimiento de Audiencia (vs Promedio de Red)",
+        hover_data={"fecha": True, "plataforma": True, "seguidores": ":,.0f"},
+    )
+
+    # Añadir líneas de promedio de red
+    for plat in df_network_avg["plataforma"].unique():
+        df_plat_avg = df_network_avg[df_network_avg["plataforma"] == plat]
+        fig_a.add_scatter(
+            x=df_plat_avg["fecha"],
+            y=df_plat_avg["seguidores"],
+            mode="lines",
+            line=dict(dash="dash", color=COLOR_MAP.get(plat, "#999999"), width=2),
+            name=f"{plat} (Promedio)",
+            hovertemplate="<b>Promedio Red</b><br>%{y:,.0f}<extra></extra>",
+            showlegend=True,
+        )
+
+    fig_a.update_layout(
+        template="plotly_white",
+        margin=dict(t=40, b=60, l=0, r=0),
+        xaxis=dict(title=None),
+        legend=dict(orientation="h", y=-0.2),
+        hovermode="x unified",
+    )
+    return fig_a
+
+
+def _engagement_figure(df: pd.DataFrame, df_e: pd.DataFrame):
+    """Engagement de la institución por plataforma vs promedio de red."""
+    # Calcular promem dio de engagement de red por fecha y plataforma
+    df_network_er = (
+        df.groupby(["fecha", "plataforma"])["engagement_rate"].mean().reset_index()
+    )
+    df_network_er["tipo"] = "Promedio Red"
+
+    df_network_er = decimate_frame(
+        df_network_er, "fecha", "engagement_rate", group="plataforma"
+    )
+    fig_b = px.line(
+        decimate_frame(df_e, "fecha", "engagement_rate", group="plataforma"),
+        x="fecha",
+        y="engagement_rate",
+        color="plataforma",
+        color_discrete_map=COLOR_MAP,
+        markers=True,
+        title="Evolución de Engagement Rate (vs Promedio de Red)",
+        hover_data={"fecha": True, "plataforma": True, "engagement_rate": ":.2f"},
+    )
+
+    # Añadir líneas de promedio de red
+    for plat in df_network_er["plataforma"].unique():
+        df_plat_er = df_network_er[df_network_er["plataforma"] == plat]
+        fig_b.add_scatter(
+            x=df_plat_er["fecha"],
+            y=df_plat_er["engagement_rate"],
+            mode="lines",
+            line=dict(dash="dash", color=COLOR_MAP.get(plat, "#999999"), width=2),
+            name=f"{plat} (Promedio)",
+            hovertemplate="<b>Promedio Red</b><br>%{y:.2f}%<extra></extra>",
+            showlegend=True,
+        )
+
+    fig_b.update_layout(
+        template="plotly_white",
+        margin=dict(t=40, b=60, l=0, r=0),
+        xaxis=dict(title=None),
+        yaxis=dict(ticksuffix="%"),
+        legend=dict(orientation="h", y=-0.2),
+        hovermode="x unified",
+    )
+    return fig_b
+
+
+# ===========================
+# VISTA
+# ===========================
 
 
 def render():
@@ -31,7 +177,10 @@ def render():
         unsafe_allow_html=True,
     )
 
-    cuentas, metricas = load_data()
+    # Carga cacheada compartida con el Tablero: trae las métricas ya fusionadas
+    # con sus cuentas y la huella de los datos, sin recalcularla en cada rerun
+    data = load_dashboard_data(TODAS)
+    cuentas, metricas, df = data.cuentas, data.metricas, data.df
 
     if cuentas.empty or metricas.empty:
         st.warning(
@@ -39,22 +188,13 @@ def render():
         )
         return
 
-    df = pd.merge(metricas, cuentas, on="id_cuenta", how="left")
-    # Si existe 'entidad_x', renombrar a 'entidad'
-    if "entidad_x" in df.columns:
-        df = df.rename(columns={"entidad_x": "entidad"})
-    elif "entidad_y" in df.columns:
-        df = df.rename(columns={"entidad_y": "entidad"})
-    # Si existe 'plataforma_x', renombrar a 'plataforma'
-    if "plataforma_x" in df.columns:
-        df = df.rename(columns={"plataforma_x": "plataforma"})
-    elif "plataforma_y" in df.columns:
-        df = df.rename(columns={"plataforma_y": "plataforma"})
-
     if "entidad" not in df.columns or df["entidad"].isna().all():
         st.error("❌ Error en la estructura de datos.")
         return
 
+    # Huella de los datos: las figuras se reutilizan mientras no cambien
+    version = data.version
+
     # --- SECCIÓN GLOBAL ---
     resumen = calculate_growth_metrics(metricas)
 
@@ -66,35 +206,13 @@ def render():
             ["Volumen (Seguidores/Interacciones)", "Calidad (Engagement)"]
         )
         with tab_vol:
-            fig_vol = px.line(
-                resumen,
-                x="Mes",
-                y=["Seguidores", "Interacciones"],
-                markers=True,
-                title="Tendencia de Volumen",
-            )
-            fig_vol.update_layout(
-                template="plotly_white",
-                margin=dict(t=40, b=10, l=0, r=0),
-                hovermode="x unified",
-                legend=dict(orientation="h", y=1.1),
+            fig_vol = cached_figure(
+                "analytics_volumen", version, lambda: _volume_figure(resumen)
             )
             st.plotly_chart(fig_vol, config={"displayModeBar": False})
         with tab_qual:
-            fig_qual = px.line(
-                resumen,
-                x="Mes",
-                y=["Engagement"],
-                markers=True,
-                title="Tendencia de Engagement Rate",
-                color_discrete_sequence=["#FF5733"],
-            )
-            fig_qual.update_layout(
-                template="plotly_white",
-                margin=dict(t=40, b=10, l=0, r=0),
-                hovermode="x unified",
-                legend=dict(orientation="h", y=1.1),
-                yaxis=dict(ticksuffix="%"),
+            fig_qual = cached_figure(
+                "analytics_calidad", version, lambda: _quality_figure(resumen)
             )
             st.plotly_chart(fig_qual, config={"displayModeBar": False})
         # Tabla resumen después de las gráficas
@@ -190,91 +308,20 @@ def render():
     tab_a, tab_b = st.tabs(["Evolución de Seguidores", "Evolución de Engagement"])
 
     with tab_a:
-        # Calcular promedio de red por fecha y plataforma
-        df_network_avg = (
-            df.groupby(["fecha", "plataforma"])
-            .agg(
-                {
-                    "seguidores": lambda x: x.groupby(df.loc[x.index, "entidad"])
-                    .max()
-                    .mean()
-                }
-            )
-            .reset_index()
-        )
-        df_network_avg["tipo"] = "Promedio Red"
-
-        fig_a = px.line(
-            df_e,
-            x="fecha",
-            y="seguidores",
-            color="plataforma",
-            color_discrete_map=COLOR_MAP,
-            markers=True,
-            title="Crecimiento de Audiencia (vs Promedio de Red)",
-            hover_data={"fecha": True, "plataforma": True, "seguidores": ":,.0f"},
-        )
-
-        # Añadir líneas de promedio de red
-        for plat in df_network_avg["plataforma"].unique():
-            df_plat_avg = df_network_avg[df_network_avg["plataforma"] == plat]
-            fig_a.add_scatter(
-                x=df_plat_avg["fecha"],
-                y=df_plat_avg["seguidores"],
-                mode="lines",
-                line=dict(dash="dash", color=COLOR_MAP.get(plat, "#999999"), width=2),
-                name=f"{plat} (Promedio)",
-                hovertemplate="<b>Promedio Red</b><br>%{y:,.0f}<extra></extra>",
-                showlegend=True,
-            )
-
-        fig_a.update_layout(
-            template="plotly_white",
-            margin=dict(t=40, b=60, l=0, r=0),
-            xaxis=dict(title=None),
-            legend=dict(orientation="h", y=-0.2),
-            hovermode="x unified",
+        fig_a = cached_figure(
+            "analytics_seguidores",
+            version,
+            lambda: _followers_figure(df, df_e),
+            entidad=entidad,
         )
         st.plotly_chart(fig_a, config={"displayModeBar": False})
 
     with tab_b:
-        # Calcular promem dio de engagement de red por fecha y plataforma
-        df_network_er = (
-            df.groupby(["fecha", "plataforma"])["engagement_rate"].mean().reset_index()
-        )
-        df_network_er["tipo"] = "Promedio Red"
-
-        fig_b = px.line(
-            df_e,
-            x="fecha",
-            y="engagement_rate",
-            color="plataforma",
-            color_discrete_map=COLOR_MAP,
-            markers=True,
-            title="Evolución de Engagement Rate (vs Promedio de Red)",
-            hover_data={"fecha": True, "plataforma": True, "engagement_rate": ":.2f"},
-        )
-
-        # Añadir líneas de promedio de red
-        for plat in df_network_er["plataforma"].unique():
-            df_plat_er = df_network_er[df_network_er["plataforma"] == plat]
-            fig_b.add_scatter(
-                x=df_plat_er["fecha"],
-                y=df_plat_er["engagement_rate"],
-                mode="lines",
-                line=dict(dash="dash", color=COLOR_MAP.get(plat, "#999999"), width=2),
-                name=f"{plat} (Promedio)",
-                hovertemplate="<b>Promedio Red</b><br>%{y:.2f}%<extra></extra>",
-                showlegend=True,
-            )
-
-        fig_b.update_layout(
-            template="plotly_white",
-            margin=dict(t=40, b=60, l=0, r=0),
-            xaxis=dict(title=None),
-            yaxis=dict(ticksuffix="%"),
-            legend=dict(orientation="h", y=-0.2),
-            hovermode="x unified",
+        fig_b = cached_figure(
+            "analytics_engagement",
+            version,
+            lambda: _engagement_figure(df, df_e),
+            entidad=entidad,
         )
         st.plotly_chart(fig_b, config={"displayModeBar": False})
 
@@ -288,11 +335,14 @@ def render():
             "interacciones",
             "engagement_rate",
         ]
-    ].copy()
-    df_display["fecha"] = df_display["fecha"].dt.strftime("%Y-%m-%d")
-    # Eliminado width='stretch'
-    st.dataframe(
-        df_display.sort_values("fecha", ascending=False),
-        use_container_width=True,
+    ]
+    # Se ordena y recorta en el servidor; solo se envía la página visible
+    paginated_dataframe(
+        df_display,
+        key="analytics_detalle",
+        version=f"{version}:{entidad}",
+        sort_by="fecha",
+        ascending=False,
         hide_index=True,
+        column_config={"fecha": st.column_config.DateColumn(format="YYYY-MM-DD")},
     )
@@ -5,7 +5,10 @@ Muestra el changelog completo con filtros y búsqueda, más el roadmap de desarr
 
 import streamlit as st
 from pathlib import Path
-import re
+
+from utils.project_docs import load_changelog, load_roadmap
+
+DOCS_DIR = Path(__file__).parent.parent
 
 
 def render():
@@ -35,8 +38,8 @@ def render_changelog():
     """Renderiza solo el changelog."""
     st.markdown("### 📜 Registro de Cambios")
 
-    # Leer el archivo CHANGELOG.md
-    changelog_path = Path(__file__).parent.parent / "CHANGELOG.md"
+    # Leer el archivo CHANGELOG.md (parseado y cacheado por fecha de modificación)
+    changelog_path = DOCS_DIR / "CHANGELOG.md"
 
     if not changelog_path.exists():
         st.error("❌ No se encontró el archivo CHANGELOG.md")
@@ -44,17 +47,13 @@ def render_changelog():
         return
 
     try:
-        with open(changelog_path, "r", encoding="utf-8") as f:
-            changelog_content = f.read()
+        doc = load_changelog(changelog_path)
     except Exception as e:
         st.error(f"❌ Error al leer el changelog: {e}")
         return
 
-    # Extraer versiones para el filtro
-    import re
-
-    version_pattern = r"## \[(\d+\.\d+\.\d+)\]"
-    versions = re.findall(version_pattern, changelog_content)
+    changelog_content = doc.content
+    versions = doc.versions
 
     # Controles de filtrado
     st.markdown("---")
@@ -71,6 +70,11 @@ def render_changelog():
         search_term = st.text_input(
             "Buscar en el historial",
             placeholder="Ej: benchmarking, KPI, gráfica...",
+            help=(
+                "Busca entradas con todas las palabras (o su inicio), sin "
+                "distinguir acentos; si no hay coincidencias, busca los "
+                "fragmentos dentro del texto."
+            ),
             key="search_term",
         )
 
@@ -82,34 +86,22 @@ def render_changelog():
 
     # Procesar y mostrar contenido
     if search_term:
-        # Filtrar por término de búsqueda
-        lines = changelog_content.split("\n")
-        filtered_lines = []
-        in_relevant_section = False
-
-        for line in lines:
-            if search_term.lower() in line.lower():
-                in_relevant_section = True
-                filtered_lines.append(line)
-            elif line.startswith("##") and in_relevant_section:
-                in_relevant_section = False
-                filtered_lines.append(line)
-            elif in_relevant_section:
-                filtered_lines.append(line)
-
-        content_to_show = "\n".join(filtered_lines)
-
-        if not filtered_lines:
+        # Filtrar por término de búsqueda (índice invertido de palabras)
+        resultados = doc.search(search_term, incluir_roadmap=show_roadmap)
+
+        if resultados:
+            st.caption(f"🔍 {len(resultados)} entradas coinciden con '{search_term}'")
+            content_to_show = doc.to_markdown(resultados)
+        else:
             st.warning(f"🔍 No se encontraron resultados para '{search_term}'")
             content_to_show = changelog_content
 
     elif filter_version != "Todas las versiones":
         # Filtrar por versión específica
-        pattern = f"## \\[{re.escape(filter_version)}\\].*?(?=## \\[|$)"
-        match = re.search(pattern, changelog_content, re.DOTALL)
+        bloque = doc.version_blocks.get(filter_version)
 
-        if match:
-            content_to_show = f"# 📝 Historial de Cambios\n\n{match.group()}"
+        if bloque:
+            content_to_show = f"# 📝 Historial de Cambios\n\n{bloque}"
         else:
             st.warning(f"⚠️ No se encontró la versión {filter_version}")
             content_to_show = changelog_content
@@ -119,9 +111,7 @@ def render_changelog():
 
     # Ocultar roadmap si está desactivado
     if not show_roadmap:
-        roadmap_index = content_to_show.find("## Roadmap")
-        if roadmap_index != -1:
-            content_to_show = content_to_show[:roadmap_index]
+        content_to_show = doc.without_roadmap(content_to_show)
 
     # Renderizar contenido
     st.markdown(content_to_show, unsafe_allow_html=False)
@@ -138,12 +128,10 @@ def render_changelog():
 
     with col_b:
         # Contar tipos de cambios
-        features_count = changelog_content.count("✨ Agregado")
-        st.metric("Nuevas Funcionalidades", features_count)
+        st.metric("Nuevas Funcionalidades", doc.features_count)
 
     with col_c:
-        fixes_count = changelog_content.count("🐛 Corregido")
-        st.metric("Correcciones de Bugs", fixes_count)
+        st.metric("Correcciones de Bugs", doc.fixes_count)
 
     # Sección de descarga
     st.markdown("---")
@@ -161,11 +149,10 @@ def render_changelog():
         )
 
     with col_download_2:
-        # Convertir a texto plano sin markdown
-        plain_text = re.sub(r"[#*`\[\]]", "", changelog_content)
+        # Texto plano sin markdown
         st.download_button(
             label="📝 Descargar como Texto Plano (TXT)",
-            data=plain_text,
+            data=doc.plain_text,
             file_name="CHAMPILYTICS_Changelog.txt",
             mime="text/plain",
             use_container_width=True,
@@ -173,7 +160,8 @@ def render_changelog():
 
     # Footer informativo
     st.markdown("---")
-    st.info("""
+    st.info(
+        """
     **ℹ️ Sobre el Versionado Semántico**
     
     Este proyecto sigue el estándar [Semantic Versioning 2.0.0](https://semver.org/lang/es/):
@@ -181,15 +169,16 @@ def render_changelog():
     - **MAJOR** (X.0.0): Cambios incompatibles en la API
     - **MINOR** (x.Y.0): Nueva funcionalidad compatible hacia atrás
     - **PATCH** (x.y.Z): Correcciones de bugs compatibles
-    """)
+    """
+    )
 
 
 def render_roadmap():
     """Renderiza el roadmap de desarrollo con cálculo automático de progreso."""
     st.markdown("### 🗺️ Hoja de Ruta del Proyecto")
 
-    # Leer el archivo ROADMAP.md
-    roadmap_path = Path(__file__).parent.parent / "ROADMAP.md"
+    # Leer el archivo ROADMAP.md (parseado y cacheado por fecha de modificación)
+    roadmap_path = DOCS_DIR / "ROADMAP.md"
 
     if not roadmap_path.exists():
         st.error("❌ No se encontró el archivo ROADMAP.md")
@@ -197,18 +186,16 @@ def render_roadmap():
         return
 
     try:
-        with open(roadmap_path, "r", encoding="utf-8") as f:
-            roadmap_content = f.read()
+        roadmap = load_roadmap(roadmap_path)
     except Exception as e:
         st.error(f"❌ Error al leer el roadmap: {e}")
         return
 
-    # Calcular progreso global automáticamente
-    total_tasks = roadmap_content.count("- [")
-    completed_tasks = roadmap_content.count("- [x]")
-    progress_percentage = (
-        (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
-    )
+    # Progreso global calculado al parsear
+    roadmap_content = roadmap.content
+    total_tasks = roadmap.total_tasks
+    completed_tasks = roadmap.completed_tasks
+    progress_percentage = roadmap.progress
 
     # Header con métricas globales
     st.markdown("---")
@@ -231,47 +218,26 @@ def render_roadmap():
 
     st.markdown("---")
 
-    # Extraer sprints y calcular progreso individual
-    sprint_pattern = r"## (.+?Sprint \d+:.+?)\n\*\*Status\*\*: (.+?)\n.*?(?=##|$)"
-    sprints = re.findall(sprint_pattern, roadmap_content, re.DOTALL)
-
     # Mostrar resumen de sprints con lógica de colores
     st.markdown("### 📊 Estado de los Sprints")
 
-    for sprint_full_text in re.finditer(
-        r"## (.+?Sprint \d+:.+?)\n\*\*Status\*\*: (.+?) \*\*(.+?)\*\*.*?\n(.*?)(?=##|---|\Z)",
-        roadmap_content,
-        re.DOTALL,
-    ):
-        sprint_title = sprint_full_text.group(1).strip()
-        status_emoji = sprint_full_text.group(2).strip()
-        status_text = sprint_full_text.group(3).strip()
-        sprint_content = sprint_full_text.group(4)
-
-        # Calcular progreso del sprint
-        sprint_total = sprint_content.count("- [")
-        sprint_completed = sprint_content.count("- [x]")
-        sprint_progress = (
-            (sprint_completed / sprint_total * 100) if sprint_total > 0 else 0
-        )
-
-        # Ordenar tareas por estado (rojo, amarillo, verde)
-        tasks = re.findall(
-            r"- \[([ x])\] \*\*(.+?)\*\*:(.+?)(?=\n-|\n\n|$)", sprint_content, re.DOTALL
-        )
-        sorted_tasks = sorted(tasks, key=lambda t: (t[0] == " ", t[0] == "x"))
+    for sprint in roadmap.sprints:
+        status_emoji = sprint.emoji
+        sprint_progress = sprint.progreso
 
         # Expandible por sprint
         with st.expander(
-            f"{status_emoji} {sprint_title} — {sprint_progress:.0f}%",
+            f"{status_emoji} {sprint.titulo} — {sprint_progress:.0f}%",
             expanded=(status_emoji == "🟡"),
         ):
             # Barra de progreso del sprint
             st.progress(sprint_progress / 100)
-            st.caption(f"**{status_text}** • {sprint_completed}/{sprint_total} tareas")
+            st.caption(
+                f"**{sprint.estado}** • {sprint.completadas}/{sprint.total} tareas"
+            )
 
             # Mostrar tareas del sprint con colores
-            for checked, task_name, task_desc in sorted_tasks:
+            for checked, task_name, task_desc in sprint.tareas:
                 is_done = checked == "x"
                 checkbox_emoji = "✅" if is_done else ("🟡" if checked == " " else "🔴")
                 st.markdown(
@@ -283,11 +249,8 @@ def render_roadmap():
     # Sección de prioridades actuales
     st.markdown("### 🎯 Prioridades Actuales")
 
-    priority_section = re.search(
-        r"## 🎯 Prioridades Actuales.*?\n(.*?)(?=##|---|\Z)", roadmap_content, re.DOTALL
-    )
-    if priority_section:
-        st.markdown(priority_section.group(1))
+    if roadmap.priorities:
+        st.markdown(roadmap.priorities)
 
     st.markdown("---")
 
@@ -309,7 +272,8 @@ def render_roadmap():
 
     # Footer informativo
     st.markdown("---")
-    st.info("""
+    st.info(
+        """
     **ℹ️ Sobre la Metodología Ágil**
 
     Este proyecto sigue sprints de 2 semanas con objetivos claros y entregas incrementales.
@@ -319,4 +283,5 @@ def render_roadmap():
     - **Retrospectiva**: Al final de cada sprint se evalúa qué mejorar
 
     El progreso se actualiza automáticamente al marcar tareas como completadas en `ROADMAP.md`.
-    """)
+    """
+    )
@@ -6,7 +6,9 @@ Panel principal con métricas agregadas de toda la red.
 import streamlit as st
 import pandas as pd
 import plotly.express as px
+import plotly.graph_objects as go
 import logging
+from typing import NamedTuple, Optional
 from utils import (
     load_data,
     simular,
@@ -16,29 +18,42 @@ from utils import (
     COLEGIOS_MARISTAS,
 )
 from utils.data_manager import load_configs
-from components import COLOR_MAP
-from utils.analytics import calculate_growth_metrics
+from components import COLOR_MAP, fragment, paginated_dataframe
+from utils.analytics import (
+    calculate_box_stats,
+    calculate_growth_metrics,
+    latest_followers_by,
+)
+from utils.figure_cache import cached_figure, data_version
 
 
-def render():
-    st.title("Tablero Principal")
+TODAS = "Todas las Instituciones"
 
-    # 0. Leer filtro global de institución
-    selected_institution = st.session_state.get(
-        "global_institution_filter", "Todas las Instituciones"
-    )
+OPCIONES_GRAFICAS = {
+    "Torta de Seguidores": "torta",
+    "Línea de Crecimiento": "linea",
+    "Barras de Interacciones": "barras",
+    "Área de Engagement": "area",
+    "Comparativa Histórica": "historico",
+}
 
-    # 1. CARGA DE DATOS
-    cuentas, metricas = load_data()
 
-    # Validación de carga básica
-    if cuentas.empty or metricas.empty:
-        st.info("👋 ¡Bienvenido! Aún no hay datos cargados para analizar.")
-        st.markdown("Ve a la pestaña **Carga de Datos** para subir tu primer reporte.")
-        st.stop()
+class DashboardData(NamedTuple):
+    """Datos enriquecidos del tablero, compartidos por todos sus fragmentos."""
 
-    # 2. FUSIÓN DE DATOS (EL PASO QUE FALTABA) 🔗
-    # Unimos métricas con cuentas para obtener la columna 'entidad'
+    cuentas: pd.DataFrame
+    metricas: pd.DataFrame
+    df: pd.DataFrame  # Métricas fusionadas con sus cuentas (y filtradas)
+    meses: Optional[pd.Series]  # Mes 'YYYY-MM' de cada fila de `df`
+    mensual: Optional[pd.DataFrame]  # Resumen por mes
+    seguidores_actuales: pd.DataFrame  # [entidad, seguidores] del último registro
+    sin_datos: bool  # No hay cuentas o métricas cargadas (antes de filtrar)
+    institucion: str  # Filtro aplicado
+    version: str  # Huella de los datos y el filtro (figuras y tablas)
+
+
+def _merge_accounts(metricas: pd.DataFrame, cuentas: pd.DataFrame) -> pd.DataFrame:
+    """Une métricas con cuentas para obtener 'entidad' y 'plataforma'."""
     df = pd.merge(metricas, cuentas, on="id_cuenta", how="left")
     # Si existe 'entidad_x', renombrar a 'entidad'
     if "entidad_x" in df.columns:
@@ -50,145 +65,236 @@ def render():
         df = df.rename(columns={"plataforma_x": "plataforma"})
     elif "plataforma_y" in df.columns:
         df = df.rename(columns={"plataforma_y": "plataforma"})
+    return df
 
-    # 2.5 Filtrado por institución si aplica
-    if selected_institution != "Todas las Instituciones":
-        df = df[df["entidad"] == selected_institution]
-        cuentas = cuentas[cuentas["entidad"] == selected_institution]
-        st.info(f"🔒 Vista filtrada para: {selected_institution}")
-        if df.empty:
-            st.warning(
-                f"No hay datos para la institución seleccionada: {selected_institution}"
-            )
-            st.stop()
 
-    # 3. VALIDACIÓN DE INTEGRIDAD (Ahora sí pasará) ✅
-    required_cols = ["fecha", "entidad", "engagement_rate"]
-    missing = [c for c in required_cols if c not in df.columns]
+def build_dashboard_data(
+    cuentas: pd.DataFrame, metricas: pd.DataFrame, institucion: str = TODAS
+) -> DashboardData:
+    """
+    Fusiona, filtra por institución y precalcula los meses y el resumen
+    mensual que usan las gráficas y las tablas.
+    """
+    sin_datos = cuentas.empty or metricas.empty
+    # Todo lo demás se deriva de estas entradas: su huella identifica el conjunto
+    version = f"{data_version(cuentas, metricas)}:{institucion}"
+    df = _merge_accounts(metricas, cuentas)
+    if institucion != TODAS:
+        df = df[df["entidad"] == institucion]
+        cuentas = cuentas[cuentas["entidad"] == institucion]
 
-    if missing:
-        st.error(
-            f"⚠️ Error de Datos: Faltan columnas críticas en el archivo fusionado: {missing}"
+    meses = mensual = None
+    if "fecha" in df.columns:
+        meses = pd.to_datetime(df["fecha"]).dt.to_period("M").astype(str)
+        columnas = {
+            "seguidores": "sum",
+            "interacciones": "sum",
+            "engagement_rate": "mean",
+        }
+        columnas = {c: f for c, f in columnas.items() if c in df.columns}
+        mensual = df.groupby(meses.rename("Mes")).agg(columnas).reset_index()
+    seguidores_actuales = (
+        latest_followers_by(df, "entidad")
+        if {"id_cuenta", "fecha", "entidad", "seguidores"} <= set(df.columns)
+        else pd.DataFrame(columns=["entidad", "seguidores"])
+    )
+    return DashboardData(
+        cuentas,
+        metricas,
+        df,
+        meses,
+        mensual,
+        seguidores_actuales,
+        sin_datos,
+        institucion,
+        version,
+    )
+
+
+@st.cache_data(ttl=600)
+def load_dashboard_data(institucion: str) -> DashboardData:
+    """
+    Carga y enriquece los datos una vez; los reruns completos del tablero
+    (p. ej. al volver a la vista) reutilizan el resultado hasta que una
+    escritura limpia la caché.
+    """
+    cuentas, metricas = load_data()
+    return build_dashboard_data(cuentas, metricas, institucion)
+
+
+# ===========================
+# FRAGMENTOS
+# ===========================
+
+
+@fragment
+def kpi_strip(data: DashboardData) -> None:
+    """Resumen ejecutivo con los totales del conjunto filtrado."""
+    st.markdown("### Resumen Ejecutivo")
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Total Seguidores", f"{data.df['seguidores'].sum():,.0f}")
+    col2.metric("Total Interacciones", f"{data.df['interacciones'].sum():,.0f}")
+
+
+def _build_figure(tipo: str, data: DashboardData) -> Optional[go.Figure]:
+    """Figura de la gráfica `tipo`; None si faltan columnas para dibujarla."""
+    df = data.df
+    if tipo == "torta":
+        # Una porción por colegio con sus seguidores actuales
+        fig = px.pie(
+            data.seguidores_actuales,
+            values="seguidores",
+            names="entidad",
+            title="Distribución de Seguidores por Colegio",
         )
-        st.write("Columnas disponibles:", df.columns.tolist())
-        st.stop()
+        return fig
+    elif tipo == "linea":
+        if data.mensual is not None:
+            # Un punto por mes: ya es el resumen, no hace falta decimar
+            fig = px.line(
+                data.mensual,
+                x="Mes",
+                y=["seguidores", "interacciones"],
+                markers=True,
+                title="Crecimiento Mensual",
+            )
+            return fig
+    elif tipo == "barras":
+        if "entidad" in df.columns and "interacciones" in df.columns:
+            resumen = df.groupby("entidad").agg({"interacciones": "sum"}).reset_index()
+            fig = px.bar(
+                resumen,
+                x="entidad",
+                y="interacciones",
+                title="Interacciones por Colegio",
+            )
+            return fig
+    elif tipo == "area":
+        if data.mensual is not None and "engagement_rate" in data.mensual.columns:
+            fig = px.area(
+                data.mensual,
+                x="Mes",
+                y="engagement_rate",
+                title="Engagement Rate Mensual",
+            )
+            return fig
+    elif tipo == "historico":
+        if data.meses is not None and "seguidores" in df.columns:
+            # Cuartiles y bigotes por mes calculados aquí: la figura lleva una
+            # caja por mes en lugar de todas las filas
+            stats = calculate_box_stats(
+                pd.DataFrame({"Mes": data.meses, "seguidores": df["seguidores"]}),
+                by="Mes",
+                value="seguidores",
+            )
+            fig = go.Figure(
+                go.Box(
+                    x=stats["Mes"],
+                    q1=stats["q1"],
+                    median=stats["median"],
+                    q3=stats["q3"],
+                    lowerfence=stats["lowerfence"],
+                    upperfence=stats["upperfence"],
+                    mean=stats["mean"],
+                    name="seguidores",
+                )
+            )
+            fig.update_layout(
+                title="Distribución Histórica de Seguidores",
+                xaxis_title="Mes",
+                yaxis_title="seguidores",
+            )
+            return fig
+    return None
 
-    # --- CONSTRUCTOR DE VISTAS ---
+
+def _render_chart(tipo: str, data: DashboardData) -> None:
+    # Misma versión de datos y filtro: se reutiliza la figura ya construida
+    fig = cached_figure(
+        f"dashboard_{tipo}",
+        data.version,
+        lambda: _build_figure(tipo, data),
+        institucion=data.institucion,
+    )
+    if fig is not None:
+        st.plotly_chart(fig, use_container_width=True)
+
+
+@fragment
+def chart_builder(data: DashboardData) -> None:
+    """Constructor de vistas: cambiar la selección solo re-ejecuta este bloque."""
     st.markdown("### Constructor de Vistas: Elige tus gráficas favoritas")
-    opciones_graficas = {
-        "Torta de Seguidores": "torta",
-        "Línea de Crecimiento": "linea",
-        "Barras de Interacciones": "barras",
-        "Área de Engagement": "area",
-        "Comparativa Histórica": "historico",
-    }
     seleccionadas = st.multiselect(
         "Selecciona hasta 3 gráficas para mostrar:",
-        list(opciones_graficas.keys()),
+        list(OPCIONES_GRAFICAS.keys()),
         default=["Torta de Seguidores"],
         max_selections=3,
     )
-
-    # KPIs rápidos
-    st.markdown("### Resumen Ejecutivo")
-    col1, col2, col3 = st.columns(3)
-    col1.metric("Total Seguidores", f"{df['seguidores'].sum():,.0f}")
-    col2.metric("Total Interacciones", f"{df['interacciones'].sum():,.0f}")
-
-    # Renderizar gráficas seleccionadas
     for graf in seleccionadas:
-        tipo = opciones_graficas[graf]
-        if tipo == "torta":
-            fig = px.pie(
-                df,
-                values="seguidores",
-                names="entidad",
-                title="Distribución de Seguidores por Colegio",
-            )
-            st.plotly_chart(fig, use_container_width=True)
-        elif tipo == "linea":
-            if "fecha" in df.columns:
-                df_mes = df.copy()
-                df_mes["Mes"] = (
-                    pd.to_datetime(df_mes["fecha"]).dt.to_period("M").astype(str)
-                )
-                resumen = (
-                    df_mes.groupby("Mes")
-                    .agg({"seguidores": "sum", "interacciones": "sum"})
-                    .reset_index()
-                )
-                fig = px.line(
-                    resumen,
-                    x="Mes",
-                    y=["seguidores", "interacciones"],
-                    markers=True,
-                    title="Crecimiento Mensual",
-                )
-                st.plotly_chart(fig, use_container_width=True)
-        elif tipo == "barras":
-            if "entidad" in df.columns and "interacciones" in df.columns:
-                resumen = (
-                    df.groupby("entidad").agg({"interacciones": "sum"}).reset_index()
-                )
-                fig = px.bar(
-                    resumen,
-                    x="entidad",
-                    y="interacciones",
-                    title="Interacciones por Colegio",
-                )
-                st.plotly_chart(fig, use_container_width=True)
-        elif tipo == "area":
-            if "fecha" in df.columns and "engagement_rate" in df.columns:
-                df_mes = df.copy()
-                df_mes["Mes"] = (
-                    pd.to_datetime(df_mes["fecha"]).dt.to_period("M").astype(str)
-                )
-                resumen = (
-                    df_mes.groupby("Mes").agg({"engagement_rate": "mean"}).reset_index()
-                )
-                fig = px.area(
-                    resumen,
-                    x="Mes",
-                    y="engagement_rate",
-                    title="Engagement Rate Mensual",
-                )
-                st.plotly_chart(fig, use_container_width=True)
-        elif tipo == "historico":
-            if "fecha" in df.columns and "seguidores" in df.columns:
-                df_hist = df.copy()
-                df_hist["Mes"] = (
-                    pd.to_datetime(df_hist["fecha"]).dt.to_period("M").astype(str)
-                )
-                fig = px.box(
-                    df_hist,
-                    x="Mes",
-                    y="seguidores",
-                    title="Distribución Histórica de Seguidores",
-                )
-                st.plotly_chart(fig, use_container_width=True)
+        _render_chart(OPCIONES_GRAFICAS[graf], data)
+
 
-    # --- Tablas de datos retractiles al final ---
+@fragment
+def data_expanders(data: DashboardData) -> None:
+    """Tablas de datos retráctiles al final del tablero."""
     with st.expander("🔍 Ver datos de cuentas"):
-        st.dataframe(cuentas, use_container_width=True)
+        st.dataframe(data.cuentas, use_container_width=True)
 
     with st.expander("🔍 Ver datos de métricas"):
-        st.dataframe(metricas, use_container_width=True)
-
-    # --- Tabla de resumen mensual retractil ---
-    if "fecha" in df.columns:
-        df_mes = df.copy()
-        df_mes["Mes"] = pd.to_datetime(df_mes["fecha"]).dt.to_period("M").astype(str)
-        resumen_mensual = (
-            df_mes.groupby("Mes")
-            .agg(
-                {"seguidores": "sum", "interacciones": "sum", "engagement_rate": "mean"}
-            )
-            .reset_index()
+        paginated_dataframe(
+            data.metricas, key="dashboard_metricas", version=data.version
         )
 
+    # --- Tabla de resumen mensual retractil ---
+    if data.mensual is not None:
         with st.expander("📊 Resumen Mensual de Datos"):
-            st.dataframe(resumen_mensual, use_container_width=True)
+            st.dataframe(data.mensual, use_container_width=True)
 
     # --- Tabla de datos detallados retractil ---
     with st.expander("📋 Datos Detallados"):
-        st.dataframe(df, use_container_width=True)
+        paginated_dataframe(data.df, key="dashboard_detalle", version=data.version)
+
+
+# ===========================
+# VISTA
+# ===========================
+
+
+def render():
+    st.title("Tablero Principal")
+
+    # 0. Leer filtro global de institución
+    selected_institution = st.session_state.get("global_institution_filter", TODAS)
+
+    # 1. CARGA, FUSIÓN Y FILTRADO (una vez; los fragmentos comparten el resultado)
+    data = load_dashboard_data(selected_institution)
+
+    # Validación de carga básica
+    if data.sin_datos:
+        st.info("👋 ¡Bienvenido! Aún no hay datos cargados para analizar.")
+        st.markdown("Ve a la pestaña **Carga de Datos** para subir tu primer reporte.")
+        st.stop()
+
+    if selected_institution != TODAS:
+        st.info(f"🔒 Vista filtrada para: {selected_institution}")
+        if data.df.empty:
+            st.warning(
+                f"No hay datos para la institución seleccionada: {selected_institution}"
+            )
+            st.stop()
+
+    # 2. VALIDACIÓN DE INTEGRIDAD ✅
+    required_cols = ["fecha", "entidad", "engagement_rate"]
+    missing = [c for c in required_cols if c not in data.df.columns]
+
+    if missing:
+        st.error(
+            f"⚠️ Error de Datos: Faltan columnas críticas en el archivo fusionado: {missing}"
+        )
+        st.write("Columnas disponibles:", data.df.columns.tolist())
+        st.stop()
+
+    # 3. FRAGMENTOS: cada uno se re-ejecuta solo con sus propios widgets
+    kpi_strip(data)
+    chart_builder(data)
+    data_expanders(data)
@@ -4,9 +4,8 @@ Página de inicio con hero banner y navegación rápida.
 """
 
 import streamlit as st
-import pandas as pd
 import logging
-from utils import load_data, simular, save_batch, reset_db
+from utils import simular, save_batch, reset_db, get_total_seguidores
 from utils.helpers import get_banner_css
 
 
@@ -16,36 +15,26 @@ def render():
     """
 
     # Hero Banner Minimalista Full-Screen
-    banner_css = get_banner_css(
-        "banner_landing.jpg"  # Buscará en images/
-    )
+    banner_css = get_banner_css("banner_landing.jpg")  # Buscará en images/
 
     # Si no hay banner local, usar gradiente
     if not banner_css:
         banner_css = "background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);"
 
-    # Calcular total de seguidores actuales
-    cuentas, metricas = load_data()
+    # Total de seguidores actuales (último registro de cada cuenta)
     total_seguidores = 0
-
-    # Verificar si hay datos válidos
     datos_validos = False
-    if not metricas.empty and not cuentas.empty:
-        try:
-            df = pd.merge(metricas, cuentas, on="id_cuenta", how="left")
-            if "entidad" in df.columns and not df["entidad"].isna().all():
-                # Obtener la fecha más reciente
-                ultima_fecha = df["fecha"].max()
-                df_actual = df[df["fecha"] == ultima_fecha]
-                total_seguidores = int(df_actual["seguidores"].sum())
-                datos_validos = True
-                logging.info(f"Landing - Seguidores totales: {total_seguidores:,}")
-        except Exception as e:
-            logging.warning(f"Error calculando seguidores en landing: {e}")
+    try:
+        total_seguidores = get_total_seguidores()
+        if total_seguidores:
+            datos_validos = True
+            logging.info(f"Landing - Seguidores totales: {total_seguidores:,}")
+    except Exception as e:
+        logging.warning(f"Error calculando seguidores en landing: {e}")
 
     # Renderizar hero banner
     st.markdown(
-        f'''
+        f"""
         <div class="hero-banner" style="{banner_css}">
             <div class="hero-content" style="max-width: 900px;">
                 <h1 style="font-size: 7rem; margin-bottom: 30px; letter-spacing: 10px; text-shadow: 2px 2px 20px rgba(0,0,0,0.4); font-weight: 900;">
@@ -62,7 +51,7 @@ def render():
                 </div>
             </div>
         </div>
-    ''',
+    """,
         unsafe_allow_html=True,
     )
 
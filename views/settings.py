@@ -13,8 +13,14 @@ import logging
 import utils.data_manager as dm
 from utils import save_batch, reset_db, COLEGIOS_MARISTAS
 from utils.helpers import simular
-from utils.report_generator import ReportBuilder
-from utils.data_manager import CUENTAS_CSV
+from utils.report_scheduler import find_prebuilt
+from utils.batch_reports import (
+    build_report,
+    generate_all_reports,
+    merge_report_data,
+    report_entities,
+    report_file_name,
+)
 
 
 def render():
@@ -64,8 +70,17 @@ def render():
                     generar_metas=True,
                 )
 
-                # Guardar métricas (batch)
-                save_batch(datos)
+                # Guardar métricas (batch, subida por bloques con progreso)
+                barra = st.progress(0.0, text="⬆️ Subiendo métricas a Google Sheets...")
+
+                def _reportar_avance(enviadas: int, total: int) -> None:
+                    barra.progress(
+                        enviadas / total if total else 1.0,
+                        text=f"⬆️ Subiendo métricas: {enviadas:,}/{total:,} filas",
+                    )
+
+                save_batch(datos, progress_callback=_reportar_avance)
+                barra.empty()
 
                 # Guardar metas individuales
                 for meta in metas:
@@ -122,32 +137,8 @@ def render():
                 "⚠️ No hay métricas registradas aún. Ve a la pestaña 'Gestión de Datos' para generar datos."
             )
         else:
-            # 2. Cruce de Datos (Merge) INTELIGENTE
-            # ---------------------------------------------------------
-            # Paso A: Estandarizar tipos para evitar errores de merge
-            if "id_cuenta" in metricas.columns:
-                metricas["id_cuenta"] = metricas["id_cuenta"].astype(str).str.strip()
-            if "id_cuenta" in cuentas.columns:
-                cuentas["id_cuenta"] = cuentas["id_cuenta"].astype(str).str.strip()
-
-            # Paso B: Evitar duplicidad de columnas (El arreglo del KeyError)
-            # Si métricas ya tiene 'entidad', la borramos para usar la versión oficial de 'cuentas'
-            if "entidad" in metricas.columns:
-                metricas = metricas.drop(columns=["entidad"])
-
-            # Paso C: Realizar la fusión
-            # Usamos left join para mantener todas las métricas y pegarles el nombre de la entidad
-            df_completo = pd.merge(
-                metricas, cuentas[["id_cuenta", "entidad"]], on="id_cuenta", how="left"
-            )
-
-            # Paso D: Rellenar nulos si alguna métrica quedó huérfana
-            if "entidad" in df_completo.columns:
-                df_completo["entidad"] = df_completo["entidad"].fillna("Desconocido")
-            else:
-                # Si por algún milagro sigue fallando, forzamos la creación
-                df_completo["entidad"] = "Desconocido"
-            # ---------------------------------------------------------
+            # 2. Cruce de Datos (Merge) con el nombre oficial de la entidad
+            df_completo = merge_report_data(cuentas, metricas)
 
             # 3. Interfaz de Configuración
             col_conf, col_prev = st.columns([1, 2])
@@ -156,14 +147,7 @@ def render():
                 st.subheader("Configuración")
 
                 # --- FILTRO INTELIGENTE DE NOMBRES ---
-                raw_entidades = sorted(df_completo["entidad"].unique().tolist())
-
-                # Filtrar nombres inválidos o vacíos
-                lista_entidades = [
-                    str(e)
-                    for e in raw_entidades
-                    if e and str(e).lower() != "nan" and str(e) != "Desconocido"
-                ]
+                lista_entidades = report_entities(df_completo)
 
                 if not lista_entidades:
                     st.warning("No se encontraron instituciones con datos.")
@@ -176,6 +160,29 @@ def render():
                 if not entidad_selec:
                     st.stop()
 
+                # Reporte pre-generado (python -m utils.report_scheduler)
+                prearmado = find_prebuilt(entidad_selec)
+                if prearmado:
+                    st.success(
+                        f"📦 Reporte de {prearmado['mes']} listo "
+                        f"(generado {prearmado['generado']})"
+                    )
+                    col_pdf, col_html = st.columns(2)
+                    col_pdf.download_button(
+                        label="⬇️ PDF",
+                        data=prearmado["pdf"].read_bytes(),
+                        file_name=prearmado["pdf"].name,
+                        mime="application/pdf",
+                        use_container_width=True,
+                    )
+                    col_html.download_button(
+                        label="⬇️ HTML",
+                        data=prearmado["html"].read_bytes(),
+                        file_name=prearmado["html"].name,
+                        mime="text/html",
+                        use_container_width=True,
+                    )
+
                 st.markdown("**Secciones a incluir:**")
                 inc_kpis = st.checkbox("Tabla de KPIs", value=True)
                 inc_graf = st.checkbox("Gráficas de Tendencia", value=True)
@@ -184,23 +191,10 @@ def render():
                 # Botón Generar
                 if st.button("Generar PDF", type="primary", use_container_width=True):
                     with st.spinner("🔨 Construyendo reporte..."):
-                        # Filtrar datos por la entidad seleccionada
-                        df_filtrado = df_completo[
-                            df_completo["entidad"] == entidad_selec
-                        ].copy()
-
-                        # Ordenar por fecha
-                        if "fecha" in df_filtrado.columns:
-                            df_filtrado["fecha"] = pd.to_datetime(df_filtrado["fecha"])
-                            df_filtrado = df_filtrado.sort_values("fecha")
-
                         # Instanciar Builder con manejo de errores
                         try:
                             # Asegurar que pasamos un string limpio
                             nombre_limpio = str(entidad_selec).strip()
-                            builder = ReportBuilder(
-                                df=df_filtrado, entity_name=nombre_limpio
-                            )
 
                             secciones = []
                             if inc_kpis:
@@ -210,12 +204,12 @@ def render():
                             if inc_analisis:
                                 secciones.append("analisis")
 
-                            pdf_bytes = builder.generate(secciones)
+                            pdf_bytes = build_report(
+                                df_completo, entidad_selec, secciones
+                            )
 
                             # Nombre de archivo seguro
-                            file_name_safe = (
-                                f"Reporte_{nombre_limpio.replace(' ', '_')}.pdf"
-                            )
+                            file_name_safe = report_file_name(nombre_limpio)
 
                             st.success("✅ Reporte listo")
                             st.download_button(
@@ -247,6 +241,61 @@ def render():
 
                 st.caption(f"Registros encontrados: {len(df_vista)}")
 
+            st.divider()
+
+            # 4. Exportación masiva (un ZIP con todas las instituciones)
+            st.subheader("📦 Exportación Masiva")
+            seleccion_masiva = st.multiselect(
+                "Instituciones a incluir:",
+                lista_entidades,
+                default=lista_entidades,
+                help="Genera un PDF por institución en paralelo y los entrega en un ZIP.",
+            )
+
+            if st.button(
+                f"Generar {len(seleccion_masiva)} reportes (ZIP)",
+                disabled=not seleccion_masiva,
+                use_container_width=True,
+            ):
+                secciones_masivas = [
+                    seccion
+                    for seccion, incluir in [
+                        ("kpis", inc_kpis),
+                        ("graficas", inc_graf),
+                        ("analisis", inc_analisis),
+                    ]
+                    if incluir
+                ]
+                barra = st.progress(0.0, text="🔨 Preparando reportes...")
+
+                def _reportar_reporte(hechos: int, total: int, entidad: str) -> None:
+                    barra.progress(
+                        hechos / total, text=f"📄 {hechos}/{total} · {entidad}"
+                    )
+
+                try:
+                    zip_bytes, errores = generate_all_reports(
+                        df_completo,
+                        entidades=seleccion_masiva,
+                        sections=secciones_masivas,
+                        progress_callback=_reportar_reporte,
+                    )
+                    barra.empty()
+                    for entidad, error in errores.items():
+                        st.warning(f"⚠️ {entidad}: {error}")
+                    st.success(
+                        f"✅ {len(seleccion_masiva) - len(errores)} reportes listos"
+                    )
+                    st.download_button(
+                        label="⬇️ Descargar ZIP",
+                        data=zip_bytes,
+                        file_name="Reportes_Champilytics.zip",
+                        mime="application/zip",
+                    )
+                except Exception as e:
+                    barra.empty()
+                    st.error(f"Error en la exportación masiva: {e}")
+
     # ==============================================================================
     # PESTAÑA 3: CATÁLOGO DE INSTITUCIONES
     # ==============================================================================
@@ -329,44 +378,20 @@ def render():
 
                 if st.button("Eliminar Institución", type="primary"):
                     try:
-                        # Eliminar de la variable global
-                        if institucion_a_eliminar in COLEGIOS_MARISTAS:
-                            del COLEGIOS_MARISTAS[institucion_a_eliminar]
-
-                        # Eliminar del archivo CSV local
-                        if CUENTAS_CSV.exists():
-                            cuentas_df = pd.read_csv(CUENTAS_CSV)
-                            cuentas_df = cuentas_df[
-                                cuentas_df["entidad"] != institucion_a_eliminar
-                            ]
-                            cuentas_df.to_csv(
-                                CUENTAS_CSV, index=False, encoding="utf-8-sig"
+                        # Eliminación dirigida en datos locales y Sheets (con cascada)
+                        exito = dm.delete_institution(institucion_a_eliminar)
+
+                        if exito:
+                            # Eliminar de la variable global
+                            if institucion_a_eliminar in COLEGIOS_MARISTAS:
+                                del COLEGIOS_MARISTAS[institucion_a_eliminar]
+                            st.success(
+                                f"✅ La institución '{institucion_a_eliminar}' ha sido eliminada correctamente."
+                            )
+                            st.rerun()
+                        else:
+                            st.error(
+                                "Hubo un error al eliminar la institución de la base de datos."
                             )
-
-                        # Eliminar de Google Sheets
-                        spreadsheet = dm.conectar_sheets()
-                        if spreadsheet:
-                            try:
-                                sheet_cuentas = spreadsheet.worksheet("cuentas")
-                                data = sheet_cuentas.get_all_records()
-                                cuentas_df = pd.DataFrame(data)
-                                cuentas_df = cuentas_df[
-                                    cuentas_df["entidad"] != institucion_a_eliminar
-                                ]
-                                sheet_cuentas.clear()
-                                sheet_cuentas.append_row(dm.COLS_CUENTAS)
-                                sheet_cuentas.append_rows(cuentas_df.values.tolist())
-                            except Exception as e:
-                                st.warning(
-                                    "No se pudo actualizar Google Sheets. Cambios aplicados solo localmente."
-                                )
-                                dm.logger.error(
-                                    f"Error eliminando institución de Sheets: {e}"
-                                )
-
-                        st.success(
-                            f"✅ La institución '{institucion_a_eliminar}' ha sido eliminada correctamente."
-                        )
-                        st.rerun()
                     except Exception as e:
                         st.error(f"❌ Error al eliminar la institución: {e}")